@@ -1,31 +1,138 @@
 import random
-from typing import List
-
-from src.config.settings import CROSSOVER_RATE, MUTATION_RATE
-
-from .car_rna import CarRNA
-
-CHROMOSOMES_AMOUNT: int = 12
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.config.settings import (
+    CROSSOVER_RATE,
+    ELITE_AMOUNT,
+    FITNESS_CACHE_SIZE,
+    GENETIC_BACKEND,
+    HALL_OF_FAME_SIZE,
+    INIT_CAR_ANGLE,
+    MUTATION_RATE,
+)
+from src.distance_field import DistanceField
+from src.population_simulator import PopulationSimulator
+
+from .car_rna import NEURONS_FORMAT, CarRNA, get_chromosomes_amount
+from .fitness_cache import FitnessCache, FitnessKey
+from .hall_of_fame import HallOfFame, get_genome_digest
+
+# Track boundary lines as ((x1, y1), (x2, y2))
+Line = Tuple[Tuple[float, float], Tuple[float, float]]
+Point = Tuple[float, float]
+
+GENETIC_BACKENDS: Tuple[str, ...] = ("lists", "numpy")
+
+# Mutation of a genome: 1 to MAX_MUTATIONS genes, each one nudged by up to
+# SMALL_MUTATION with SMALL_MUTATION_PROBABILITY or replaced otherwise
+MAX_MUTATIONS: int = 3
+SMALL_MUTATION: float = 0.2
+SMALL_MUTATION_PROBABILITY: float = 0.7
+
+
+def simulate_chromosomes(
+    chromosomes: np.ndarray,
+    neurons_format: Sequence[int],
+    lines: List[Line],
+    car_size: Tuple[int, int],
+    max_score: int,
+    first_index: int = 0,
+    spawn_points: Optional[List[Point]] = None,
+    spawn_angle: float = INIT_CAR_ANGLE,
+    distance_field: Optional[DistanceField] = None,
+) -> Tuple[np.ndarray, int]:
+    """
+    Simulate a slice of the population headlessly.
+
+    Cars never interact, so every slice can be simulated on its own: a car's
+    score only depends on its genome, its starting position and max_score.
+
+    Args:
+        chromosomes: Array (cars, chromosomes) with the genome of each car
+        neurons_format: Network topology of the genomes
+        lines: Track boundary lines for collision detection
+        car_size: Width and height of the car image
+        max_score: Score that ends the simulation once exceeded
+        first_index: Index in the whole population of the first car
+        spawn_points: Starting positions of the track (a grid if None)
+        spawn_angle: Starting angle of every car, in degrees
+        distance_field: Distance field of the track (None for the exact lines)
+
+    Returns:
+        The score of each car and the amount of cars alive at the end
+    """
+    rnas: List[CarRNA] = [CarRNA(genome, neurons_format) for genome in chromosomes]
+
+    simulator = PopulationSimulator(
+        rnas,
+        lines,
+        car_size,
+        first_index=first_index,
+        spawn_points=spawn_points,
+        spawn_angle=spawn_angle,
+        distance_field=distance_field,
+    )
+    simulator.run(max_score)
+
+    return simulator.score, simulator.get_all_cars_alive()
 
 
 class CarAlgGen:
-    def __init__(self, population_size: int) -> None:
+    def __init__(
+        self,
+        population_size: int,
+        neurons_format: Sequence[int] = NEURONS_FORMAT,
+        genetic_backend: str = GENETIC_BACKEND,
+        seed: Optional[int] = None,
+        elite_amount: int = ELITE_AMOUNT,
+        hall_of_fame_size: int = HALL_OF_FAME_SIZE,
+        fitness_cache_size: int = FITNESS_CACHE_SIZE,
+    ) -> None:
         """
         Initialize the genetic algorithm.
 
         Args:
             population_size: Number of individuals in the population
+            neurons_format: Network topology of every individual
+            genetic_backend: "lists" for the Python list operators, "numpy"
+                for the vectorized ones
+            seed: Seed of the NumPy generator used by the "numpy" backend
+            elite_amount: Best genomes carried over unchanged to the next generation
+            hall_of_fame_size: Best genomes of the whole run to archive
+            fitness_cache_size: Scores kept to skip simulating a genome again
 
         Raises:
-            ValueError: If population size is less than 2
+            ValueError: If population size is less than 2, the backend is
+                unknown or the elite doesn't leave room for any child
         """
         if population_size < 2:
             raise ValueError("Population size must be greater than 2")
 
+        if genetic_backend not in GENETIC_BACKENDS:
+            raise ValueError(
+                f"Genetic backend must be one of {GENETIC_BACKENDS}: {genetic_backend}"
+            )
+
+        if not 0 <= elite_amount < population_size:
+            raise ValueError(
+                f"Elite amount must be between 0 and the population size - 1: {elite_amount}"
+            )
+
         self.population_size: int = population_size
-        self.chromosomes_amount: int = CHROMOSOMES_AMOUNT
+        self.neurons_format: List[int] = list(neurons_format)
+        self.chromosomes_amount: int = get_chromosomes_amount(self.neurons_format)
         self.population: List[CarRNA] = []
         self.generation: int = 0
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.executor_workers: int = 0
+        self.genetic_backend: str = genetic_backend
+        self.rng: np.random.Generator = np.random.default_rng(seed)
+        self.elite_amount: int = elite_amount
+        self.hall_of_fame: HallOfFame = HallOfFame(hall_of_fame_size)
+        self.fitness_cache: FitnessCache = FitnessCache(fitness_cache_size)
 
     def generate_initial_population(self) -> List[CarRNA]:
         """
@@ -34,10 +141,18 @@ class CarAlgGen:
         Returns:
             List of CarRNA objects representing the initial population
         """
+        if self.genetic_backend == "numpy":
+            self.population = self.create_population(
+                self.get_new_chromosomes_array(self.population_size)
+            )
+            return self.population
+
         chromosomes_list: List[List[float]] = self.get_new_chromosomes(
             self.population_size
         )
-        self.population = [CarRNA(chromosomes) for chromosomes in chromosomes_list]
+        self.population = [
+            CarRNA(chromosomes, self.neurons_format) for chromosomes in chromosomes_list
+        ]
         return self.population
 
     def get_new_population(self) -> List[CarRNA]:
@@ -48,8 +163,13 @@ class CarAlgGen:
         Returns:
             List of CarRNA objects representing the new population
         """
+        self.hall_of_fame.update(self.population, self.generation)
+
         self.generation += 1
 
+        if self.genetic_backend == "numpy":
+            return self.get_new_population_array()
+
         # Select best individuals from current population
         best_chromosomes: List[List[float]] = self.select_population(self.population)
 
@@ -71,9 +191,14 @@ class CarAlgGen:
         # Apply mutations to the entire new population
         mutated_chromosomes: List[List[float]] = self.mutate_population(all_chromosomes)
 
+        # The elite keeps its place, and so its starting position, unchanged
+        for i in self.get_elite_indexes():
+            mutated_chromosomes[i] = self.population[i].get_chromosomes()
+
         # Create CarRNA objects from the chromosomes
         new_population: List[CarRNA] = [
-            CarRNA(chromosomes) for chromosomes in mutated_chromosomes
+            CarRNA(chromosomes, self.neurons_format)
+            for chromosomes in mutated_chromosomes
         ]
 
         # Store as current population for next generation
@@ -83,6 +208,208 @@ class CarAlgGen:
 
         return new_population
 
+    def get_new_population_array(self) -> List[CarRNA]:
+        """
+        Same steps as get_new_population, on an (N, chromosomes) array.
+
+        Every operator is a vectorized NumPy operation drawing from self.rng,
+        so the time between generations stays small at 10k-100k genomes.
+
+        Returns:
+            List of CarRNA objects representing the new population
+        """
+        best_car: CarRNA = max(self.population, key=lambda rna: rna.get_score())
+
+        scores: np.ndarray = np.array(
+            [rna.get_score() for rna in self.population], dtype=np.float64
+        )
+        chromosomes: np.ndarray = np.array(
+            [rna.weights for rna in self.population], dtype=np.float32
+        )
+
+        best_parents: np.ndarray = self.select_population_array(chromosomes, scores)
+        crossovered_chromosomes: np.ndarray = self.crossover_population_array(
+            best_parents
+        )
+
+        # Add some completely new individuals for genetic diversity
+        additional_chromosomes: np.ndarray = self.get_new_chromosomes_array(
+            len(self.population) - len(crossovered_chromosomes)
+        )
+
+        mutated_chromosomes: np.ndarray = self.mutate_population_array(
+            np.concatenate([crossovered_chromosomes, additional_chromosomes])
+        )
+
+        # The elite keeps its place, and so its starting position, unchanged
+        elite: np.ndarray = self.get_elite_indexes()
+        mutated_chromosomes[elite] = chromosomes[elite]
+
+        new_population: List[CarRNA] = self.create_population(mutated_chromosomes)
+        self.population = new_population
+
+        print(f"Generation: {self.generation} - Best car score: {best_car.get_score()}")
+
+        return new_population
+
+    def get_elite_indexes(self) -> np.ndarray:
+        """
+        Returns the indexes of the elite_amount best genomes of the current
+        population, ties going to the first ones.
+        """
+        scores: np.ndarray = np.array(
+            [rna.get_score() for rna in self.population], dtype=np.float64
+        )
+
+        return np.argsort(-scores, kind="stable")[: self.elite_amount]
+
+    def create_population(self, chromosomes: np.ndarray) -> List[CarRNA]:
+        """
+        Create one CarRNA per row of an (N, chromosomes) array.
+
+        Args:
+            chromosomes: Array with the genome of each individual
+        """
+        return [CarRNA(genome, self.neurons_format) for genome in chromosomes]
+
+    def evaluate_population(
+        self,
+        lines: List[Line],
+        car_size: Tuple[int, int],
+        max_score: int,
+        start_positions: Sequence[Point],
+        workers: int = 1,
+        spawn_angle: float = INIT_CAR_ANGLE,
+        distance_field: Optional[DistanceField] = None,
+    ) -> int:
+        """
+        Simulate the current population headlessly and store each score in its CarRNA.
+
+        The population is split in contiguous slices, one per worker process.
+        The scores don't depend on the amount of workers, so a fixed seed
+        gives the same results no matter how many run.
+
+        A car's score only depends on its genome and its starting position
+        (capped at max_score + 1, when the simulation ends), so genomes found
+        in the fitness cache take their score from it instead of being
+        simulated again.
+
+        Args:
+            lines: Track boundary lines for collision detection
+            car_size: Width and height of the car image
+            max_score: Score that ends the simulation once exceeded
+            start_positions: Starting position of each car of the population
+            workers: Amount of worker processes (1 simulates in this process)
+            spawn_angle: Starting angle of every car, in degrees
+            distance_field: Distance field of the track (None for the exact
+                lines), memory-mapped fields reach the workers as their path
+
+        Returns:
+            Amount of cars alive at the end of the simulation
+        """
+        chromosomes: np.ndarray = np.array(
+            [rna.weights for rna in self.population], dtype=np.float32
+        )
+        positions: List[Point] = [tuple(position) for position in start_positions]
+
+        self.fitness_cache.set_context(
+            (
+                get_genome_digest(np.asarray(lines, dtype=np.float32)),
+                tuple(car_size),
+                max_score,
+                spawn_angle,
+                distance_field is None,
+                tuple(self.neurons_format),
+            )
+        )
+        keys: List[FitnessKey] = [
+            (get_genome_digest(genome), position)
+            for genome, position in zip(chromosomes, positions)
+        ]
+        cached_scores: List[Optional[int]] = [
+            self.fitness_cache.get(key) for key in keys
+        ]
+        scores: np.ndarray = np.array(
+            [-1 if score is None else score for score in cached_scores], dtype=np.int64
+        )
+
+        # Only the genomes that aren't cached are simulated, each one from its
+        # own starting position
+        uncached: np.ndarray = np.flatnonzero(scores < 0)
+        workers = max(1, workers)
+        slices: List[np.ndarray] = [
+            uncached[indexes]
+            for indexes in np.array_split(np.arange(uncached.size), workers)
+            if indexes.size
+        ]
+
+        if workers <= 1:
+            results: List[Tuple[np.ndarray, int]] = [
+                simulate_chromosomes(
+                    chromosomes[indexes],
+                    self.neurons_format,
+                    lines,
+                    car_size,
+                    max_score,
+                    0,
+                    [positions[i] for i in indexes],
+                    spawn_angle,
+                    distance_field,
+                )
+                for indexes in slices
+            ]
+        else:
+            executor: ProcessPoolExecutor = self.get_executor(workers)
+            futures = [
+                executor.submit(
+                    simulate_chromosomes,
+                    chromosomes[indexes],
+                    self.neurons_format,
+                    lines,
+                    car_size,
+                    max_score,
+                    0,
+                    [positions[i] for i in indexes],
+                    spawn_angle,
+                    distance_field,
+                )
+                for indexes in slices
+            ]
+            results = [future.result() for future in futures]
+
+        for indexes, (slice_scores, _) in zip(slices, results):
+            scores[indexes] = slice_scores
+            for i, score in zip(indexes.tolist(), slice_scores.tolist()):
+                self.fitness_cache.put(keys[i], score)
+
+        for rna, score in zip(self.population, scores.tolist()):
+            rna.set_score(score)
+
+        # The cars alive at the end are the ones that reached the cap
+        return int((scores > max_score).sum())
+
+    def get_executor(self, workers: int) -> ProcessPoolExecutor:
+        """
+        Returns the process pool, creating it the first time or when the
+        amount of workers changes.
+
+        Args:
+            workers: Amount of worker processes
+        """
+        if self.executor is None or self.executor_workers != workers:
+            self.close()
+            self.executor = ProcessPoolExecutor(max_workers=workers)
+            self.executor_workers = workers
+
+        return self.executor
+
+    def close(self) -> None:
+        """Shut down the worker processes, if any."""
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+            self.executor_workers = 0
+
     def select_population(self, population: List[CarRNA]) -> List[List[float]]:
         """
         Selects 2 * population_size parents using roulette wheel selection.
@@ -167,11 +494,7 @@ class CarAlgGen:
         Returns:
             The mutated population
         """
-        # Increase mutation rate slightly based on generation (up to 5%)
-        base_mutation_rate: float = 0.02  # 2% base mutation rate
-        adaptive_rate: float = min(
-            MUTATION_RATE, base_mutation_rate + (self.generation * 0.001)
-        )
+        adaptive_rate: float = self.get_mutation_rate()
 
         for chromosomes in population:
             # For each chromosome set, decide if it should be mutated
@@ -179,14 +502,16 @@ class CarAlgGen:
 
             if should_mutate:
                 # Pick 1-3 genes to mutate (more impact)
-                num_mutations: int = random.randint(1, 3)
+                num_mutations: int = random.randint(1, MAX_MUTATIONS)
                 for _ in range(num_mutations):
                     mutation_point: int = random.randint(0, self.chromosomes_amount - 1)
 
                     # Apply mutation (either small or large change)
-                    if random.random() < 0.7:  # 70% chance of small mutation
+                    if random.random() < SMALL_MUTATION_PROBABILITY:
                         # Small adjustment to existing value (-0.2 to +0.2)
-                        chromosomes[mutation_point] += random.uniform(-0.2, 0.2)
+                        chromosomes[mutation_point] += random.uniform(
+                            -SMALL_MUTATION, SMALL_MUTATION
+                        )
                         # Clamp value between -1 and 1
                         chromosomes[mutation_point] = max(
                             -1, min(1, chromosomes[mutation_point])
@@ -197,6 +522,115 @@ class CarAlgGen:
 
         return population
 
+    def select_population_array(
+        self, chromosomes: np.ndarray, scores: np.ndarray
+    ) -> np.ndarray:
+        """
+        Selects 2 * population_size parents using roulette wheel selection.
+
+        Args:
+            chromosomes: Array (N, chromosomes) of the current population
+            scores: Array (N,) with the score of each individual
+
+        Returns:
+            Array (2 * population_size, chromosomes), the parents of each
+            child one after the other
+        """
+        # Ensures scores bigger or equal to 0
+        weights: np.ndarray = np.maximum(scores, 0.0)
+        total_score: float = float(weights.sum())
+
+        # Avoids division by zero if all scores are 0
+        probabilities: Optional[np.ndarray] = (
+            weights / total_score if total_score > 0 else None
+        )
+
+        selected: np.ndarray = self.rng.choice(
+            len(chromosomes), size=2 * self.population_size, p=probabilities
+        )
+
+        return chromosomes[selected]
+
+    def crossover_population_array(self, parents: np.ndarray) -> np.ndarray:
+        """
+        Returns the blend crossover of each pair of consecutive parents.
+
+        Args:
+            parents: Array (2 * N, chromosomes) of parents
+
+        Returns:
+            Array (N, chromosomes) of children, clamped between -1 and 1
+        """
+        children: np.ndarray = (
+            CROSSOVER_RATE * parents[0::2] + (1 - CROSSOVER_RATE) * parents[1::2]
+        )
+
+        return np.clip(children, -1, 1)
+
+    def get_new_chromosomes_array(self, amount: int) -> np.ndarray:
+        """
+        Returns an (amount, chromosomes) array of random weights between -1 and 1.
+
+        Args:
+            amount: Number of chromosome sets to generate
+        """
+        return self.rng.uniform(-1, 1, (amount, self.chromosomes_amount)).astype(
+            np.float32
+        )
+
+    def mutate_population_array(self, population: np.ndarray) -> np.ndarray:
+        """
+        Applies the adaptive mutation of mutate_population to a whole array.
+
+        Each genome mutates with the adaptive rate, 1 to MAX_MUTATIONS of its
+        genes. The mutations are applied in order, one vectorized step per
+        mutation slot, so a gene picked twice is mutated twice.
+
+        Args:
+            population: Array (N, chromosomes), mutated in place
+
+        Returns:
+            The mutated population
+        """
+        amount: int = len(population)
+        rows: np.ndarray = np.arange(amount)
+
+        should_mutate: np.ndarray = self.rng.random(amount) < self.get_mutation_rate()
+        num_mutations: np.ndarray = self.rng.integers(
+            1, MAX_MUTATIONS, amount, endpoint=True
+        )
+        mutation_points: np.ndarray = self.rng.integers(
+            0, self.chromosomes_amount, (amount, MAX_MUTATIONS)
+        )
+        is_small: np.ndarray = (
+            self.rng.random((amount, MAX_MUTATIONS)) < SMALL_MUTATION_PROBABILITY
+        )
+        adjustments: np.ndarray = self.rng.uniform(
+            -SMALL_MUTATION, SMALL_MUTATION, (amount, MAX_MUTATIONS)
+        )
+        replacements: np.ndarray = self.rng.uniform(-1, 1, (amount, MAX_MUTATIONS))
+
+        for slot in range(MAX_MUTATIONS):
+            active: np.ndarray = should_mutate & (slot < num_mutations)
+            genes: np.ndarray = population[rows, mutation_points[:, slot]]
+
+            mutated: np.ndarray = np.where(
+                is_small[:, slot],
+                np.clip(genes + adjustments[:, slot], -1, 1),
+                replacements[:, slot],
+            )
+            population[rows[active], mutation_points[active, slot]] = mutated[active]
+
+        return population
+
+    def get_mutation_rate(self) -> float:
+        """
+        Returns the mutation rate of the current generation, which increases
+        slightly every generation (up to MUTATION_RATE) to avoid local optima.
+        """
+        # 2% base mutation rate
+        return min(MUTATION_RATE, 0.02 + (self.generation * 0.001))
+
     def should_stop(self, population: List[CarRNA]) -> bool:
         """
         Determine if the genetic algorithm should stop.
@@ -215,15 +649,22 @@ class CarAlgGen:
 
     def get_best_rna(self, population: List[CarRNA]) -> CarRNA:
         """
-        Get the best neural network from the population.
+        Get the best neural network of the whole run, from the hall of fame.
 
         Args:
-            population: Population to evaluate
+            population: Population to evaluate when the hall of fame is empty
 
         Returns:
             The best performing CarRNA
         """
-        pass
+        if not self.hall_of_fame:
+            return max(population, key=lambda rna: rna.get_score())
+
+        score, chromosomes = self.hall_of_fame.get_best()
+        best_rna = CarRNA(chromosomes, self.neurons_format)
+        best_rna.set_score(score)
+
+        return best_rna
 
     def get_generation(self) -> int:
         """Get the current generation number."""
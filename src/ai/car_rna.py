@@ -1,10 +1,16 @@
-import math
 from enum import Enum
-from typing import Callable, List, Optional
+from typing import Callable, List, Optional, Sequence
 
-from src.config.settings import NORMALIZATION_FACTOR
+import numpy as np
 
-NEURONS_FORMAT: List[int] = [3, 3, 1]  # [ (0,1,2), (3,4,5), (6) ]
+from src.config.settings import HIDDEN_LAYERS, NORMALIZATION_FACTOR, SENSOR_ANGLES
+
+# One input per sensor, the hidden layers and a single output neuron
+NEURONS_FORMAT: List[int] = [len(SENSOR_ANGLES), *HIDDEN_LAYERS, 1]
+
+# Outputs below LEFT_THRESHOLD turn left, outputs from RIGHT_THRESHOLD turn right
+LEFT_THRESHOLD: float = -0.33
+RIGHT_THRESHOLD: float = 0.3
 
 
 class CarRNAResult(Enum):
@@ -13,47 +19,138 @@ class CarRNAResult(Enum):
     RIGHT = 2
 
 
-activation_function: Callable[[float], float] = math.tanh
+activation_function: Callable[[np.ndarray], np.ndarray] = np.tanh
+
+
+def get_chromosomes_amount(neurons_format: Sequence[int] = NEURONS_FORMAT) -> int:
+    """
+    Returns the amount of weights (chromosomes) of a network topology.
+
+    Args:
+        neurons_format: Amount of neurons of each layer, from inputs to output
+    """
+    return sum(
+        neurons_in * neurons_out
+        for neurons_in, neurons_out in zip(neurons_format, neurons_format[1:])
+    )
+
+
+def get_layer_views(
+    weights: np.ndarray, neurons_format: Sequence[int]
+) -> List[np.ndarray]:
+    """
+    Split flat weights into one (inputs, outputs) matrix per layer.
+
+    The matrices are views, so they share memory with the flat weights.
+
+    Args:
+        weights: Array (..., chromosomes) of flat weights
+        neurons_format: Amount of neurons of each layer, from inputs to output
+
+    Returns:
+        List of arrays (..., neurons_in, neurons_out), one per layer
+    """
+    layers: List[np.ndarray] = []
+    start: int = 0
+
+    for neurons_in, neurons_out in zip(neurons_format, neurons_format[1:]):
+        end: int = start + neurons_in * neurons_out
+        layers.append(
+            weights[..., start:end].reshape(
+                weights.shape[:-1] + (neurons_in, neurons_out)
+            )
+        )
+        start = end
+
+    return layers
+
+
+def forward(layers: List[np.ndarray], inputs: np.ndarray) -> np.ndarray:
+    """
+    Propagate the inputs through the layers.
+
+    The products are accumulated input by input with element-wise operations
+    only, so a network gives the same bits whether it's evaluated alone or
+    stacked with a whole population.
+
+    Args:
+        layers: Arrays (..., neurons_in, neurons_out), one per layer
+        inputs: Array (..., neurons_in) of inputs
+
+    Returns:
+        Array (..., neurons_out) with the values of the output layer
+    """
+    values: np.ndarray = inputs
+
+    for layer in layers:
+        total: np.ndarray = values[..., 0, None] * layer[..., 0, :]
+        for i in range(1, layer.shape[-2]):
+            total = total + values[..., i, None] * layer[..., i, :]
+
+        values = activation_function(total)
+
+    return values
+
+
+def validate_neurons_format(neurons_format: Sequence[int]) -> None:
+    """
+    Check that a topology can drive a car.
+
+    Raises:
+        ValueError: If there are less than 2 layers, an empty layer or more
+            than one output neuron
+    """
+    if len(neurons_format) < 2:
+        raise ValueError("Neurons format must have at least an input and an output")
+
+    if any(neurons < 1 for neurons in neurons_format):
+        raise ValueError("Every layer must have at least one neuron")
+
+    if neurons_format[-1] != 1:
+        raise ValueError("The output layer must have exactly one neuron")
 
 
 class CarRNA:
-    def __init__(self, chromsomes: List[float]) -> None:
-        if (
-            len(chromsomes)
-            != NEURONS_FORMAT[0] * NEURONS_FORMAT[1]
-            + NEURONS_FORMAT[1] * NEURONS_FORMAT[2]
-        ):
+    # No per-instance __dict__, there is one CarRNA per car
+    __slots__ = ("absolute_score", "neurons_format", "weights", "layers")
+
+    def __init__(
+        self,
+        chromsomes: Sequence[float],
+        neurons_format: Sequence[int] = NEURONS_FORMAT,
+    ) -> None:
+        """
+        Initialize the neural network from its chromosomes.
+
+        Args:
+            chromsomes: Flat weights, layer by layer, each layer row by row
+                (weight from input i to output j at i * neurons_out + j)
+            neurons_format: Amount of neurons of each layer, from inputs to output
+
+        Raises:
+            ValueError: If the topology is invalid or the chromosomes amount
+                doesn't match it
+        """
+        validate_neurons_format(neurons_format)
+
+        chromosomes_amount: int = get_chromosomes_amount(neurons_format)
+        if len(chromsomes) != chromosomes_amount:
             raise ValueError(
-                f"Chromosomes amount must be equal to the chromosomes amount: {len(chromsomes)} != {NEURONS_FORMAT[0] * NEURONS_FORMAT[1] + NEURONS_FORMAT[1] * NEURONS_FORMAT[2]}"
+                f"Chromosomes amount must be equal to the chromosomes amount: {len(chromsomes)} != {chromosomes_amount}"
             )
 
         self.absolute_score: int = 0
-        self.chromsomes: List[float] = chromsomes
-
-        # Create empty neurons for input
-        # LAYER 0
-        self.neurons: List[float] = [0 for _ in range(NEURONS_FORMAT[0])]
-
-        # Create empty weights
-        # LAYER 1
-        self.weight_l0_n0_to_l1_n0: float = chromsomes[0]
-        self.weight_l0_n0_to_l1_n1: float = chromsomes[1]
-        self.weight_l0_n0_to_l1_n2: float = chromsomes[2]
-        self.weight_l0_n1_to_l1_n0: float = chromsomes[3]
-        self.weight_l0_n1_to_l1_n1: float = chromsomes[4]
-        self.weight_l0_n1_to_l1_n2: float = chromsomes[5]
-        self.weight_l0_n2_to_l1_n0: float = chromsomes[6]
-        self.weight_l0_n2_to_l1_n1: float = chromsomes[7]
-        self.weight_l0_n2_to_l1_n2: float = chromsomes[8]
-
-        # LAYER 2
-        self.weight_l1_n0_to_l2_n0: float = chromsomes[9]
-        self.weight_l1_n1_to_l2_n0: float = chromsomes[10]
-        self.weight_l1_n2_to_l2_n0: float = chromsomes[11]
+        self.neurons_format: List[int] = list(neurons_format)
+
+        # All the weights live in one contiguous array, the layers are views
+        self.weights: np.ndarray = np.array(chromsomes, dtype=np.float32)
+        self.layers: List[np.ndarray] = get_layer_views(
+            self.weights, self.neurons_format
+        )
 
     def get_chromosomes(self) -> List[float]:
         """Return the chromosome weights."""
-        return self.chromsomes
+        return self.weights.tolist()
 
     def get_result(self, inputs: List[float]) -> float:
         """
@@ -68,34 +165,14 @@ class CarRNA:
         Raises:
             ValueError: If the inputs length doesn't match the input layer size
         """
-        if len(inputs) != NEURONS_FORMAT[0]:
+        if len(inputs) != self.neurons_format[0]:
             raise ValueError(
                 "Inputs length must be equal to the first layer neurons amount"
             )
 
-        value_l1_n0: float = activation_function(
-            self.weight_l0_n0_to_l1_n0 * inputs[0]
-            + self.weight_l0_n1_to_l1_n0 * inputs[1]
-            + self.weight_l0_n2_to_l1_n0 * inputs[2]
-        )
-        value_l1_n1: float = activation_function(
-            self.weight_l0_n0_to_l1_n1 * inputs[0]
-            + self.weight_l0_n1_to_l1_n1 * inputs[1]
-            + self.weight_l0_n2_to_l1_n1 * inputs[2]
-        )
-        value_l1_n2: float = activation_function(
-            self.weight_l0_n0_to_l1_n2 * inputs[0]
-            + self.weight_l0_n1_to_l1_n2 * inputs[1]
-            + self.weight_l0_n2_to_l1_n2 * inputs[2]
-        )
-
-        value_l2_n0: float = activation_function(
-            self.weight_l1_n0_to_l2_n0 * value_l1_n0
-            + self.weight_l1_n1_to_l2_n0 * value_l1_n1
-            + self.weight_l1_n2_to_l2_n0 * value_l1_n2
-        )
+        values: np.ndarray = forward(self.layers, np.array(inputs, dtype=np.float32))
 
-        return value_l2_n0
+        return float(values[0])
 
     def get_interpretated_result(self, inputs: List[Optional[float]]) -> CarRNAResult:
         """
@@ -109,9 +186,9 @@ class CarRNA:
         """
         result: float = self.get_result(self.normalize_inputs(inputs))
 
-        if result < -0.33:
+        if result < LEFT_THRESHOLD:
             return CarRNAResult.LEFT
-        elif result < 0.3:
+        elif result < RIGHT_THRESHOLD:
             return CarRNAResult.STRAIGHT
         else:
             return CarRNAResult.RIGHT
@@ -140,6 +217,15 @@ class CarRNA:
         """
         self.absolute_score += new_value
 
+    def set_score(self, score: int) -> None:
+        """
+        Set the car's score, used when the score was computed elsewhere.
+
+        Args:
+            score: The new score
+        """
+        self.absolute_score = score
+
     def get_score(self) -> int:
         """Get the current score of this neural network."""
         return self.absolute_score
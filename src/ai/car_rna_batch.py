@@ -0,0 +1,132 @@
+from typing import List, Optional
+
+import numpy as np
+
+from src.config.settings import NORMALIZATION_FACTOR
+
+from .car_rna import (
+    LEFT_THRESHOLD,
+    NEURONS_FORMAT,
+    RIGHT_THRESHOLD,
+    CarRNA,
+    CarRNAResult,
+    forward,
+    get_chromosomes_amount,
+    get_layer_views,
+)
+
+
+class CarRNABatch:
+    """
+    Evaluates the neural networks of a whole population at once.
+
+    The genomes are stacked into one (N, chromosomes) float32 array, viewed
+    as one (N, neurons_in, neurons_out) tensor per layer, so a forward pass
+    for every car is one batched product and a vectorized tanh per layer.
+    The same forward function backs CarRNA.get_result and the results are
+    interpreted with the same thresholds as CarRNA.get_interpretated_result,
+    so the decisions are identical.
+    """
+
+    def __init__(self, rnas: List[CarRNA]) -> None:
+        """
+        Stack the weights of the given neural networks.
+
+        Args:
+            rnas: Neural networks to evaluate, one per car
+
+        Raises:
+            ValueError: If the networks don't share the same topology
+        """
+        self.neurons_format: List[int] = (
+            rnas[0].neurons_format if rnas else list(NEURONS_FORMAT)
+        )
+
+        if any(rna.neurons_format != self.neurons_format for rna in rnas):
+            raise ValueError("Every neural network must have the same topology")
+
+        self.weights: np.ndarray = np.empty(
+            (len(rnas), get_chromosomes_amount(self.neurons_format)), np.float32
+        )
+        for i, rna in enumerate(rnas):
+            self.weights[i] = rna.weights
+
+        self.layers: List[np.ndarray] = get_layer_views(
+            self.weights, self.neurons_format
+        )
+
+    def __len__(self) -> int:
+        """Amount of neural networks in the batch."""
+        return self.weights.shape[0]
+
+    def get_results(
+        self, inputs: np.ndarray, idx: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Get the output of every neural network.
+
+        Args:
+            inputs: Array (N, inputs) with the inputs of each network
+            idx: Indexes of the networks to evaluate (all of them if None)
+
+        Returns:
+            Array (N,) with the output value of each network
+
+        Raises:
+            ValueError: If the inputs don't match the input layer size
+        """
+        if inputs.shape[-1] != self.neurons_format[0]:
+            raise ValueError(
+                "Inputs length must be equal to the first layer neurons amount"
+            )
+
+        layers: List[np.ndarray] = self.layers
+        if idx is not None:
+            layers = [layer[idx] for layer in layers]
+
+        return forward(layers, inputs.astype(np.float32))[:, 0]
+
+    def get_interpretated_results(
+        self, distances: np.ndarray, idx: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Get the interpretated result of every neural network.
+
+        Args:
+            distances: Array (N, inputs) of sensor distances, NaN where nothing was hit
+            idx: Indexes of the networks to evaluate (all of them if None)
+
+        Returns:
+            Array (N,) of CarRNAResult values (LEFT, STRAIGHT or RIGHT)
+        """
+        # Compared in double precision, like the Python floats of CarRNA
+        result: np.ndarray = self.get_results(
+            self.normalize_inputs(distances), idx
+        ).astype(np.float64)
+
+        return np.where(
+            result < LEFT_THRESHOLD,
+            CarRNAResult.LEFT.value,
+            np.where(
+                result < RIGHT_THRESHOLD,
+                CarRNAResult.STRAIGHT.value,
+                CarRNAResult.RIGHT.value,
+            ),
+        )
+
+    @staticmethod
+    def normalize_inputs(distances: np.ndarray) -> np.ndarray:
+        """
+        Normalize the sensor distances to be between 0 and 1.
+
+        Args:
+            distances: Array of sensor distances, NaN where nothing was hit
+
+        Returns:
+            Normalized inputs, 0 where nothing was hit
+        """
+        return np.where(
+            np.isnan(distances),
+            0.0,
+            np.minimum(distances / NORMALIZATION_FACTOR, 1.0),
+        )
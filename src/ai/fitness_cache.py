@@ -0,0 +1,78 @@
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+
+# Cached genomes are identified by their digest and their starting position
+FitnessKey = Tuple[bytes, Tuple[float, float]]
+
+
+class FitnessCache:
+    """
+    Scores of already simulated genomes, to skip simulating them again.
+
+    Cars never interact and the simulation is deterministic, so a genome
+    starting from the same position always gets the same score. The scores
+    are only valid for one simulation context (track, car size, maximum
+    score...), a different context empties the cache. The least recently
+    used entries are evicted once the cache is full.
+    """
+
+    def __init__(self, size: int) -> None:
+        """
+        Args:
+            size: Maximum amount of scores to keep (0 disables the cache)
+        """
+        self.size: int = size
+        self.scores: "OrderedDict[FitnessKey, int]" = OrderedDict()
+        self.context: Optional[Hashable] = None
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __len__(self) -> int:
+        """Amount of cached scores."""
+        return len(self.scores)
+
+    def set_context(self, context: Hashable) -> None:
+        """
+        Set the simulation context of the next lookups, clearing the cache
+        if it differs from the current one.
+
+        Args:
+            context: Anything identifying what the scores depend on
+        """
+        if context != self.context:
+            self.scores.clear()
+            self.context = context
+
+    def get(self, key: FitnessKey) -> Optional[int]:
+        """
+        Returns the cached score of a genome, None if it was never simulated.
+
+        Args:
+            key: Digest of the genome and its starting position
+        """
+        score: Optional[int] = self.scores.get(key)
+
+        if score is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.scores.move_to_end(key)
+
+        return score
+
+    def put(self, key: FitnessKey, score: int) -> None:
+        """
+        Store the score of a simulated genome.
+
+        Args:
+            key: Digest of the genome and its starting position
+            score: Simulated score
+        """
+        if self.size <= 0:
+            return
+
+        self.scores[key] = score
+        self.scores.move_to_end(key)
+
+        while len(self.scores) > self.size:
+            self.scores.popitem(last=False)
@@ -0,0 +1,164 @@
+import hashlib
+import os
+from typing import List, Set, Tuple
+
+import numpy as np
+
+from .car_rna import CarRNA
+
+
+def get_genome_digest(weights: np.ndarray) -> bytes:
+    """
+    Returns a hash of the bytes of a genome, equal for bit-identical genomes.
+
+    Args:
+        weights: Flat weights of the genome
+    """
+    return hashlib.blake2b(
+        np.ascontiguousarray(weights, dtype=np.float32).tobytes(), digest_size=16
+    ).digest()
+
+
+class HallOfFame:
+    """
+    Archive of the best genomes found across every generation.
+
+    Each genome is kept once, with its best score and the generation it was
+    first archived in, sorted from the best to the worst. The archive is
+    saved to its own file, so it outlives the run even without checkpoints.
+    """
+
+    def __init__(self, size: int) -> None:
+        """
+        Args:
+            size: Maximum amount of genomes to keep (0 disables the archive)
+        """
+        self.size: int = size
+        self.scores: List[int] = []
+        self.generations: List[int] = []
+        self.chromosomes: List[np.ndarray] = []
+        self.digests: Set[bytes] = set()
+        # Whether the archive changed since it was last saved
+        self.changed: bool = False
+
+    def __len__(self) -> int:
+        """Amount of archived genomes."""
+        return len(self.chromosomes)
+
+    def update(self, population: List[CarRNA], generation: int) -> None:
+        """
+        Archive the genomes of the population that beat the worst archived one.
+
+        Args:
+            population: Scored population
+            generation: Generation of the population
+        """
+        if self.size <= 0:
+            return
+
+        candidates: List[CarRNA] = sorted(
+            population, key=lambda rna: rna.get_score(), reverse=True
+        )[: self.size]
+
+        for rna in candidates:
+            if len(self) == self.size and rna.get_score() <= self.scores[-1]:
+                break
+
+            digest: bytes = get_genome_digest(rna.weights)
+            if digest in self.digests:
+                continue
+
+            self._insert(rna.get_score(), generation, rna.weights.copy(), digest)
+
+    def _insert(
+        self, score: int, generation: int, chromosomes: np.ndarray, digest: bytes
+    ) -> None:
+        """Insert a genome keeping the archive sorted and within its size."""
+        position: int = len(self.scores)
+        while position > 0 and self.scores[position - 1] < score:
+            position -= 1
+
+        self.scores.insert(position, score)
+        self.generations.insert(position, generation)
+        self.chromosomes.insert(position, chromosomes)
+        self.digests.add(digest)
+        self.changed = True
+
+        if len(self) > self.size:
+            self.scores.pop()
+            self.generations.pop()
+            self.digests.discard(get_genome_digest(self.chromosomes.pop()))
+
+    def rebuild_digests(self) -> None:
+        """Hash the archived genomes again, after restoring them."""
+        self.digests = {get_genome_digest(weights) for weights in self.chromosomes}
+
+    def get_best(self) -> Tuple[int, np.ndarray]:
+        """
+        Returns the score and the weights of the best archived genome.
+
+        Raises:
+            IndexError: If the archive is empty
+        """
+        return self.scores[0], self.chromosomes[0]
+
+    def save(self, path: str) -> None:
+        """
+        Save the archive to a NumPy .npz file, replacing the old one atomically.
+
+        Args:
+            path: Path of the archive file
+        """
+        directory: str = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(temporary_path, "wb") as archive_file:
+                np.savez(
+                    archive_file,
+                    scores=np.array(self.scores, dtype=np.int64),
+                    generations=np.array(self.generations, dtype=np.int64),
+                    weights=np.array(self.chromosomes, dtype=np.float32),
+                )
+            os.replace(temporary_path, path)
+        finally:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+
+        self.changed = False
+
+    def save_if_changed(self, path: str) -> None:
+        """
+        Save the archive if a genome was archived since the last save.
+
+        Args:
+            path: Path of the archive file
+        """
+        if self.changed:
+            self.save(path)
+
+    def load(self, path: str) -> None:
+        """
+        Replace the archive with the one saved in a file, keeping its best genomes.
+
+        Args:
+            path: Path of the archive file
+
+        Raises:
+            ValueError: If the file isn't a valid archive
+        """
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                scores: List[int] = data["scores"].tolist()
+                generations: List[int] = data["generations"].tolist()
+                weights: np.ndarray = data["weights"]
+        except (OSError, KeyError, ValueError) as error:
+            raise ValueError(f"Invalid hall of fame {path}: {error}") from error
+
+        self.scores = scores[: self.size]
+        self.generations = generations[: self.size]
+        self.chromosomes = list(weights[: self.size])
+        self.rebuild_digests()
+        self.changed = False
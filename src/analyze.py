@@ -0,0 +1,304 @@
+import argparse
+import ast
+import csv
+import glob
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .columnar_log import RunArrays, get_run_paths, read_run
+from .metrics_logger import LOGS_DIR
+
+DEFAULT_PERCENTILES: List[float] = [10, 50, 90]
+
+# Biggest CSV field, a C long is 32 bits on Windows
+CSV_FIELD_SIZE_LIMIT: int = min(sys.maxsize, 2**31 - 1)
+
+
+class GenerationLog(NamedTuple):
+    """A generation as logged by MetricsLogger."""
+
+    generation: int
+    best_car_score: float
+    cars_alive: int
+    # Score of every car, None if the run didn't log them
+    scores: Optional[np.ndarray]
+    # Array (cars, chromosomes) of weights, None if the run didn't log them
+    weights: Optional[np.ndarray]
+
+
+class GenerationStats(NamedTuple):
+    """Statistics of a generation."""
+
+    generation: int
+    best: float
+    mean: float
+    percentiles: List[float]
+    # Mean standard deviation of each weight across the population
+    diversity: float
+    cars_alive: int
+
+
+class RunSummary(NamedTuple):
+    """Statistics of a whole run."""
+
+    path: str
+    generations: int
+    best: float
+    # First generation that reached the best score of the run
+    convergence_generation: Optional[int]
+    final_mean: float
+    final_diversity: float
+
+
+def iter_generations(csv_path: str) -> Iterator[GenerationLog]:
+    """
+    Stream the generations of a run, one at a time.
+
+    The scores and weights come from the memory-mapped columnar log, or from
+    the best_weights column of older CSV files.
+
+    Args:
+        csv_path: Path of the CSV file of the run
+
+    Raises:
+        ValueError: If the CSV file isn't a metrics log
+    """
+    run: Optional[RunArrays] = None
+    if os.path.exists(get_run_paths(csv_path).header):
+        run = read_run(csv_path)
+
+    # Older logs keep every car in a single (huge) field
+    csv.field_size_limit(CSV_FIELD_SIZE_LIMIT)
+
+    with open(csv_path, newline="") as csvfile:
+        rows = (
+            row for row in csv.reader(csvfile) if row and not row[0].startswith("#")
+        )
+
+        columns: List[str] = next(rows, [])
+        if columns[:3] != ["generation", "best_car_score", "cars_alive"]:
+            raise ValueError(f"Not a metrics log: {csv_path}")
+
+        for index, row in enumerate(rows):
+            scores: Optional[np.ndarray] = None
+            weights: Optional[np.ndarray] = None
+
+            if run is not None and index < len(run.scores):
+                scores = np.asarray(run.scores[index], dtype=np.float64)
+                weights = np.asarray(run.weights[index])
+            elif len(row) > 3:
+                scores, weights = parse_cars(row[3])
+
+            yield GenerationLog(
+                int(row[0]), float(row[1]), int(row[2]), scores, weights
+            )
+
+
+def parse_cars(field: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Parse the best_weights field of older logs.
+
+    Args:
+        field: Quoted "{'score': ..., 'weights': [...]},..." text
+
+    Returns:
+        The scores and the (cars, chromosomes) weights of every car
+    """
+    cars = ast.literal_eval(f"[{field.strip(chr(34))}]")
+
+    scores = np.array([car["score"] for car in cars], dtype=np.float64)
+    weights = np.array([car["weights"] for car in cars], dtype=np.float32)
+
+    return scores, weights
+
+
+def get_generation_stats(
+    log: GenerationLog, percentiles: Sequence[float]
+) -> GenerationStats:
+    """
+    Compute the statistics of a generation.
+
+    Args:
+        log: Generation to analyze
+        percentiles: Percentiles of the scores to compute
+    """
+    if log.scores is None or log.scores.size == 0:
+        return GenerationStats(
+            log.generation,
+            log.best_car_score,
+            float("nan"),
+            [float("nan")] * len(percentiles),
+            float("nan"),
+            log.cars_alive,
+        )
+
+    diversity: float = float("nan")
+    if log.weights is not None and log.weights.size:
+        diversity = float(log.weights.std(axis=0).mean())
+
+    return GenerationStats(
+        log.generation,
+        float(log.scores.max()),
+        float(log.scores.mean()),
+        np.percentile(log.scores, percentiles).tolist(),
+        diversity,
+        log.cars_alive,
+    )
+
+
+def analyze_run(
+    csv_path: str,
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+    output_path: Optional[str] = None,
+) -> RunSummary:
+    """
+    Stream a run, optionally writing the statistics of every generation.
+
+    Args:
+        csv_path: Path of the CSV file of the run
+        percentiles: Percentiles of the scores to compute
+        output_path: CSV file for the statistics of each generation (None
+            to only summarize the run)
+
+    Returns:
+        The summary of the run
+    """
+    generations: int = 0
+    best: float = float("-inf")
+    convergence_generation: Optional[int] = None
+    last: Optional[GenerationStats] = None
+
+    output_file = open(output_path, "w", newline="") if output_path else None
+    try:
+        writer = csv.writer(output_file) if output_file else None
+        if writer is not None:
+            writer.writerow(
+                ["generation", "best", "mean"]
+                + [f"p{percentile:g}" for percentile in percentiles]
+                + ["diversity", "cars_alive"]
+            )
+
+        for log in iter_generations(csv_path):
+            last = get_generation_stats(log, percentiles)
+            generations += 1
+
+            if last.best > best:
+                best = last.best
+                convergence_generation = last.generation
+
+            if writer is not None:
+                writer.writerow(
+                    [last.generation, last.best, last.mean]
+                    + last.percentiles
+                    + [last.diversity, last.cars_alive]
+                )
+    finally:
+        if output_file is not None:
+            output_file.close()
+
+    return RunSummary(
+        csv_path,
+        generations,
+        best if generations else float("nan"),
+        convergence_generation,
+        last.mean if last else float("nan"),
+        last.diversity if last else float("nan"),
+    )
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse the command line arguments.
+
+    Args:
+        argv: Arguments to parse (defaults to sys.argv)
+
+    Returns:
+        Parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        description="Stream training runs and summarize their scores and diversity"
+    )
+    parser.add_argument(
+        "runs",
+        nargs="*",
+        help="CSV files of the runs (every run in logs/ if none)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="runs analyzed in parallel",
+    )
+    parser.add_argument(
+        "--percentiles",
+        type=float,
+        nargs="+",
+        default=DEFAULT_PERCENTILES,
+        help="percentiles of the scores of each generation",
+    )
+    parser.add_argument(
+        "--output-dir",
+        default=None,
+        help="write the statistics of every generation of each run here",
+    )
+
+    return parser.parse_args(argv)
+
+
+def print_summaries(summaries: Iterable[RunSummary]) -> None:
+    """Print a line per run, as soon as each one is analyzed."""
+    print(
+        f"{'run':<32} {'generations':>11} {'best':>8} {'converged':>9} "
+        f"{'mean':>8} {'diversity':>9}"
+    )
+
+    for summary in summaries:
+        converged: str = (
+            "-"
+            if summary.convergence_generation is None
+            else str(summary.convergence_generation)
+        )
+        print(
+            f"{os.path.basename(summary.path):<32} {summary.generations:>11} "
+            f"{summary.best:>8g} {converged:>9} {summary.final_mean:>8.2f} "
+            f"{summary.final_diversity:>9.4f}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+
+    runs: List[str] = args.runs or sorted(glob.glob(os.path.join(LOGS_DIR, "*.csv")))
+    if not runs:
+        print("No runs to analyze")
+        return
+
+    output_paths: List[Optional[str]] = [None] * len(runs)
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+        output_paths = [
+            os.path.join(
+                args.output_dir,
+                f"{os.path.splitext(os.path.basename(run))[0]}.analysis.csv",
+            )
+            for run in runs
+        ]
+
+    workers: int = max(1, min(args.workers, len(runs)))
+    percentiles: List[List[float]] = [args.percentiles] * len(runs)
+
+    if workers == 1:
+        summaries = map(analyze_run, runs, percentiles, output_paths)
+        print_summaries(summaries)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            print_summaries(executor.map(analyze_run, runs, percentiles, output_paths))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,21 @@ import math
 import random
 from typing import Any, Dict, List, Optional, Tuple, Union
 
+import numpy as np
 import pygame
 
 from .ai.car_rna import CarRNA, CarRNAResult
 from .car_metric import CarMetric
-from .config.settings import CAR_SPEED, CAR_TURN_SPEED, MANUAL_CONTROL
+from .config.settings import (
+    CAR_SPEED,
+    CAR_TURN_SPEED,
+    INIT_CAR_ANGLE,
+    MANUAL_CONTROL,
+    SENSOR_ANGLES,
+)
+from .distance_field import DistanceField
+from .heading_table import Heading, HeadingTable
+from .raycast import TrackLines, cast_rays_on
 from .sensor import Sensor
 
 # Type aliases for clarity
@@ -14,7 +24,57 @@ Point = Tuple[int, int]
 Line = Tuple[Point, Point]
 
 
+def get_sensor_offsets(
+    car_width: int, car_height: int, sensor_angles: List[float] = SENSOR_ANGLES
+) -> List[Tuple[int, int]]:
+    """
+    Returns the sensor offsets relative to the car center, without rotation.
+
+    Sensors looking left sit on the topleft corner, sensors looking right on
+    the topright corner and sensors looking ahead on the midtop.
+
+    Args:
+        car_width: Width of the car image
+        car_height: Height of the car image
+        sensor_angles: Angle of each sensor relative to the car direction
+    """
+    offsets: List[Tuple[int, int]] = []
+
+    for angle in sensor_angles:
+        if angle > 0:
+            offsets.append((car_width // 2, -car_height // 2))  # topleft
+        elif angle < 0:
+            offsets.append((car_width // 2, car_height // 2))  # topright
+        else:
+            offsets.append((car_width // 2, 0))  # midtop
+
+    return offsets
+
+
 class Car:
+    # No per-instance __dict__, the renderer and the manual control go
+    # through thousands of cars
+    __slots__ = (
+        "rna",
+        "x",
+        "y",
+        "angle",
+        "speed",
+        "turn_speed",
+        "alive",
+        "pause",
+        "image",
+        "collision_radius",
+        "sensor_offsets",
+        "heading_table",
+        "rotated_car",
+        "rect",
+        "sensors",
+        "metrics",
+        "drawn_key",
+        "drawn_rect",
+    )
+
     def __init__(
         self,
         rna: CarRNA,
@@ -23,10 +83,15 @@ class Car:
         img_path: str,
         width: int = 60,
         image: Optional[pygame.Surface] = None,
+        heading_table: Optional[HeadingTable] = None,
+        angle: float = INIT_CAR_ANGLE,
     ) -> None:
         """
         Initialize a car with neural network for driving.
 
+        Cars can be reused with reset, which puts them back at a starting
+        position with another neural network.
+
         Args:
             rna: Neural network that controls the car
             x: Initial x position
@@ -34,53 +99,79 @@ class Car:
             img_path: Path to the car image file
             width: Width to scale the car image to
             image: Pre-loaded image (optional)
+            heading_table: Precomputed values per heading, shared by all the
+                cars of a track (a private one is built if None)
+            angle: Initial angle in degrees
         """
-        self.rna: CarRNA = rna
-        self.x: float = x
-        self.y: float = y
-        self.angle: float = 90
+        self.angle: float = angle
         self.speed: float = CAR_SPEED
         self.turn_speed: float = CAR_TURN_SPEED
-        self.alive: bool = True
-        self.pause: bool = False
 
         # Load and scale image
         self.image: pygame.Surface = image
-        self.rect: pygame.Rect = self.image.get_rect(center=(x, y))
-
-        self.rotated_car: pygame.Surface = pygame.transform.rotate(
-            self.image, self.angle
-        )
-
-        # Useful to get the position of the car in any moment
-        self.rect = self.rotated_car.get_rect(center=(self.x, self.y))
 
         car_width, car_height = self.image.get_size()
 
+        # Clearance the car needs around its center with a distance field
+        self.collision_radius: float = min(car_width, car_height) / 2
+
         # Sensor offsets (relative to center, without rotation)
-        self.sensor_offsets: List[Tuple[int, int]] = [
-            (car_width // 2, -car_height // 2),  # topleft
-            (car_width // 2, 0),  # midtop
-            (car_width // 2, car_height // 2),  # topright
-        ]
+        self.sensor_offsets: List[Tuple[int, int]] = get_sensor_offsets(
+            car_width, car_height
+        )
+
+        # Direction, rotated sensor offsets and rotated image of each heading
+        self.heading_table: HeadingTable = heading_table or HeadingTable(
+            self.angle, self.sensor_offsets, SENSOR_ANGLES, self.image
+        )
 
         # Sensors
         self.sensors: List[Sensor] = [
-            Sensor(self.sensor_offsets[0], 45),  # left-top
-            Sensor(self.sensor_offsets[1], 0),  # mid-top
-            Sensor(self.sensor_offsets[2], -45),  # right-top
+            Sensor(offset, angle)
+            for offset, angle in zip(self.sensor_offsets, SENSOR_ANGLES)
         ]
 
         # Car metrics display
         self.metrics: CarMetric = CarMetric()
 
-    def update(self, keys: List[int], lines: List[Line]) -> None:
+        # What was drawn last and where, to only update the screen where it changed
+        self.drawn_key: Optional[tuple] = None
+        self.drawn_rect: Optional[pygame.Rect] = None
+
+        self.reset(rna, x, y, angle)
+
+    def reset(self, rna: CarRNA, x: float, y: float, angle: float) -> None:
+        """
+        Put the car back at a starting position, alive, with a neural network.
+
+        Args:
+            rna: Neural network that controls the car
+            x: Initial x position
+            y: Initial y position
+            angle: Initial angle in degrees
+        """
+        self.rna: CarRNA = rna
+        self.x: float = x
+        self.y: float = y
+        self.angle: float = angle
+        self.alive: bool = True
+        self.pause: bool = False
+
+        self.rotated_car: pygame.Surface = self.heading_table.get(self.angle).image
+
+        # Useful to get the position of the car in any moment
+        self.rect: pygame.Rect = self.rotated_car.get_rect(center=(self.x, self.y))
+
+        for sensor in self.sensors:
+            sensor.reset()
+
+    def update(self, keys: List[int], lines: TrackLines) -> None:
         """
         Update the car's position, orientation, and state.
 
         Args:
             keys: List of keyboard inputs
-            lines: Track boundary lines for collision detection
+            lines: Track boundary lines (or their spatial index) for collision detection
         """
         if keys[pygame.K_SPACE]:
             self.pause = not self.pause
@@ -108,73 +199,120 @@ class Car:
         # New angle for the car
         self.angle = (self.angle + new_angle) % 360
 
-        rad: float = math.radians(self.angle)
+        heading: Heading = self.heading_table.get(self.angle)
 
-        change_x: float = self.speed * math.cos(rad)
-        change_y: float = -self.speed * math.sin(rad)
+        change_x: float = self.speed * heading.cos
+        change_y: float = -self.speed * heading.sin
 
         self.x += change_x
         self.y += change_y
 
-        # Rotate the car image
-        self.rotated_car = pygame.transform.rotate(self.image, self.angle)
+        # Pre-rotated car image
+        self.rotated_car = heading.image
         self.rect = self.rotated_car.get_rect(center=(self.x, self.y))
 
         # Update sensors position
-        self._update_sensors(lines)
+        self._update_sensors(lines, heading)
 
-        # Check collisions
-        collision: bool = self.check_collision()
+        # Check collisions, a single lookup with a distance field
+        collision: bool
+        if isinstance(lines, DistanceField):
+            collision = bool(lines.is_colliding(self.x, self.y, self.collision_radius))
+        else:
+            collision = self.check_collision()
         if collision:
             self.alive = False
 
         if self.alive:
             self.rna.increase_score(1)
 
-    def draw(self, screen: pygame.Surface) -> None:
+    def draw(self, screen: pygame.Surface, detailed: bool = True) -> pygame.Rect:
         """
         Draw the car, its sensors, and metrics on the screen.
 
         Args:
             screen: Pygame surface to draw on
+            detailed: Whether to draw the sensors and metrics, or only the car
+
+        Returns:
+            The area drawn
         """
-        screen.blit(self.rotated_car, self.rect.topleft)
+        drawn_rect: pygame.Rect = screen.blit(self.rotated_car, self.rect.topleft)
+
+        if not detailed:
+            return drawn_rect
 
         # Draw sensors
-        self._draw_sensors(screen)
+        drawn_rect.union_ip(self._draw_sensors(screen))
 
         # Draw metrics above the car
-        self.metrics.draw(
-            screen=screen,
-            car_x=self.x,
-            car_y=self.y,
-            rect_height=self.rect.height,
-            score=self.get_score(),
-            is_alive=self.alive,
+        return drawn_rect.union(
+            self.metrics.draw(
+                screen=screen,
+                car_x=self.x,
+                car_y=self.y,
+                rect_height=self.rect.height,
+                score=self.get_score(),
+                is_alive=self.alive,
+            )
+        )
+
+    def get_draw_key(self, detailed: bool = True) -> tuple:
+        """
+        Returns everything that changes how the car is drawn: two cars with
+        the same key look exactly the same on the screen.
+
+        Args:
+            detailed: Whether the sensors and metrics are drawn
+        """
+        if not detailed:
+            return (self.x, self.y, self.angle)
+
+        return (
+            self.x,
+            self.y,
+            self.angle,
+            self.alive,
+            self.get_score(),
+            tuple(sensor.current_length for sensor in self.sensors),
         )
 
-    def _update_sensors(self, lines: List[Line]) -> None:
+    def _update_sensors(self, lines: TrackLines, heading: Heading) -> None:
         """
         Update the position and collision data of all sensors.
 
         Args:
             lines: Track boundary lines for collision detection
+            heading: Precomputed values of the current car angle
         """
-        for sensor in self.sensors:
-            sensor_size: Optional[float] = (
-                self.get_closest_colission_between_sensor_and_lines(sensor, lines)
-            )
-            sensor.update(self.x, self.y, self.angle, sensor_size)
-
-    def _draw_sensors(self, screen: pygame.Surface) -> None:
+        # All the sensors are cast in one batch, from their current position
+        rays: np.ndarray = np.array([sensor.get_ray() for sensor in self.sensors])
+        distances: List[float] = cast_rays_on(
+            lines, rays, [sensor.max_ray_length for sensor in self.sensors]
+        ).tolist()
+
+        for sensor, distance, (offset_x, offset_y), angle_rad in zip(
+            self.sensors, distances, heading.sensor_offsets, heading.sensor_angles_rad
+        ):
+            sensor_size: Optional[float] = None if math.isnan(distance) else distance
+            sensor.place(self.x + offset_x, self.y + offset_y, angle_rad, sensor_size)
+
+    def _draw_sensors(self, screen: pygame.Surface) -> pygame.Rect:
         """
         Draw all sensors on the screen.
 
         Args:
             screen: Pygame surface to draw on
+
+        Returns:
+            The area drawn
         """
-        for sensor in self.sensors:
-            sensor.draw(screen)
+        drawn_rect: pygame.Rect = self.sensors[0].draw(screen)
+
+        for sensor in self.sensors[1:]:
+            drawn_rect.union_ip(sensor.draw(screen))
+
+        return drawn_rect
 
     def check_rays_collision(self) -> List[Optional[float]]:
         """
@@ -192,7 +330,7 @@ class Car:
         return collisions
 
     def get_closest_colission_between_sensor_and_lines(
-        self, sensor: Sensor, lines: List[Line]
+        self, sensor: Sensor, lines: TrackLines
     ) -> Optional[float]:
         """
         Find the closest collision between a sensor and track lines.
@@ -204,17 +342,7 @@ class Car:
         Returns:
             Distance to the closest collision or None if no collision
         """
-        sensor_colissions: Optional[float] = None
-
-        for line in lines:
-            colission: Optional[float] = sensor.get_distance_to_collision(line)
-
-            if sensor_colissions is None or (
-                colission is not None and colission < sensor_colissions
-            ):
-                sensor_colissions = colission
-
-        return sensor_colissions
+        return sensor.get_closest_collision(lines)
 
     def is_alive(self) -> bool:
         """
@@ -2,6 +2,8 @@ from typing import Any, Tuple
 
 import pygame
 
+from .render_cache import get_font, get_panel, render_text
+
 
 class CarMetric:
     """
@@ -9,11 +11,14 @@ class CarMetric:
     This separates the display logic from the car logic.
     """
 
+    __slots__ = ("font",)
+
     def __init__(self) -> None:
         """
         Initialize the car metric display.
         """
-        self.font = pygame.font.Font("freesansbold.ttf", 10)
+        # Shared by every car
+        self.font = get_font(10)
 
     def draw(
         self,
@@ -23,7 +28,7 @@ class CarMetric:
         rect_height: int,
         score: int,
         is_alive: bool,
-    ) -> None:
+    ) -> pygame.Rect:
         """
         Draw the car's metrics (score and alive status) above the car.
 
@@ -34,6 +39,9 @@ class CarMetric:
             rect_height: Height of the car rectangle
             score: Current score of the car
             is_alive: Whether the car is alive or not
+
+        Returns:
+            The area drawn
         """
         # Create text for score and status
         score_text = f"Score: {score:03d}"
@@ -45,16 +53,14 @@ class CarMetric:
             status_text = "DEAD"
             status_color = (255, 100, 100)  # Red
 
-        # Render text surfaces
-        score_surface = self.font.render(score_text, True, (255, 255, 255))
-        status_surface = self.font.render(status_text, True, status_color)
+        # Render text surfaces (cached, like the background)
+        score_surface = render_text(self.font, score_text, (255, 255, 255))
+        status_surface = render_text(self.font, status_text, status_color)
 
-        # Create background for better visibility
+        # Semi-transparent background for better visibility
         bg_width = max(score_surface.get_width(), status_surface.get_width()) + 6
         bg_height = score_surface.get_height() + status_surface.get_height() + 2
-        bg_surface = pygame.Surface((bg_width, bg_height))
-        bg_surface.set_alpha(150)  # Semi-transparent background
-        bg_surface.fill((30, 30, 40))
+        bg_surface = get_panel((bg_width, bg_height), (30, 30, 40), 150)
 
         # Position above the car
         car_center_x = car_x
@@ -62,18 +68,20 @@ class CarMetric:
 
         # Draw background
         bg_pos = (car_center_x - bg_width // 2, car_top_y - bg_height - 5)
-        screen.blit(bg_surface, bg_pos)
+        drawn_rect = screen.blit(bg_surface, bg_pos)
 
         # Draw score text
         score_pos = (
             car_center_x - score_surface.get_width() // 2,
             car_top_y - bg_height - 3,
         )
-        screen.blit(score_surface, score_pos)
+        drawn_rect.union_ip(screen.blit(score_surface, score_pos))
 
         # Draw status text below score
         status_pos = (
             car_center_x - status_surface.get_width() // 2,
             car_top_y - status_surface.get_height() - 5,
         )
-        screen.blit(status_surface, status_pos)
+        drawn_rect.union_ip(screen.blit(status_surface, status_pos))
+
+        return drawn_rect
@@ -0,0 +1,213 @@
+import json
+import os
+import random
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from .ai.car_alg_gen import CarAlgGen
+from .config.settings import CHECKPOINTS_DIR
+
+# Version of the checkpoint format, stored in every file
+CHECKPOINT_FORMAT_VERSION: int = 1
+
+
+def get_run_checkpoint_path(run_id: int) -> str:
+    """
+    Returns the default checkpoint file of a run, so runs never share one.
+
+    Args:
+        run_id: Id of the run in the run registry
+    """
+    return os.path.join(CHECKPOINTS_DIR, f"run_{run_id:03d}.npz")
+
+
+def save_checkpoint(
+    path: str, alg_gen: CarAlgGen, seed: int, evaluated: bool = True
+) -> None:
+    """
+    Save the whole state of the genetic algorithm, replacing the old file atomically.
+
+    The file is a NumPy .npz archive with the population weights and scores,
+    the hall of fame, the generation counter and the state of the random
+    module and of the NumPy generator, so a resumed run goes on exactly as
+    the interrupted one would have.
+
+    Args:
+        path: Path of the checkpoint file
+        alg_gen: Genetic algorithm to save
+        seed: Random seed of the run, kept for the metrics log
+        evaluated: Whether the population finished its simulation. An
+            unfinished population is saved without scores and simulated
+            again when resumed
+    """
+    random_version, random_state, random_gauss = random.getstate()
+    hall_of_fame = alg_gen.hall_of_fame
+
+    directory: str = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temporary_path, "wb") as checkpoint_file:
+            np.savez(
+                checkpoint_file,
+                version=CHECKPOINT_FORMAT_VERSION,
+                seed=seed,
+                generation=alg_gen.generation,
+                evaluated=evaluated,
+                genetic_backend=alg_gen.genetic_backend,
+                neurons_format=np.array(alg_gen.neurons_format, dtype=np.int64),
+                weights=np.array(
+                    [rna.weights for rna in alg_gen.population], dtype=np.float32
+                ).reshape(-1, alg_gen.chromosomes_amount),
+                scores=np.array(
+                    [rna.get_score() if evaluated else 0 for rna in alg_gen.population],
+                    dtype=np.int64,
+                ),
+                random_version=random_version,
+                random_state=np.array(random_state, dtype=np.uint32),
+                random_gauss=np.nan if random_gauss is None else random_gauss,
+                # The NumPy state holds 128-bit integers, kept as JSON text
+                numpy_state=json.dumps(alg_gen.rng.bit_generator.state),
+                hall_of_fame_scores=np.array(hall_of_fame.scores, dtype=np.int64),
+                hall_of_fame_generations=np.array(
+                    hall_of_fame.generations, dtype=np.int64
+                ),
+                hall_of_fame_weights=np.array(
+                    hall_of_fame.chromosomes, dtype=np.float32
+                ).reshape(-1, alg_gen.chromosomes_amount),
+            )
+        os.replace(temporary_path, path)
+    finally:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+
+
+def load_checkpoint(path: str, alg_gen: CarAlgGen) -> int:
+    """
+    Restore a saved state into the genetic algorithm, and the random module.
+
+    An evaluated population is bred right away, so the genetic algorithm is
+    left with the population to simulate next either way.
+
+    Args:
+        path: Path of the checkpoint file
+        alg_gen: Genetic algorithm to restore, created with the same
+            topology, genetic backend and population size as the saved one
+
+    Returns:
+        The random seed of the saved run
+
+    Raises:
+        ValueError: If the file isn't a valid checkpoint or doesn't match
+            the genetic algorithm
+    """
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            checkpoint: Dict[str, Any] = {key: data[key] for key in data.files}
+    except (OSError, ValueError) as error:
+        raise ValueError(f"Invalid checkpoint {path}: {error}") from error
+
+    if int(checkpoint.get("version", -1)) != CHECKPOINT_FORMAT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version in {path}")
+
+    try:
+        return _restore_checkpoint(checkpoint, alg_gen)
+    except KeyError as error:
+        raise ValueError(f"Invalid checkpoint {path}: missing {error}") from error
+
+
+def _restore_checkpoint(checkpoint: Dict[str, Any], alg_gen: CarAlgGen) -> int:
+    """Restore the arrays of a checkpoint, see load_checkpoint."""
+    neurons_format = checkpoint["neurons_format"].tolist()
+    if neurons_format != alg_gen.neurons_format:
+        raise ValueError(
+            f"Checkpoint topology doesn't match: {neurons_format} != {alg_gen.neurons_format}"
+        )
+
+    genetic_backend = str(checkpoint["genetic_backend"])
+    if genetic_backend != alg_gen.genetic_backend:
+        raise ValueError(
+            f"Checkpoint genetic backend doesn't match: {genetic_backend} != {alg_gen.genetic_backend}"
+        )
+
+    weights: np.ndarray = checkpoint["weights"]
+    if len(weights) != alg_gen.population_size:
+        raise ValueError(
+            f"Checkpoint population size doesn't match: {len(weights)} != {alg_gen.population_size}"
+        )
+
+    alg_gen.generation = int(checkpoint["generation"])
+    alg_gen.population = alg_gen.create_population(weights)
+    for rna, score in zip(alg_gen.population, checkpoint["scores"].tolist()):
+        rna.set_score(score)
+
+    hall_of_fame = alg_gen.hall_of_fame
+    hall_of_fame.scores = checkpoint["hall_of_fame_scores"].tolist()
+    hall_of_fame.generations = checkpoint["hall_of_fame_generations"].tolist()
+    hall_of_fame.chromosomes = list(checkpoint["hall_of_fame_weights"])
+    hall_of_fame.rebuild_digests()
+
+    random_gauss: Optional[float] = float(checkpoint["random_gauss"])
+    random.setstate(
+        (
+            int(checkpoint["random_version"]),
+            tuple(checkpoint["random_state"].tolist()),
+            None if np.isnan(random_gauss) else random_gauss,
+        )
+    )
+    alg_gen.rng.bit_generator.state = json.loads(str(checkpoint["numpy_state"]))
+
+    if bool(checkpoint["evaluated"]):
+        alg_gen.get_new_population()
+
+    return int(checkpoint["seed"])
+
+
+class Checkpointer:
+    """Saves the genetic algorithm every few generations and on exit."""
+
+    def __init__(self, path: str, interval: int, seed: int) -> None:
+        """
+        Args:
+            path: Path of the checkpoint file
+            interval: Generations between two checkpoints (0 disables checkpoints)
+            seed: Random seed of the run
+        """
+        self.path: str = path
+        self.interval: int = interval
+        self.seed: int = seed
+        self.enabled: bool = interval > 0
+
+    def save(self, alg_gen: CarAlgGen, evaluated: bool = True) -> None:
+        """
+        Save the genetic algorithm now.
+
+        Args:
+            alg_gen: Genetic algorithm to save
+            evaluated: Whether the population finished its simulation
+        """
+        save_checkpoint(self.path, alg_gen, self.seed, evaluated)
+
+    def save_if_due(self, alg_gen: CarAlgGen) -> None:
+        """
+        Save the evaluated population once every interval generations.
+
+        Args:
+            alg_gen: Genetic algorithm to save, before breeding the next generation
+        """
+        if self.enabled and (alg_gen.get_generation() + 1) % self.interval == 0:
+            self.save(alg_gen)
+
+    def save_on_exit(self, alg_gen: CarAlgGen) -> None:
+        """
+        Save the current population, simulated again when resumed, if
+        checkpoints are enabled.
+
+        Args:
+            alg_gen: Genetic algorithm to save
+        """
+        if self.enabled:
+            self.save(alg_gen, evaluated=False)
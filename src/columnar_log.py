@@ -0,0 +1,179 @@
+import json
+import os
+import struct
+from typing import Any, BinaryIO, Dict, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+# Version of the columnar log format, stored in every header
+COLUMNAR_LOG_VERSION: int = 1
+
+# Bytes of the .npy header, rewritten in place whenever rows are appended.
+# A multiple of 64 with room for any shape.
+NPY_HEADER_SIZE: int = 128
+
+NPY_MAGIC: bytes = b"\x93NUMPY\x01\x00"
+
+
+class RunPaths(NamedTuple):
+    """Files of a run, next to its CSV summary."""
+
+    header: str
+    weights: str
+    scores: str
+    hall_of_fame: str
+
+
+class RunArrays(NamedTuple):
+    """A run of the columnar log, memory-mapped."""
+
+    header: Dict[str, Any]
+    # Array (generations, population, chromosomes) of float32 weights
+    weights: np.ndarray
+    # Array (generations, population) with the score of every car
+    scores: np.ndarray
+
+
+def get_run_paths(csv_path: str) -> RunPaths:
+    """
+    Returns the columnar files of the run logged in a CSV summary.
+
+    Args:
+        csv_path: Path of the CSV summary of the run
+    """
+    base: str = os.path.splitext(csv_path)[0]
+
+    return RunPaths(
+        f"{base}.json",
+        f"{base}.weights.npy",
+        f"{base}.scores.npy",
+        f"{base}.hall_of_fame.npz",
+    )
+
+
+def write_run_header(path: str, seed: int, neurons_format: Sequence[int]) -> None:
+    """
+    Write the header of a run: format version, seed, topology and files.
+
+    Args:
+        path: Path of the header file
+        seed: Random seed of the run
+        neurons_format: Network topology of every car
+    """
+    base: str = os.path.basename(path)[: -len(".json")]
+    header: Dict[str, Any] = {
+        "version": COLUMNAR_LOG_VERSION,
+        "seed": seed,
+        "neurons_format": list(neurons_format),
+        "weights": f"{base}.weights.npy",
+        "scores": f"{base}.scores.npy",
+    }
+
+    with open(path, "w") as header_file:
+        json.dump(header, header_file, indent=4)
+
+
+def read_run(csv_path: str) -> RunArrays:
+    """
+    Memory-map the columnar log of a run, without reading or parsing it.
+
+    Args:
+        csv_path: Path of the CSV summary of the run
+
+    Raises:
+        ValueError: If the run has no usable columnar log
+    """
+    paths: RunPaths = get_run_paths(csv_path)
+
+    try:
+        with open(paths.header) as header_file:
+            header: Dict[str, Any] = json.load(header_file)
+
+        if header.get("version") != COLUMNAR_LOG_VERSION:
+            raise ValueError(f"Unsupported columnar log version in {paths.header}")
+
+        weights: np.ndarray = np.load(paths.weights, mmap_mode="r")
+        scores: np.ndarray = np.load(paths.scores, mmap_mode="r")
+    except (OSError, json.JSONDecodeError) as error:
+        raise ValueError(f"Invalid columnar log {csv_path}: {error}") from error
+
+    # A row may be half written if the run crashed, keep the complete ones
+    generations: int = min(len(weights), len(scores))
+
+    return RunArrays(header, weights[:generations], scores[:generations])
+
+
+class NpyAppender:
+    """
+    An .npy file that grows along its first axis.
+
+    The header has a fixed size and is rewritten with the new shape after
+    every append, so the file is a valid .npy at any time and np.load can
+    memory-map it while it's being written.
+    """
+
+    def __init__(self, path: str, dtype: np.dtype, row_shape: Tuple[int, ...]) -> None:
+        """
+        Create the file, empty.
+
+        Args:
+            path: Path of the .npy file
+            dtype: Type of the values
+            row_shape: Shape of each row, every axis but the first one
+        """
+        self.path: str = path
+        self.dtype: np.dtype = np.dtype(dtype)
+        self.row_shape: Tuple[int, ...] = tuple(row_shape)
+        self.rows: int = 0
+        self.file: BinaryIO = open(path, "wb")
+
+        self._write_header()
+
+    def append(self, rows: np.ndarray) -> None:
+        """
+        Append rows to the end of the file.
+
+        Args:
+            rows: Array (rows, *row_shape)
+
+        Raises:
+            ValueError: If the rows don't have the shape of the file
+        """
+        rows = np.ascontiguousarray(rows, dtype=self.dtype)
+        if rows.shape[1:] != self.row_shape:
+            raise ValueError(
+                f"Rows must have shape (n, {self.row_shape}): {rows.shape} in {self.path}"
+            )
+
+        self.file.seek(0, os.SEEK_END)
+        self.file.write(rows.tobytes())
+        self.rows += len(rows)
+
+        # The data goes first, so the header never counts missing rows
+        self._write_header()
+
+    def flush(self) -> None:
+        """Flush the written rows to the disk."""
+        self.file.flush()
+
+    def close(self) -> None:
+        """Close the file."""
+        self.file.close()
+
+    def _write_header(self) -> None:
+        """Write the .npy header with the current amount of rows."""
+        header: str = repr(
+            {
+                "descr": np.lib.format.dtype_to_descr(self.dtype),
+                "fortran_order": False,
+                "shape": (self.rows, *self.row_shape),
+            }
+        )
+        header_length: int = NPY_HEADER_SIZE - len(NPY_MAGIC) - 2
+        padded: bytes = header.ljust(header_length - 1).encode("latin1") + b"\n"
+
+        if len(padded) != header_length:
+            raise ValueError(f"Shape too big for the header of {self.path}")
+
+        self.file.seek(0)
+        self.file.write(NPY_MAGIC + struct.pack("<H", header_length) + padded)
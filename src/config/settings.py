@@ -13,6 +13,10 @@ BACKGROUND_COLOR = (0, 140, 0)  # Green grass
 FPS = 60
 CARS_AMOUNT = 30
 
+# Simulation speeds selectable while playing (keys 1-4, +/-), in simulation
+# steps per displayed frame at FPS. None runs as many steps as fit in a frame.
+SPEED_MULTIPLIERS = [1, 10, 100, None]
+
 # AI settings
 GENERATION_TIME_LIMIT = 2  # Seconds before creating a new generation
 MAXIMUM_SCORE = 100
@@ -26,9 +30,15 @@ CAR_IMAGE_PATH = os.path.join(
 if not os.path.exists(CAR_IMAGE_PATH):
     raise FileNotFoundError(f"Car image not found at {CAR_IMAGE_PATH}")
 
+# Directory for precomputed data that can be rebuilt at any time.
+CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))), ".cache"
+)
+
 CAR_WIDTH = 30
 CAR_SPEED = 20
 CAR_TURN_SPEED = 10
+INIT_CAR_ANGLE = 90  # Heading every car starts with, in degrees (90 points up)
 
 # Probability of mutation during reproduction in the genetic algorithm.
 # Valid range: 0.0 (no mutation) to 1.0 (always mutate).
@@ -38,8 +48,77 @@ MUTATION_RATE = 0.1
 # Valid range: 0.0 (don't take from parent) to 1.0 (take all from parent).
 CROSSOVER_RATE = 0.8
 
+# How the genetic operators run:
+# "lists" works gene by gene on Python lists with the random module,
+# "numpy" works on an (N, chromosomes) array with a seeded NumPy generator
+# (much faster on big populations, but a different random stream).
+GENETIC_BACKEND = "lists"
+
+# Best genomes of each generation carried over unchanged to the next one.
+ELITE_AMOUNT = 0
+
+# Best genomes of the whole run kept in the hall of fame.
+HALL_OF_FAME_SIZE = 20
+
+# Scores of simulated genomes kept to skip simulating them again (0 disables it).
+FITNESS_CACHE_SIZE = 1_000_000
+
+# Directory where each run saves the state of the genetic algorithm to resume
+# training, as run_<run id>.npz unless another file is given.
+CHECKPOINTS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "checkpoints"
+)
+
+# Generations between two checkpoints (0 disables checkpoints).
+CHECKPOINT_INTERVAL = 10
+
+# Generations the metrics writer thread can fall behind before the training waits.
+METRICS_QUEUE_SIZE = 64
+
+# The metrics are flushed to disk every METRICS_FLUSH_RECORDS generations or
+# METRICS_FLUSH_INTERVAL seconds, whichever comes first.
+METRICS_FLUSH_RECORDS = 16
+METRICS_FLUSH_INTERVAL = 1.0
+
+# Rendered texts and panel backgrounds kept by the HUD render cache.
+TEXT_CACHE_SIZE = 4096
+
+# Populations up to this size draw every car with its sensors and score, and
+# list every car in the status panel. Bigger ones only draw the sensors and
+# score of the DETAILED_CARS best alive cars and list the STATUS_PANEL_ROWS
+# best cars, with the counts of the whole population.
+LOD_CARS_THRESHOLD = 50
+DETAILED_CARS = 10
+STATUS_PANEL_ROWS = 20
+# Past this many cars, the cars that aren't detailed are drawn as points of
+# POINT_SIZE pixels instead of sprites.
+POINT_CARS_THRESHOLD = 500
+POINT_SIZE = 3
+
 # If true, the user can control the cars manually.
 MANUAL_CONTROL = False
 
 # Factor to normalize the inputs to be between 0 and 1.
 NORMALIZATION_FACTOR = 400
+
+# Sensor angles relative to the car direction, one network input per sensor.
+# Positive angles look left from a front corner, 0 looks ahead from the front.
+SENSOR_ANGLES = [45, 0, -45]
+
+# Neurons of each hidden layer of the network (the output is a single neuron).
+HIDDEN_LAYERS = [3]
+
+# Side of the cells of the spatial index over the track segments, in pixels.
+SEGMENT_GRID_CELL_SIZE = 40
+
+# Tracks with less segments than this are cast by brute force, which is
+# faster than walking the grid when there are only a few lines.
+SEGMENT_GRID_MIN_SEGMENTS = 64
+
+# How collisions and sensors are computed:
+# "segments" intersects the rays with the exact track lines,
+# "field" looks up and sphere-traces a precomputed distance field (faster, approximate).
+COLLISION_BACKEND = "segments"
+
+# Pixels between two samples of the distance field.
+DISTANCE_FIELD_RESOLUTION = 2
@@ -0,0 +1,427 @@
+import hashlib
+import math
+import os
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .config.settings import (
+    CACHE_DIR,
+    DISTANCE_FIELD_RESOLUTION,
+    TRACK_HEIGHT,
+    TRACK_WIDTH,
+)
+
+# Version of the raster layout, part of the cache key
+DISTANCE_FIELD_VERSION: int = 1
+
+# Safety limit of sphere tracing steps per ray, rays still marching are a miss
+MAX_TRACE_STEPS: int = 256
+
+# Rays closer than this to a line hit it, also the smallest tracing step
+TRACE_HIT_DISTANCE: float = 0.5
+
+# Batches up to this many rays (a single car) are traced one by one with
+# Python floats, which is faster than NumPy for so few values
+MAX_SCALAR_RAYS: int = 8
+
+
+class DistanceField:
+    """
+    Signed distance to the closest track line, sampled on a raster.
+
+    The raster covers TRACK_WIDTH x TRACK_HEIGHT (grown to fit the whole
+    track) with one sample every `resolution` pixels, taken at the center of
+    each cell. The distance is positive on the track (inside an odd amount of
+    closed boundaries) and negative off it, so checking a car is one array
+    lookup and sensors sphere-trace along the raster instead of testing every
+    line.
+
+    It's an approximation of the exact segment math: distances are within
+    about a cell of the exact ones.
+    """
+
+    def __init__(
+        self, values: np.ndarray, resolution: float, path: Optional[str] = None
+    ) -> None:
+        """
+        Wrap a raster of signed distances.
+
+        Args:
+            values: Array (rows, cols) of signed distances, row 0 at y = 0
+            resolution: Pixels between two samples
+            path: File the raster is memory-mapped from, if any
+        """
+        self.values: np.ndarray = values
+        self.resolution: float = float(resolution)
+        self.path: Optional[str] = path
+        self.rows, self.cols = values.shape
+
+        # A sample can be this far from any point of its cell
+        self.cell_radius: float = self.resolution * math.sqrt(2) / 2
+
+    def __reduce__(self):
+        """Memory-mapped fields are sent to worker processes as their path."""
+        if self.path is not None:
+            return (DistanceField.load, (self.path, self.resolution))
+
+        return (DistanceField, (np.asarray(self.values), self.resolution))
+
+    @classmethod
+    def build(
+        cls,
+        segments: np.ndarray,
+        resolution: float = DISTANCE_FIELD_RESOLUTION,
+        width: float = TRACK_WIDTH,
+        height: float = TRACK_HEIGHT,
+    ) -> "DistanceField":
+        """
+        Compute the signed distance of every sample to the segments.
+
+        Args:
+            segments: Array (M, 4) of segments as (x1, y1, x2, y2), forming
+                closed boundaries
+            resolution: Pixels between two samples
+            width: Width of the area to cover, grown to fit the segments
+            height: Height of the area to cover, grown to fit the segments
+
+        Raises:
+            ValueError: If the resolution isn't positive
+        """
+        if resolution <= 0:
+            raise ValueError(f"Resolution must be positive: {resolution}")
+
+        segments = np.asarray(segments, dtype=np.float64).reshape(-1, 4)
+        cols, rows = get_raster_shape(segments, resolution, width, height)
+
+        return cls(
+            _compute_signed_distances(segments, resolution, cols, rows), resolution
+        )
+
+    @classmethod
+    def load(cls, path: str, resolution: float) -> "DistanceField":
+        """
+        Memory-map a raster saved with save.
+
+        Args:
+            path: Path of the .npy file
+            resolution: Pixels between two samples
+        """
+        return cls(np.load(path, mmap_mode="r"), resolution, path)
+
+    def save(self, path: str) -> None:
+        """
+        Save the raster as a .npy file, replacing the old one atomically.
+
+        Args:
+            path: Path of the .npy file
+        """
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(temporary_path, "wb") as field_file:
+                np.save(field_file, np.asarray(self.values, dtype=np.float32))
+            os.replace(temporary_path, path)
+        finally:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+
+    def get_distance(
+        self, x: Union[float, np.ndarray], y: Union[float, np.ndarray]
+    ) -> np.ndarray:
+        """
+        Signed distance to the track lines at the given points.
+
+        Args:
+            x: X coordinate of the points
+            y: Y coordinate of the points
+
+        Returns:
+            Distance of each point, -inf outside the raster
+        """
+        col = np.floor(np.asarray(x, dtype=np.float64) / self.resolution)
+        row = np.floor(np.asarray(y, dtype=np.float64) / self.resolution)
+        inside = (col >= 0) & (col < self.cols) & (row >= 0) & (row < self.rows)
+
+        distances = np.full(inside.shape, -np.inf)
+        distances[inside] = self.values[
+            row[inside].astype(np.intp), col[inside].astype(np.intp)
+        ]
+
+        return distances
+
+    def get_interpolated_distance(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """
+        Signed distance at the given points, interpolating the 4 closest samples.
+
+        Near a straight line the distance is linear, so the interpolation is
+        exact there, unlike the nearest sample.
+
+        Args:
+            x: X coordinate of the points
+            y: Y coordinate of the points
+
+        Returns:
+            Distance of each point, -inf outside the raster
+        """
+        # Position in samples, the samples sitting at the center of the cells
+        col = np.asarray(x, dtype=np.float64) / self.resolution - 0.5
+        row = np.asarray(y, dtype=np.float64) / self.resolution - 0.5
+        inside = (col >= 0) & (col < self.cols - 1) & (row >= 0) & (row < self.rows - 1)
+
+        distances = np.full(inside.shape, -np.inf)
+        col, row = col[inside], row[inside]
+        left, top = np.floor(col), np.floor(row)
+        fx, fy = col - left, row - top
+        left, top = left.astype(np.intp), top.astype(np.intp)
+
+        values = self.values
+        distances[inside] = (1 - fy) * (
+            (1 - fx) * values[top, left] + fx * values[top, left + 1]
+        ) + fy * ((1 - fx) * values[top + 1, left] + fx * values[top + 1, left + 1])
+
+        return distances
+
+    def is_colliding(
+        self,
+        x: Union[float, np.ndarray],
+        y: Union[float, np.ndarray],
+        radius: float,
+    ) -> np.ndarray:
+        """
+        Returns True for the points closer than radius to a line, or off the track.
+
+        Args:
+            x: X coordinate of the points
+            y: Y coordinate of the points
+            radius: Clearance needed around each point
+        """
+        return self.get_distance(x, y) < radius
+
+    def cast_rays(
+        self,
+        rays: np.ndarray,
+        ray_lengths: Union[float, Sequence[float], np.ndarray],
+    ) -> np.ndarray:
+        """
+        Distance from the start of each ray to the closest line, by sphere tracing.
+
+        Every ray advances by the distance to the closest line (minus the
+        sampling error), which can't skip any line, until it's close to one
+        or crosses one between two steps.
+
+        Args:
+            rays: Array (..., 4) of rays as (start_x, start_y, end_x, end_y)
+            ray_lengths: Length of the rays, a scalar or one value per ray
+
+        Returns:
+            Array with the leading shape of rays, NaN where nothing was hit
+        """
+        rays = np.asarray(rays, dtype=np.float64)
+        shape = rays.shape[:-1]
+        flat_rays = rays.reshape(-1, 4)
+        lengths = np.broadcast_to(
+            np.asarray(ray_lengths, dtype=np.float64), shape
+        ).reshape(-1)
+
+        if len(flat_rays) <= MAX_SCALAR_RAYS:
+            return np.array(
+                [
+                    self._cast_ray(*ray, length)
+                    for ray, length in zip(flat_rays.tolist(), lengths.tolist())
+                ],
+                dtype=np.float64,
+            ).reshape(shape)
+
+        start_x, start_y = flat_rays[:, 0], flat_rays[:, 1]
+        direction_x = (flat_rays[:, 2] - start_x) / lengths
+        direction_y = (flat_rays[:, 3] - start_y) / lengths
+
+        travelled = np.zeros(len(flat_rays))
+        previous = np.full(len(flat_rays), np.nan)
+        distances = np.full(len(flat_rays), np.nan)
+        active = np.flatnonzero(lengths > 0)
+
+        for _ in range(MAX_TRACE_STEPS):
+            if active.size == 0:
+                break
+
+            t = travelled[active]
+            signed = self.get_interpolated_distance(
+                start_x[active] + t * direction_x[active],
+                start_y[active] + t * direction_y[active],
+            )
+
+            # Lines are hit from both sides: close to one, or crossed since
+            # the previous step (the sign flipped)
+            clearance = np.abs(signed)
+            hit = (clearance <= TRACE_HIT_DISTANCE) | (
+                np.sign(signed) * np.sign(previous[active]) < 0
+            )
+            distances[active[hit]] = t[hit]
+            previous[active] = signed
+
+            t = t + np.maximum(clearance - self.cell_radius, TRACE_HIT_DISTANCE)
+            travelled[active] = t
+
+            active = active[~hit & (t <= lengths[active])]
+
+        return distances.reshape(shape)
+
+    def _cast_ray(
+        self,
+        start_x: float,
+        start_y: float,
+        end_x: float,
+        end_y: float,
+        length: float,
+    ) -> float:
+        """
+        Scalar version of cast_rays for a single ray, giving the same bits.
+
+        Returns:
+            Distance to the closest line, NaN if nothing was hit
+        """
+        if not length > 0:
+            return math.nan
+
+        direction_x = (end_x - start_x) / length
+        direction_y = (end_y - start_y) / length
+        values = self.values
+        t = 0.0
+        previous = math.nan
+
+        for _ in range(MAX_TRACE_STEPS):
+            col = (start_x + t * direction_x) / self.resolution - 0.5
+            row = (start_y + t * direction_y) / self.resolution - 0.5
+
+            if 0 <= col < self.cols - 1 and 0 <= row < self.rows - 1:
+                left, top = math.floor(col), math.floor(row)
+                fx, fy = col - left, row - top
+                signed = (1 - fy) * (
+                    (1 - fx) * values.item(top, left) + fx * values.item(top, left + 1)
+                ) + fy * (
+                    (1 - fx) * values.item(top + 1, left)
+                    + fx * values.item(top + 1, left + 1)
+                )
+            else:
+                signed = -math.inf
+
+            clearance = abs(signed)
+            if clearance <= TRACE_HIT_DISTANCE or (
+                signed < 0 < previous or previous < 0 < signed
+            ):
+                return t
+            previous = signed
+
+            t = t + max(clearance - self.cell_radius, TRACE_HIT_DISTANCE)
+            if not t <= length:
+                return math.nan
+
+        return math.nan
+
+
+def get_raster_shape(
+    segments: np.ndarray,
+    resolution: float,
+    width: float = TRACK_WIDTH,
+    height: float = TRACK_HEIGHT,
+) -> Tuple[int, int]:
+    """
+    Columns and rows of a raster covering the area and every segment.
+    """
+    max_x = max(width, float(segments[:, [0, 2]].max(initial=0)) + 2 * resolution)
+    max_y = max(height, float(segments[:, [1, 3]].max(initial=0)) + 2 * resolution)
+
+    return math.ceil(max_x / resolution), math.ceil(max_y / resolution)
+
+
+def get_distance_field(
+    segments: np.ndarray,
+    resolution: float = DISTANCE_FIELD_RESOLUTION,
+    cache_dir: Optional[str] = CACHE_DIR,
+) -> DistanceField:
+    """
+    Returns the distance field of the segments, memory-mapped from the cache.
+
+    The cache file is named after a hash of the segments, the raster area and
+    the resolution, so it's computed once per track. When the cache can't be
+    written the field is kept in memory.
+
+    Args:
+        segments: Array (M, 4) of segments as (x1, y1, x2, y2)
+        resolution: Pixels between two samples
+        cache_dir: Directory of the cached fields (None to skip the cache)
+    """
+    segments = np.ascontiguousarray(segments, dtype=np.float64).reshape(-1, 4)
+
+    if cache_dir is None:
+        return DistanceField.build(segments, resolution)
+
+    key = hashlib.sha256(segments.tobytes())
+    key.update(
+        repr((DISTANCE_FIELD_VERSION, resolution, TRACK_WIDTH, TRACK_HEIGHT)).encode()
+    )
+    path = os.path.join(cache_dir, f"distance_field_{key.hexdigest()[:16]}.npy")
+
+    if os.path.exists(path):
+        try:
+            return DistanceField.load(path, resolution)
+        except ValueError:
+            pass  # Damaged cache, computed again
+
+    field = DistanceField.build(segments, resolution)
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        field.save(path)
+    except OSError:
+        return field
+
+    return DistanceField.load(path, resolution)
+
+
+def _compute_signed_distances(
+    segments: np.ndarray, resolution: float, cols: int, rows: int
+) -> np.ndarray:
+    """
+    Exact signed distance from the center of every cell to the segments.
+
+    Segments are processed one at a time over the whole raster, so memory
+    stays at a few rasters whatever the amount of segments.
+
+    Returns:
+        Array (rows, cols) of float32 distances
+    """
+    x = (np.arange(cols) + 0.5) * resolution
+    y = (np.arange(rows) + 0.5) * resolution
+
+    squared = np.full((rows, cols), np.inf)
+    inside = np.zeros((rows, cols), dtype=bool)
+
+    for x1, y1, x2, y2 in segments.tolist():
+        dx, dy = x2 - x1, y2 - y1
+        length = dx * dx + dy * dy
+
+        # Closest point of the segment to every sample
+        if length > 0:
+            t = np.clip(
+                ((x[None, :] - x1) * dx + (y[:, None] - y1) * dy) / length, 0, 1
+            )
+        else:
+            t = np.zeros((rows, cols))
+        np.minimum(
+            squared,
+            (x[None, :] - (x1 + t * dx)) ** 2 + (y[:, None] - (y1 + t * dy)) ** 2,
+            out=squared,
+        )
+
+        # Even-odd rule: flip the samples left of where the segment crosses
+        # their row
+        crossing = (y1 > y) != (y2 > y)
+        if crossing.any():
+            crossing_x = x1 + (y[crossing] - y1) * dx / dy
+            inside[crossing] ^= x[None, :] < crossing_x[:, None]
+
+    distances = np.sqrt(squared)
+
+    return np.where(inside, distances, -distances).astype(np.float32)
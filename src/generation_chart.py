@@ -0,0 +1,287 @@
+from typing import List, Optional, Tuple
+
+import pygame
+
+from .render_cache import render_text
+
+# Size of the chart and margin around its plot area, in pixels
+CHART_WIDTH: int = 300
+CHART_HEIGHT: int = 200
+PLOT_MARGIN: int = 40
+
+
+class Bucket:
+    """Consecutive generations of a series, summarized by their extremes."""
+
+    __slots__ = (
+        "first_generation",
+        "last_generation",
+        "count",
+        "low",
+        "high",
+        "low_first",
+    )
+
+    def __init__(self, generation: int, cars_alive: int) -> None:
+        self.first_generation: int = generation
+        self.last_generation: int = generation
+        self.count: int = 1
+        self.low: int = cars_alive
+        self.high: int = cars_alive
+        # Whether the lowest value came before the highest one
+        self.low_first: bool = True
+
+    def add(self, generation: int, cars_alive: int) -> None:
+        """Add the next generation to the bucket."""
+        self.last_generation = generation
+        self.count += 1
+
+        if cars_alive < self.low:
+            self.low = cars_alive
+            self.low_first = False
+        elif cars_alive > self.high:
+            self.high = cars_alive
+            self.low_first = True
+
+    def merge(self, bucket: "Bucket") -> None:
+        """Add the generations of the next bucket to this one."""
+        low_first: bool = self.low_first
+        if bucket.low < self.low:
+            self.low = bucket.low
+            low_first = False
+        if bucket.high > self.high:
+            self.high = bucket.high
+            low_first = bucket.low_first if self.low == bucket.low else True
+
+        self.low_first = low_first
+        self.last_generation = bucket.last_generation
+        self.count += bucket.count
+
+    def get_values(self) -> Tuple[int, ...]:
+        """Returns the extremes of the bucket in the order they happened."""
+        if self.low == self.high:
+            return (self.low,)
+
+        return (self.low, self.high) if self.low_first else (self.high, self.low)
+
+
+class GenerationSeries:
+    """
+    Cars alive at the end of each generation, in at most max_buckets buckets.
+
+    Each bucket covers bucket_size generations. When the buckets run out,
+    neighbours are merged in pairs and bucket_size doubles, so the memory
+    stays bounded however long the run while the lows and highs are kept.
+    """
+
+    def __init__(self, max_buckets: int) -> None:
+        """
+        Args:
+            max_buckets: Maximum amount of buckets to keep, at least 2
+        """
+        self.max_buckets: int = max_buckets
+        self.bucket_size: int = 1
+        self.buckets: List[Bucket] = []
+        self.generations: int = 0
+        self.max_cars_alive: int = 0
+
+    def __len__(self) -> int:
+        """Amount of generations added."""
+        return self.generations
+
+    def get_last_generation(self) -> Optional[int]:
+        """Returns the last generation added, None if there's none."""
+        return self.buckets[-1].last_generation if self.buckets else None
+
+    def add(self, generation: int, cars_alive: int) -> None:
+        """
+        Add the result of a generation.
+
+        Args:
+            generation: Number of the generation, greater than the previous one
+            cars_alive: Cars alive at its end
+        """
+        self.generations += 1
+        self.max_cars_alive = max(self.max_cars_alive, cars_alive)
+
+        if self.buckets and self.buckets[-1].count < self.bucket_size:
+            self.buckets[-1].add(generation, cars_alive)
+            return
+
+        self.buckets.append(Bucket(generation, cars_alive))
+
+        if len(self.buckets) > self.max_buckets:
+            merged: List[Bucket] = self.buckets[::2]
+            for bucket, next_bucket in zip(merged, self.buckets[1::2]):
+                bucket.merge(next_bucket)
+
+            self.buckets = merged
+            self.bucket_size *= 2
+
+
+class GenerationChart:
+    """
+    Line chart of the cars alive by generation.
+
+    The chart is drawn on its own translucent surface, rebuilt only when a
+    generation is added and from at most two points per bucket, so drawing
+    it every frame is a single blit whatever the length of the run.
+    """
+
+    def __init__(self, font: pygame.font.Font, small_font: pygame.font.Font) -> None:
+        """
+        Args:
+            font: Font of the title
+            small_font: Font of the labels
+        """
+        self.font: pygame.font.Font = font
+        self.small_font: pygame.font.Font = small_font
+        # Two points per bucket, at most one per pixel of the plot
+        self.series: GenerationSeries = GenerationSeries(
+            (CHART_WIDTH - 2 * PLOT_MARGIN) // 2
+        )
+        self.surface: Optional[pygame.Surface] = None
+
+    def __len__(self) -> int:
+        """Amount of generations added."""
+        return len(self.series)
+
+    def add(self, generation: int, cars_alive: int) -> None:
+        """
+        Add the result of a new generation, ignoring repeated ones.
+
+        Args:
+            generation: Number of the generation
+            cars_alive: Cars alive at its end
+        """
+        if self.series.get_last_generation() == generation:
+            return
+
+        self.series.add(generation, cars_alive)
+        self.surface = None
+
+    def get_surface(self) -> Optional[pygame.Surface]:
+        """Returns the chart, None until a generation is added."""
+        if self.surface is None and self.series.buckets:
+            self.surface = self.render()
+
+        return self.surface
+
+    def render(self) -> pygame.Surface:
+        """Draw the whole chart on a new surface."""
+        surface = pygame.Surface((CHART_WIDTH, CHART_HEIGHT), pygame.SRCALPHA)
+        surface.fill((30, 30, 40, 180))
+
+        # Draw title
+        title_text: str = "Cars Alive by Generation"
+        surface.blit(render_text(self.font, title_text, (255, 255, 255)), (10, 10))
+
+        # Chart area (leave space for title and labels)
+        plot_x: int = PLOT_MARGIN
+        plot_y: int = PLOT_MARGIN
+        plot_width: int = CHART_WIDTH - 2 * PLOT_MARGIN
+        plot_height: int = CHART_HEIGHT - 2 * PLOT_MARGIN
+
+        # Draw chart border
+        pygame.draw.rect(
+            surface, (100, 100, 150), (plot_x, plot_y, plot_width, plot_height), 2
+        )
+
+        # Get data ranges
+        buckets: List[Bucket] = self.series.buckets
+        min_gen: int = buckets[0].first_generation
+        max_gen: int = buckets[-1].last_generation
+        min_cars: int = 0  # Always start from 0
+        max_cars: int = self.series.max_cars_alive
+
+        # Ensure we have some range to work with
+        if max_gen == min_gen:
+            max_gen = min_gen + 1
+        if max_cars == min_cars:
+            max_cars = min_cars + 1
+
+        # Draw grid lines and labels
+        # Vertical lines (generations)
+        num_gen_lines: int = min(5, max_gen - min_gen + 1)
+        for i in range(num_gen_lines):
+            gen_value: float = min_gen + (max_gen - min_gen) * i / (num_gen_lines - 1)
+            x: int = plot_x + int(plot_width * i / (num_gen_lines - 1))
+
+            # Draw grid line
+            pygame.draw.line(
+                surface, (70, 70, 80), (x, plot_y), (x, plot_y + plot_height), 1
+            )
+
+            # Draw label
+            label: str = f"{int(gen_value)}"
+            surface.blit(
+                render_text(self.small_font, label, (200, 200, 200)),
+                (x - 10, plot_y + plot_height + 5),
+            )
+
+        # Horizontal lines (cars alive)
+        num_car_lines: int = 5
+        for i in range(num_car_lines):
+            cars_value: float = min_cars + (max_cars - min_cars) * i / (
+                num_car_lines - 1
+            )
+            y: int = plot_y + plot_height - int(plot_height * i / (num_car_lines - 1))
+
+            # Draw grid line
+            pygame.draw.line(
+                surface, (70, 70, 80), (plot_x, y), (plot_x + plot_width, y), 1
+            )
+
+            # Draw label
+            label: str = f"{int(cars_value)}"
+            surface.blit(
+                render_text(self.small_font, label, (200, 200, 200)),
+                (plot_x - 35, y - 6),
+            )
+
+        # The extremes of each bucket, at the middle of its generations
+        points: List[Tuple[int, int]] = []
+
+        for bucket in buckets:
+            generation: float = (bucket.first_generation + bucket.last_generation) / 2
+            pixel_x: int = plot_x + int(
+                (generation - min_gen) / (max_gen - min_gen) * plot_width
+            )
+
+            for cars_alive in bucket.get_values():
+                y_ratio: float = (cars_alive - min_cars) / (max_cars - min_cars)
+                pixel_y: int = plot_y + plot_height - int(y_ratio * plot_height)
+
+                points.append((pixel_x, pixel_y))
+
+        # Draw the line connecting all points (if we have more than one point)
+        if len(points) >= 2:
+            pygame.draw.lines(surface, (100, 255, 100), False, points, 3)
+
+        # Draw points as small circles while each one is a single generation
+        if self.series.bucket_size == 1:
+            for point in points:
+                pygame.draw.circle(surface, (255, 255, 100), point, 4)
+
+        # Draw axis labels
+        # X-axis label
+        x_label: str = "Generation"
+        x_label_surface: pygame.Surface = render_text(
+            self.small_font, x_label, (255, 255, 255)
+        )
+        surface.blit(
+            x_label_surface,
+            (
+                plot_x + plot_width // 2 - x_label_surface.get_width() // 2,
+                CHART_HEIGHT - 15,
+            ),
+        )
+
+        # Y-axis label (rotated would be ideal, but we'll use abbreviated text)
+        y_label: str = "Cars"
+        y_label_surface: pygame.Surface = render_text(
+            self.small_font, y_label, (255, 255, 255)
+        )
+        surface.blit(y_label_surface, (5, plot_y + plot_height // 2))
+
+        return surface
@@ -0,0 +1,178 @@
+import math
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pygame
+
+from .config.settings import CAR_TURN_SPEED
+
+# Safety limit for turn speeds that never come back to the start angle
+MAX_HEADINGS: int = 3600
+
+
+class Heading(NamedTuple):
+    """Everything that only depends on the angle of a car."""
+
+    angle: float
+    cos: float
+    sin: float
+    # Sensor offsets rotated with the car, relative to its center
+    sensor_offsets: List[Tuple[float, float]]
+    # Absolute ray angle of each sensor, in radians
+    sensor_angles_rad: List[float]
+    # Car image rotated to this angle (None when the table has no image)
+    image: Optional[pygame.Surface]
+
+
+class HeadingTable:
+    """
+    Precomputed direction vectors, rotated sensor offsets and rotated car
+    images for every heading a car can reach.
+
+    Cars start at the same angle and only turn in steps of the turn speed, so
+    there are few reachable headings (36 with a 10 degree turn speed). They
+    are found by turning left and right from the start angle, with the same
+    expression Car.update uses, and every value is computed with the same
+    math as Car and Sensor, so looking it up gives the same bits.
+    """
+
+    def __init__(
+        self,
+        start_angle: float,
+        sensor_offsets: List[Tuple[int, int]],
+        sensor_angles: List[float],
+        image: Optional[pygame.Surface] = None,
+        turn_speed: float = CAR_TURN_SPEED,
+    ) -> None:
+        """
+        Build the table of reachable headings.
+
+        Args:
+            start_angle: Angle every car starts with, in degrees
+            sensor_offsets: Sensor offsets relative to the car center, without rotation
+            sensor_angles: Angle of each sensor relative to the car direction
+            image: Car image to pre-rotate (None to skip the images)
+            turn_speed: Degrees a car turns per step
+
+        Raises:
+            ValueError: If the turn speed reaches too many headings
+        """
+        self.sensor_offsets: List[Tuple[int, int]] = sensor_offsets
+        self.sensor_angles: List[float] = sensor_angles
+        self.image: Optional[pygame.Surface] = image
+
+        self.headings: List[Heading] = []
+        self.indexes: Dict[float, int] = {}
+
+        # Index of the heading reached turning left / right from each heading
+        left: List[int] = []
+        right: List[int] = []
+
+        self._add(start_angle % 360)
+
+        while len(left) < len(self.headings):
+            angle: float = self.headings[len(left)].angle
+
+            for turned, neighbours in (
+                ((angle + turn_speed) % 360, left),
+                ((angle - turn_speed) % 360, right),
+            ):
+                if turned not in self.indexes:
+                    if len(self.headings) >= MAX_HEADINGS:
+                        raise ValueError(
+                            f"Turn speed {turn_speed} reaches more than {MAX_HEADINGS} headings"
+                        )
+                    self._add(turned)
+
+                neighbours.append(self.indexes[turned])
+
+        # Array versions for the batch simulator
+        self.left: np.ndarray = np.array(left, dtype=np.int64)
+        self.right: np.ndarray = np.array(right, dtype=np.int64)
+        self.angles: np.ndarray = np.array([h.angle for h in self.headings])
+        self.cos: np.ndarray = np.array([h.cos for h in self.headings])
+        self.sin: np.ndarray = np.array([h.sin for h in self.headings])
+        self.sensor_offsets_rotated: np.ndarray = np.array(
+            [h.sensor_offsets for h in self.headings], dtype=np.float64
+        ).reshape(len(self.headings), len(sensor_angles), 2)
+        self.sensor_cos: np.ndarray = np.array(
+            [[math.cos(rad) for rad in h.sensor_angles_rad] for h in self.headings]
+        ).reshape(len(self.headings), len(sensor_angles))
+        self.sensor_sin: np.ndarray = np.array(
+            [[math.sin(rad) for rad in h.sensor_angles_rad] for h in self.headings]
+        ).reshape(len(self.headings), len(sensor_angles))
+
+    def __len__(self) -> int:
+        """Amount of reachable headings."""
+        return len(self.headings)
+
+    def get(self, angle: float) -> Heading:
+        """
+        Get the precomputed values of an angle.
+
+        Angles outside the table (a car placed by hand, for example) are
+        computed and added on first use.
+
+        Args:
+            angle: Car angle in degrees
+        """
+        index: Optional[int] = self.indexes.get(angle)
+        if index is None:
+            index = self._add(angle)
+
+        return self.headings[index]
+
+    def get_index(self, angle: float) -> int:
+        """
+        Get the index of a reachable heading.
+
+        Raises:
+            KeyError: If the angle is not reachable from the start angle
+        """
+        return self.indexes[angle % 360]
+
+    def _add(self, angle: float) -> int:
+        """
+        Compute the values of an angle and store them in the table.
+
+        Returns:
+            Index of the new heading
+        """
+        car_angle_rad: float = math.radians(angle)
+
+        # For POSITIONS, rotate offset with NEGATIVE car angle (as Sensor.update)
+        sensor_offsets: List[Tuple[float, float]] = [
+            (
+                offset_x * math.cos(-car_angle_rad)
+                - offset_y * math.sin(-car_angle_rad),
+                offset_x * math.sin(-car_angle_rad)
+                + offset_y * math.cos(-car_angle_rad),
+            )
+            for offset_x, offset_y in self.sensor_offsets
+        ]
+
+        # For RAY DIRECTIONS, rotate normally (positive)
+        sensor_angles_rad: List[float] = [
+            math.radians(angle + relative_angle)
+            for relative_angle in self.sensor_angles
+        ]
+
+        image: Optional[pygame.Surface] = (
+            pygame.transform.rotate(self.image, angle)
+            if self.image is not None
+            else None
+        )
+
+        self.headings.append(
+            Heading(
+                angle,
+                math.cos(car_angle_rad),
+                math.sin(car_angle_rad),
+                sensor_offsets,
+                sensor_angles_rad,
+                image,
+            )
+        )
+        self.indexes[angle] = len(self.headings) - 1
+
+        return self.indexes[angle]
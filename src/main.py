@@ -1,15 +1,24 @@
+import argparse
+import os
 import random
 import sys
+from collections import defaultdict
+from typing import DefaultDict, List, Optional, Tuple
 
 import pygame
 
-from .ai.car_alg_gen import CarAlgGen
+from .ai.car_alg_gen import GENETIC_BACKENDS, CarAlgGen
+from .checkpoint import Checkpointer, get_run_checkpoint_path, load_checkpoint
 
 # Local imports - using relative imports since config is now inside src
 from .config.settings import (
     BACKGROUND_COLOR,
     CARS_AMOUNT,
+    CHECKPOINT_INTERVAL,
+    COLLISION_BACKEND,
+    ELITE_AMOUNT,
     FPS,
+    GENETIC_BACKEND,
     MAXIMUM_SCORE,
     RANDOM_SEED,
     REAL_DISPLAY_HEIGHT,
@@ -18,7 +27,107 @@ from .config.settings import (
 )
 from .metrics_logger import MetricsLogger
 from .race_info import RaceInfo
-from .track import Track
+from .simulation_clock import SimulationClock
+from .track import COLLISION_BACKENDS, Track
+
+# Key state used when there is no keyboard to read (headless runs)
+NO_KEYS: DefaultDict[int, bool] = defaultdict(bool)
+
+
+def positive_int(value: str) -> int:
+    """Argument type for integers of at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1: {value}")
+
+    return number
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse the command line arguments.
+
+    Args:
+        argv: Arguments to parse (defaults to sys.argv)
+
+    Returns:
+        Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Car racing game with genetic AI")
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="train without a window, frame cap or rendering",
+    )
+    parser.add_argument(
+        "--generations",
+        type=int,
+        default=None,
+        help="stop after this many generations (headless only)",
+    )
+    parser.add_argument(
+        "--cars",
+        type=int,
+        default=CARS_AMOUNT,
+        help="amount of cars per generation",
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="simulate the whole population with NumPy arrays (headless only)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=positive_int,
+        default=1,
+        help="processes simulating the population, implies --batch (headless only)",
+    )
+    parser.add_argument(
+        "--track",
+        default=None,
+        help="track file to race on instead of the default rectangular track",
+    )
+    parser.add_argument(
+        "--collision",
+        choices=COLLISION_BACKENDS,
+        default=COLLISION_BACKEND,
+        help="exact track lines or a precomputed distance field (faster, approximate)",
+    )
+    parser.add_argument(
+        "--genetics",
+        choices=GENETIC_BACKENDS,
+        default=GENETIC_BACKEND,
+        help="genetic operators on Python lists or vectorized on NumPy arrays",
+    )
+    parser.add_argument(
+        "--elite",
+        type=int,
+        default=ELITE_AMOUNT,
+        help="best cars carried over unchanged to the next generation",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        default=None,
+        help="file where the training state is saved (checkpoints/run_<run id>.npz by default)",
+    )
+    parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        default=CHECKPOINT_INTERVAL,
+        help="generations between two checkpoints (0 disables checkpoints)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="continue the training saved in the --checkpoint file",
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.resume and args.checkpoint is None:
+        parser.error("--resume needs the --checkpoint file to continue")
+
+    return args
 
 
 def init_game():
@@ -37,9 +146,78 @@ def init_game():
     return clock, screen
 
 
-def control_events(track: Track) -> bool:
+def init_headless() -> None:
+    """Initialize pygame without opening a window."""
+    # Fonts and surfaces still need pygame, but no real video device
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+
+
+def create_alg_gen(
+    cars_amount: int,
+    genetic_backend: str,
+    elite_amount: int,
+    seed: int,
+    resume_path: Optional[str] = None,
+) -> Tuple[CarAlgGen, int]:
+    """
+    Create the genetic algorithm with its first population, or the one saved
+    in a checkpoint.
+
+    Args:
+        resume_path: Checkpoint to resume (None starts a new training)
+
+    Returns:
+        The genetic algorithm and the random seed of the run
     """
-    Check key events and update game objects.
+    alg_gen = CarAlgGen(
+        cars_amount,
+        genetic_backend=genetic_backend,
+        seed=seed,
+        elite_amount=elite_amount,
+    )
+
+    if resume_path is None:
+        alg_gen.generate_initial_population()
+        return alg_gen, seed
+
+    seed = load_checkpoint(resume_path, alg_gen)
+    print(
+        f"Resumed {resume_path} at generation {alg_gen.get_generation()} - Random seed: {seed}"
+    )
+
+    return alg_gen, seed
+
+
+def create_checkpointer(
+    metrics_logger: MetricsLogger,
+    checkpoint_path: Optional[str],
+    checkpoint_interval: int,
+    seed: int,
+) -> Checkpointer:
+    """
+    Create the checkpointer of the run, recording its file in the run registry.
+
+    Args:
+        metrics_logger: Logger of the run
+        checkpoint_path: File where the training state is saved (None for a
+            file of its own in CHECKPOINTS_DIR)
+        checkpoint_interval: Generations between two checkpoints (0 disables them)
+        seed: Random seed of the run
+    """
+    if checkpoint_path is None:
+        checkpoint_path = get_run_checkpoint_path(metrics_logger.run_id)
+
+    checkpointer = Checkpointer(checkpoint_path, checkpoint_interval, seed)
+    if checkpointer.enabled:
+        metrics_logger.add_artifacts({"checkpoint": checkpoint_path})
+
+    return checkpointer
+
+
+def control_events(simulation_clock: SimulationClock) -> bool:
+    """
+    Check key events, changing the simulation speed on the speed keys.
     Returns True if the game should continue running, False otherwise.
     """
 
@@ -51,15 +229,47 @@ def control_events(track: Track) -> bool:
         if is_close or is_escape:
             return False
 
-    # Get key states
-    keys = pygame.key.get_pressed()
+        if event.type == pygame.KEYDOWN:
+            simulation_clock.handle_key(event.key)
 
-    # Update game objects
-    track.update(keys)
+        # Only the changed areas are sent each frame, resend the whole window
+        if event.type == pygame.WINDOWEXPOSED:
+            pygame.display.update()
 
     return True
 
 
+def run_simulation_steps(
+    track: Track,
+    alg_gen: CarAlgGen,
+    metrics_logger: MetricsLogger,
+    race_info: RaceInfo,
+    simulation_clock: SimulationClock,
+    checkpointer: Checkpointer,
+) -> None:
+    """
+    Run the simulation steps due in this frame, starting new generations as needed.
+
+    The pressed keys only reach the first step, so a key press acts once per
+    displayed frame whatever the speed.
+    """
+    keys = pygame.key.get_pressed()
+
+    for step in simulation_clock.iter_steps():
+        track.update(keys if step == 0 else NO_KEYS)
+
+        if is_generation_over(track):
+            generation, cars_alive_at_end = end_generation(
+                track, alg_gen, metrics_logger, checkpointer
+            )
+
+            # Update race info chart data
+            race_info.update_generation_data(generation, cars_alive_at_end)
+
+            # Reset best car in race_info when a new generation starts
+            race_info.best_car = None
+
+
 def set_random_seed():
     """Set random seeds for reproducibility if enabled in settings."""
     if USE_FIXED_SEED:
@@ -76,73 +286,277 @@ def set_random_seed():
         return seed
 
 
-def main():
+def is_generation_over(track: Track) -> bool:
+    """
+    Returns True when every car is dead or the best car reached the maximum score.
+    """
+    best_car = max(track.cars, key=lambda car: car.get_score())
+
+    return track.are_all_cars_dead() or best_car.get_score() > MAXIMUM_SCORE
+
+
+def end_generation(
+    track: Track,
+    alg_gen: CarAlgGen,
+    metrics_logger: MetricsLogger,
+    checkpointer: Checkpointer,
+) -> Tuple[int, int]:
+    """
+    Log the finished generation, checkpoint it when due, save the hall of
+    fame and restart the track with a new population.
+
+    Returns:
+        The finished generation number and the cars alive at its end
+    """
+    generation = alg_gen.get_generation()
+
+    best_car = max(track.cars, key=lambda car: car.get_score())
+
+    # Log metrics for this generation
+    cars_alive_at_end = track.get_all_cars_alive()
+    metrics_logger.log_generation(
+        generation,
+        best_car.get_score(),
+        cars_alive_at_end,
+        track.rnas,
+    )
+
+    checkpointer.save_if_due(alg_gen)
+
+    new_rnas = alg_gen.get_new_population()
+    alg_gen.hall_of_fame.save_if_changed(metrics_logger.run_paths.hall_of_fame)
+
+    track.restart_cars(new_rnas)
+
+    return generation, cars_alive_at_end
+
+
+def run_batch_generation(
+    track: Track,
+    alg_gen: CarAlgGen,
+    metrics_logger: MetricsLogger,
+    checkpointer: Checkpointer,
+    workers: int = 1,
+) -> None:
+    """
+    Simulate the current population with the PopulationSimulator, log it,
+    checkpoint it when due, create the next population and save the hall of fame.
+    """
+    cars_alive_at_end = alg_gen.evaluate_population(
+        track.get_track_lines(),
+        track.car_image.get_size(),
+        MAXIMUM_SCORE,
+        track.get_start_positions(len(alg_gen.population)),
+        workers,
+        track.spawn_angle,
+        track.distance_field,
+    )
+
+    best_rna = max(alg_gen.population, key=lambda rna: rna.get_score())
+
+    metrics_logger.log_generation(
+        alg_gen.get_generation(),
+        best_rna.get_score(),
+        cars_alive_at_end,
+        alg_gen.population,
+    )
+
+    checkpointer.save_if_due(alg_gen)
+
+    alg_gen.get_new_population()
+    alg_gen.hall_of_fame.save_if_changed(metrics_logger.run_paths.hall_of_fame)
+
+
+def run_headless(
+    max_generations: Optional[int] = None,
+    cars_amount: int = CARS_AMOUNT,
+    batch: bool = False,
+    workers: int = 1,
+    track_file: Optional[str] = None,
+    collision_backend: str = COLLISION_BACKEND,
+    genetic_backend: str = GENETIC_BACKEND,
+    elite_amount: int = ELITE_AMOUNT,
+    checkpoint_path: Optional[str] = None,
+    checkpoint_interval: int = CHECKPOINT_INTERVAL,
+    resume: bool = False,
+) -> None:
+    """
+    Train as fast as possible, without display, frame cap or rendering.
+
+    Args:
+        max_generations: Amount of generations to train (None runs until interrupted)
+        cars_amount: Amount of cars per generation
+        batch: Simulate with the PopulationSimulator instead of Car objects
+        workers: Processes simulating the population (more than 1 implies batch)
+        track_file: Track file to race on (None for the default track)
+        collision_backend: "segments" for the exact lines, "field" for a distance field
+        genetic_backend: "lists" for the Python genetic operators, "numpy" for
+            the vectorized ones
+        elite_amount: Best cars carried over unchanged to the next generation
+        checkpoint_path: File where the training state is saved (None for a
+            file of its own in CHECKPOINTS_DIR)
+        checkpoint_interval: Generations between two checkpoints (0 disables them)
+        resume: Continue the training saved in checkpoint_path
+
+    Raises:
+        ValueError: If resume is set without a checkpoint_path
+    """
+    if resume and checkpoint_path is None:
+        raise ValueError("Resuming needs the checkpoint file to continue")
+
+    batch = batch or workers > 1
+
+    seed = set_random_seed()
+
+    init_headless()
+
+    alg_gen, seed = create_alg_gen(
+        cars_amount,
+        genetic_backend,
+        elite_amount,
+        seed,
+        checkpoint_path if resume else None,
+    )
+    rna_cars = alg_gen.population
+
+    # The batch simulator only needs the track geometry, not the cars
+    track = Track(
+        None,
+        [] if batch else rna_cars,
+        track_file=track_file,
+        collision_backend=collision_backend,
+    )
+
+    metrics_logger = MetricsLogger(
+        seed,
+        {
+            "headless": True,
+            "cars": cars_amount,
+            "batch": batch,
+            "workers": workers,
+            "track": track_file,
+            "collision": collision_backend,
+            "genetics": genetic_backend,
+            "elite": elite_amount,
+            "resume": resume,
+            "max_generations": max_generations,
+        },
+    )
+    checkpointer = create_checkpointer(
+        metrics_logger, checkpoint_path, checkpoint_interval, seed
+    )
+
+    try:
+        while max_generations is None or alg_gen.get_generation() < max_generations:
+            if batch:
+                run_batch_generation(
+                    track, alg_gen, metrics_logger, checkpointer, workers
+                )
+                continue
+
+            track.update(NO_KEYS)
+
+            if is_generation_over(track):
+                end_generation(track, alg_gen, metrics_logger, checkpointer)
+
+        # The next population is bred but not simulated yet
+        checkpointer.save_on_exit(alg_gen)
+    except KeyboardInterrupt:
+        # The interruption may land while breeding, resume from the last
+        # periodic checkpoint instead
+        print(f"Training interrupted at generation {alg_gen.get_generation()}")
+
+    alg_gen.hall_of_fame.save(metrics_logger.run_paths.hall_of_fame)
+    print(f"Best car score: {alg_gen.get_best_rna(alg_gen.population).get_score()}")
+
+    metrics_logger.close()
+    alg_gen.close()
+    pygame.quit()
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+
+    if args.headless:
+        run_headless(
+            args.generations,
+            args.cars,
+            args.batch,
+            args.workers,
+            args.track,
+            args.collision,
+            args.genetics,
+            args.elite,
+            args.checkpoint,
+            args.checkpoint_every,
+            args.resume,
+        )
+        return
+
     # Set random seed before anything else
     seed = set_random_seed()
 
     clock, screen = init_game()
 
-    alg_gen = CarAlgGen(CARS_AMOUNT)
-    rna_cars = alg_gen.generate_initial_population()
+    alg_gen, seed = create_alg_gen(
+        args.cars,
+        args.genetics,
+        args.elite,
+        seed,
+        args.checkpoint if args.resume else None,
+    )
+    rna_cars = alg_gen.population
 
-    track = Track(screen, rna_cars)
+    track = Track(
+        screen, rna_cars, track_file=args.track, collision_backend=args.collision
+    )
 
     race_info = RaceInfo(screen, track)
     race_info.set_alg_gen(alg_gen)  # Pass the genetic algorithm reference
 
     # Create a metrics logger
-    metrics_logger = MetricsLogger(seed)
+    metrics_logger = MetricsLogger(seed, vars(args))
+    checkpointer = create_checkpointer(
+        metrics_logger, args.checkpoint, args.checkpoint_every, seed
+    )
+
+    # Fixed simulation steps, decoupled from the displayed frames
+    simulation_clock = SimulationClock()
 
     # Main game loop
     running = True
 
-    seconds_running = 0
-
     while running:
         # Control frame rate
         clock.tick(FPS)
-        seconds_running += 1 / FPS
 
-        running = control_events(track)
+        running = control_events(simulation_clock)
+
+        run_simulation_steps(
+            track,
+            alg_gen,
+            metrics_logger,
+            race_info,
+            simulation_clock,
+            checkpointer,
+        )
 
         # Draw game objects
-        track.draw(BACKGROUND_COLOR)
+        dirty_rects = track.draw(BACKGROUND_COLOR)
 
         # Metrics for AI
-        race_info.draw()
-
-        # Update display
-        pygame.display.update()
-
-        best_car = max(track.cars, key=lambda car: car.get_score())
+        race_info.set_speed_label(simulation_clock.get_speed_label())
+        dirty_rects += race_info.draw()
 
-        if track.are_all_cars_dead() or best_car.get_score() > MAXIMUM_SCORE:
-            seconds_running = 0
+        # Update only the areas that changed since the previous frame
+        pygame.display.update(dirty_rects)
 
-            best_car = max(track.cars, key=lambda car: car.get_score())
-
-            # Log metrics for this generation
-            cars_alive_at_end = track.get_all_cars_alive()
-            metrics_logger.log_generation(
-                alg_gen.get_generation(),
-                best_car.get_score(),
-                cars_alive_at_end,
-                track.cars,
-            )
-
-            # Update race info chart data
-            race_info.update_generation_data(
-                alg_gen.get_generation(), cars_alive_at_end
-            )
-
-            new_rnas = alg_gen.get_new_population()
-
-            track.restart_cars(new_rnas)
-
-            # Reset best car in race_info when a new generation starts
-            race_info.best_car = None
+    # Keep the current population, its generation is simulated again on resume
+    checkpointer.save_on_exit(alg_gen)
+    alg_gen.hall_of_fame.save(metrics_logger.run_paths.hall_of_fame)
 
     # Clean up
+    metrics_logger.close()
     pygame.quit()
     sys.exit()
 
@@ -1,77 +1,133 @@
 import csv
 import datetime
-import glob
 import os
-from typing import Any, Dict, List, Optional, Tuple, Union
+import queue
+import threading
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
 
-from .car import Car
+import numpy as np
+
+from .ai.car_rna import CarRNA
+from .columnar_log import NpyAppender, RunPaths, get_run_paths, write_run_header
+from .config.settings import (
+    METRICS_FLUSH_INTERVAL,
+    METRICS_FLUSH_RECORDS,
+    METRICS_QUEUE_SIZE,
+)
+from .run_registry import RunRegistry
+
+LOGS_DIR: str = os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs")
+
+# SQLite registry of the runs, inside LOGS_DIR
+RUN_REGISTRY_FILE: str = "runs.sqlite3"
+
+
+class GenerationRecord(NamedTuple):
+    """Snapshot of a generation, waiting to be written by the writer thread."""
+
+    generation: int
+    best_car_score: float
+    cars_alive: int
+    scores: List[int]
+    # Array (cars, chromosomes) with the weights of every car
+    weights: np.ndarray
+    neurons_format: List[int]
 
 
 class MetricsLogger:
-    def __init__(self, seed: int) -> None:
+    """
+    Logs the metrics of every generation.
+
+    The CSV file only holds a summary row per generation. The score and the
+    weights of every car go to a columnar log next to it: append-only .npy
+    arrays (generations, population[, chromosomes]) and a JSON header with
+    the seed and the topology, see columnar_log.read_run.
+
+    Every run is registered in the RunRegistry of the logs directory, which
+    hands out its number and records its settings, result and files.
+
+    log_generation only takes a snapshot of the generation and queues it, a
+    writer thread formats and writes the records in batches, so the training
+    loop doesn't wait for the disk. It only waits if the writer falls
+    queue_size generations behind.
+    """
+
+    def __init__(
+        self,
+        seed: int,
+        settings: Optional[Dict[str, Any]] = None,
+        artifacts: Optional[Dict[str, str]] = None,
+        queue_size: int = METRICS_QUEUE_SIZE,
+        flush_interval: float = METRICS_FLUSH_INTERVAL,
+        flush_records: int = METRICS_FLUSH_RECORDS,
+    ) -> None:
         """
-        Initialize the metrics logger.
+        Initialize the metrics logger and start its writer thread.
 
         Args:
             seed: Random seed value used for this run
+            settings: Settings of the run, recorded in the registry
+            artifacts: Paths of other files of the run (checkpoint...), by name
+            queue_size: Generations waiting to be written before log_generation waits
+            flush_interval: Maximum seconds a written record waits to reach the disk
+            flush_records: Records written before flushing them to the disk
         """
         self.seed: int = seed
-        self.log_file_path: str = self._create_log_file()
-        self._initialize_csv()
+        self.generations: int = 0
+        self.best_score: Optional[float] = None
 
-    def _create_log_file(self) -> str:
-        """
-        Create a new log file with an incrementing numeric prefix and timestamp.
-
-        Returns:
-            Path to the created log file
-        """
         # Create logs directory if it doesn't exist
-        logs_dir: str = os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs")
-        os.makedirs(logs_dir, exist_ok=True)
+        os.makedirs(LOGS_DIR, exist_ok=True)
+        self.registry: RunRegistry = RunRegistry(
+            os.path.join(LOGS_DIR, RUN_REGISTRY_FILE)
+        )
+        self.run_id: int = self.registry.start_run(seed, settings or {})
 
-        # Find the next run number by checking existing files
-        next_run_number: int = self._get_next_run_number(logs_dir)
-
-        # Generate filename with timestamp
-        timestamp: str = datetime.datetime.now().strftime("%Y_%m_%d_%H_%M")
-        filename: str = f"{next_run_number:03d}_{timestamp}.csv"
+        self.log_file_path: str = self._create_log_file()
+        self.run_paths: RunPaths = get_run_paths(self.log_file_path)
+        self.artifacts: Dict[str, str] = {}
+        self.add_artifacts(
+            {
+                "log": self.log_file_path,
+                **self.run_paths._asdict(),
+                **(artifacts or {}),
+            }
+        )
+        self._initialize_csv()
 
-        return os.path.join(logs_dir, filename)
+        self.flush_interval: float = flush_interval
+        self.flush_records: int = flush_records
+        self.queue: "queue.Queue[Optional[GenerationRecord]]" = queue.Queue(
+            maxsize=queue_size
+        )
+        self.writer_error: Optional[BaseException] = None
+        self.closed: bool = False
+        self.writer: threading.Thread = threading.Thread(
+            target=self._write_records, name="MetricsLogger", daemon=True
+        )
+        self.writer.start()
 
-    def _get_next_run_number(self, logs_dir: str) -> int:
+    def add_artifacts(self, artifacts: Dict[str, str]) -> None:
         """
-        Get the next run number by checking existing files.
+        Record the paths of other files of the run in the registry.
 
         Args:
-            logs_dir: Directory containing log files
+            artifacts: Path of each file, by name
+        """
+        self.artifacts.update(artifacts)
+        self.registry.set_artifacts(self.run_id, self.artifacts)
 
-        Returns:
-            Next run number to use
+    def _create_log_file(self) -> str:
+        """
+        Returns the path of the log file, prefixed with the run number and
+        suffixed with a timestamp.
         """
-        # Get all CSV files in the logs directory
-        existing_files: List[str] = glob.glob(os.path.join(logs_dir, "*.csv"))
-
-        if not existing_files:
-            return 1  # Start with 001 if no files exist
-
-        # Extract run numbers from existing files
-        run_numbers: List[int] = []
-        for file_path in existing_files:
-            file_name: str = os.path.basename(file_path)
-            try:
-                # Extract numeric prefix (assume format is NNN_*.csv)
-                run_number: int = int(file_name.split("_")[0])
-                run_numbers.append(run_number)
-            except (ValueError, IndexError):
-                # Skip files that don't match the expected format
-                continue
-
-        if not run_numbers:
-            return 1  # Start with 001 if no valid run numbers found
-
-        # Return the next number after the highest existing one
-        return max(run_numbers) + 1
+        # Generate filename with timestamp
+        timestamp: str = datetime.datetime.now().strftime("%Y_%m_%d_%H_%M")
+        filename: str = f"{self.run_id:03d}_{timestamp}.csv"
+
+        return os.path.join(LOGS_DIR, filename)
 
     def _initialize_csv(self) -> None:
         """Initialize the CSV file with headers and metadata."""
@@ -81,45 +137,163 @@ class MetricsLogger:
             # Write metadata first (commented lines that explain the run configuration)
             writer.writerow(["# Metrics Log File"])
             writer.writerow([f"# Random seed value: {self.seed}"])
+            writer.writerow([f"# Run id: {self.run_id}"])
             writer.writerow(["# ------------------------------"])
 
             # Write actual headers
-            writer.writerow(
-                ["generation", "best_car_score", "cars_alive", "best_weights"]
-            )
+            writer.writerow(["generation", "best_car_score", "cars_alive"])
 
     def log_generation(
         self,
         generation: int,
         best_car_score: float,
         cars_alive: int,
-        all_cars: List[Car],
+        all_rnas: List[CarRNA],
     ) -> None:
         """
-        Log metrics for the current generation.
+        Queue the metrics of the current generation to be written.
 
         Args:
             generation: Current generation number
             best_car_score: Score of the best performing car
             cars_alive: Number of cars still alive
-            all_cars: List of all cars in the current generation
+            all_rnas: Neural networks of all cars in the current generation
+
+        Raises:
+            RuntimeError: If the logger is closed or its writer thread failed
         """
-        with open(self.log_file_path, "a", newline="") as csvfile:
-            writer = csv.writer(csvfile)
+        self._raise_writer_error()
 
-            # List of cars in format [{ score: int, weights: list[float] }]
-            cars_list: List[Dict[str, Any]] = [
-                {"score": car.get_score(), "weights": car.rna.get_chromosomes()}
-                for car in all_cars
-            ]
+        if self.closed:
+            raise RuntimeError("The metrics logger is closed")
 
-            # Convert cars list to string representation
-            cars_list_str: str = ",".join([str(car) for car in cars_list])
+        self.generations += 1
+        if self.best_score is None or best_car_score > self.best_score:
+            self.best_score = best_car_score
 
-            # Write the row with generation, score, and neurons (in quotes)
-            writer.writerow(
-                [generation, best_car_score, cars_alive, f'"{cars_list_str}"']
-            )
+        # Snapshot the population, the writer formats it later
+        record = GenerationRecord(
+            generation,
+            best_car_score,
+            cars_alive,
+            [rna.get_score() for rna in all_rnas],
+            np.array([rna.weights for rna in all_rnas], dtype=np.float32),
+            all_rnas[0].neurons_format if all_rnas else [],
+        )
+        self.queue.put(record)
 
         # Also print to console for immediate feedback
         # print(f"Generation: {generation} - Best car score: {best_car_score}")
+
+    def close(self) -> None:
+        """
+        Write the queued generations, flush the file, stop the writer thread
+        and record the end of the run in the registry.
+
+        Raises:
+            RuntimeError: If the writer thread failed
+        """
+        if not self.closed:
+            self.closed = True
+            self.queue.put(None)
+            self.writer.join()
+
+            self.registry.finish_run(self.run_id, self.generations, self.best_score)
+            self.registry.close()
+
+        self._raise_writer_error()
+
+    def _raise_writer_error(self) -> None:
+        """Raise the error that stopped the writer thread, if any."""
+        if self.writer_error is not None:
+            raise RuntimeError("The metrics writer failed") from self.writer_error
+
+    def _write_records(self) -> None:
+        """
+        Writer thread: write the queued records until close, flushing them
+        every flush_records records or flush_interval seconds.
+        """
+        # Created with the first record, which gives the population shape
+        weights_log: Optional[NpyAppender] = None
+        scores_log: Optional[NpyAppender] = None
+        # Whether close's None was taken, the queue gets nothing after it
+        stopped: bool = False
+
+        try:
+            with open(self.log_file_path, "a", newline="") as csvfile:
+                writer = csv.writer(csvfile)
+                pending: int = 0
+                last_flush: float = time.monotonic()
+
+                while True:
+                    # Only wake up on time when there's something to flush
+                    timeout: Optional[float] = None
+                    if pending:
+                        timeout = max(
+                            0.0, last_flush + self.flush_interval - time.monotonic()
+                        )
+
+                    try:
+                        record: Optional[GenerationRecord] = self.queue.get(
+                            timeout=timeout
+                        )
+                    except queue.Empty:
+                        record = None
+                    else:
+                        if record is None:
+                            stopped = True
+                            break
+
+                        if weights_log is None or scores_log is None:
+                            weights_log, scores_log = self._create_columnar_log(record)
+
+                        writer.writerow(
+                            [
+                                record.generation,
+                                record.best_car_score,
+                                record.cars_alive,
+                            ]
+                        )
+                        weights_log.append(record.weights[None])
+                        scores_log.append(np.array([record.scores]))
+                        pending += 1
+
+                    now: float = time.monotonic()
+                    if pending and (
+                        pending >= self.flush_records
+                        or now - last_flush >= self.flush_interval
+                    ):
+                        csvfile.flush()
+                        weights_log.flush()
+                        scores_log.flush()
+                        pending = 0
+                        last_flush = now
+        except BaseException as error:  # pylint: disable=broad-except
+            self.writer_error = error
+
+            # Keep draining until close so log_generation never waits forever
+            while not stopped:
+                stopped = self.queue.get() is None
+        finally:
+            for columnar_log in (weights_log, scores_log):
+                if columnar_log is not None:
+                    columnar_log.close()
+
+    def _create_columnar_log(
+        self, record: GenerationRecord
+    ) -> Tuple[NpyAppender, NpyAppender]:
+        """
+        Write the header of the columnar log and create its arrays.
+
+        Args:
+            record: First generation to log, which gives the population shape
+
+        Returns:
+            The weights and the scores arrays
+        """
+        write_run_header(self.run_paths.header, self.seed, record.neurons_format)
+
+        return (
+            NpyAppender(self.run_paths.weights, np.float32, record.weights.shape),
+            NpyAppender(self.run_paths.scores, np.int32, (len(record.scores),)),
+        )
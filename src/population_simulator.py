@@ -0,0 +1,235 @@
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .ai.car_rna import CarRNA, CarRNAResult
+from .ai.car_rna_batch import CarRNABatch
+from .car import Line, get_sensor_offsets
+from .config.settings import CAR_SPEED, CAR_TURN_SPEED, INIT_CAR_ANGLE, SENSOR_ANGLES
+from .distance_field import DistanceField
+from .heading_table import HeadingTable
+from .raycast import cast_rays
+from .sensor import MAX_RAY_LENGTH
+from .track import get_start_position
+
+
+class PopulationSimulator:
+    """
+    Simulates a whole population of cars at once, without pygame objects.
+
+    The state of every car lives in NumPy arrays (struct of arrays) and each
+    step advances all the alive cars together, following the same rules as
+    Car.update: decide with the previous sensor readings, turn, move, cast
+    the sensors from their previous pose, then check collisions.
+
+    Angles are kept as indexes into a HeadingTable, so turning, moving and
+    placing the sensors are table lookups instead of trigonometry.
+    """
+
+    def __init__(
+        self,
+        rnas: List[CarRNA],
+        lines: List[Line],
+        car_size: Tuple[int, int],
+        speed: float = CAR_SPEED,
+        turn_speed: float = CAR_TURN_SPEED,
+        max_ray_length: float = MAX_RAY_LENGTH,
+        first_index: int = 0,
+        heading_table: Optional[HeadingTable] = None,
+        spawn_points: Optional[Sequence[Tuple[float, float]]] = None,
+        spawn_angle: float = INIT_CAR_ANGLE,
+        distance_field: Optional[DistanceField] = None,
+    ) -> None:
+        """
+        Initialize the simulator with every car in its starting position.
+
+        Args:
+            rnas: Neural networks that control the cars, one per car
+            lines: Track boundary lines for collision detection
+            car_size: Width and height of the car image
+            speed: Distance every car moves per step
+            turn_speed: Degrees a car turns per step
+            max_ray_length: Maximum distance the sensors can detect
+            first_index: Index in the whole population of the first car, used
+                to place a slice of the population in its starting positions
+            heading_table: Precomputed values per heading (built if None)
+            spawn_points: Starting positions of the track (a grid if None)
+            spawn_angle: Starting angle of every car, in degrees
+            distance_field: Distance field of the track, to check collisions
+                and cast sensors on it instead of the exact lines
+        """
+        cars_amount: int = len(rnas)
+
+        self.rnas: List[CarRNA] = rnas
+        self.speed: float = speed
+        self.turn_speed: float = turn_speed
+        self.max_ray_length: float = max_ray_length
+        self.steps: int = 0
+
+        self.distance_field: Optional[DistanceField] = distance_field
+        self.collision_radius: float = min(car_size) / 2
+
+        # Track segments as rows of (x1, y1, x2, y2)
+        self.segments: np.ndarray = np.asarray(lines, dtype=np.float64).reshape(-1, 4)
+
+        # Car state
+        positions = np.array(
+            [
+                get_start_position(first_index + i, spawn_points)
+                for i in range(cars_amount)
+            ],
+            dtype=np.float64,
+        ).reshape(-1, 2)
+        self.x: np.ndarray = positions[:, 0].copy()
+        self.y: np.ndarray = positions[:, 1].copy()
+        self.alive: np.ndarray = np.ones(cars_amount, dtype=bool)
+        self.score: np.ndarray = np.zeros(cars_amount, dtype=np.int64)
+
+        # Headings reachable from the start angle, shared by every car
+        self.heading_table: HeadingTable = heading_table or HeadingTable(
+            spawn_angle,
+            get_sensor_offsets(*car_size),
+            SENSOR_ANGLES,
+            turn_speed=turn_speed,
+        )
+        self.heading: np.ndarray = np.full(
+            cars_amount, self.heading_table.get_index(spawn_angle), np.int64
+        )
+        self.angle: np.ndarray = self.heading_table.angles[self.heading]
+        sensors_amount: int = len(SENSOR_ANGLES)
+
+        # Sensor state. Like Sensor, the pose starts at the origin looking
+        # along the x axis and the rays are cast from the pose of the
+        # previous step.
+        self.sensor_x: np.ndarray = np.zeros((cars_amount, sensors_amount))
+        self.sensor_y: np.ndarray = np.zeros((cars_amount, sensors_amount))
+        self.sensor_cos: np.ndarray = np.ones((cars_amount, sensors_amount))
+        self.sensor_sin: np.ndarray = np.zeros((cars_amount, sensors_amount))
+        self.sensor_distance: np.ndarray = np.full(
+            (cars_amount, sensors_amount), np.nan
+        )
+
+        # Network weights of every car
+        self.rna_batch: CarRNABatch = CarRNABatch(rnas)
+
+    def step(self) -> None:
+        """Advance every alive car one step."""
+        self.steps += 1
+
+        idx: np.ndarray = np.flatnonzero(self.alive)
+        if idx.size == 0:
+            return
+
+        # Decide with the sensor readings of the previous step
+        actions: np.ndarray = self.rna_batch.get_interpretated_results(
+            self.sensor_distance[idx], idx
+        )
+        heading: np.ndarray = self.heading[idx]
+        heading = np.where(
+            actions == CarRNAResult.LEFT.value,
+            self.heading_table.left[heading],
+            np.where(
+                actions == CarRNAResult.RIGHT.value,
+                self.heading_table.right[heading],
+                heading,
+            ),
+        )
+
+        x: np.ndarray = self.x[idx] + self.speed * self.heading_table.cos[heading]
+        y: np.ndarray = self.y[idx] + -self.speed * self.heading_table.sin[heading]
+
+        self.heading[idx] = heading
+        self.angle[idx] = self.heading_table.angles[heading]
+        self.x[idx] = x
+        self.y[idx] = y
+
+        # Cast the rays from the previous sensor pose, then move the sensors
+        distances: np.ndarray = self._cast_sensors(idx)
+        self._update_sensors(idx, x, y, heading)
+        self.sensor_distance[idx] = distances
+
+        collision: np.ndarray
+        if self.distance_field is not None:
+            collision = self.distance_field.is_colliding(x, y, self.collision_radius)
+        else:
+            collision = np.any(distances <= self.speed, axis=1)
+        self.alive[idx[collision]] = False
+        self.score[idx[~collision]] += 1
+
+    def run(self, max_score: int) -> int:
+        """
+        Step until every car is dead or the best car goes past max_score.
+
+        Args:
+            max_score: Score that ends the simulation once exceeded
+
+        Returns:
+            Amount of steps simulated
+        """
+        while not self.are_all_cars_dead() and self.get_best_score() <= max_score:
+            self.step()
+
+        return self.steps
+
+    def _cast_sensors(self, idx: np.ndarray) -> np.ndarray:
+        """
+        Distance from each sensor of the given cars to the closest track line.
+
+        Args:
+            idx: Indexes of the cars to cast
+
+        Returns:
+            Array (cars, sensors) of distances, NaN where nothing was hit
+        """
+        x: np.ndarray = self.sensor_x[idx]
+        y: np.ndarray = self.sensor_y[idx]
+        rays: np.ndarray = np.stack(
+            [
+                x,
+                y,
+                x + self.max_ray_length * self.sensor_cos[idx],
+                y - self.max_ray_length * self.sensor_sin[idx],
+            ],
+            axis=-1,
+        )
+
+        if self.distance_field is not None:
+            return self.distance_field.cast_rays(rays, self.max_ray_length)
+
+        return cast_rays(rays, self.segments, self.max_ray_length)
+
+    def _update_sensors(
+        self, idx: np.ndarray, x: np.ndarray, y: np.ndarray, heading: np.ndarray
+    ) -> None:
+        """
+        Move the sensors of the given cars to the new car pose.
+
+        Args:
+            idx: Indexes of the cars to update
+            x: New x position of each car
+            y: New y position of each car
+            heading: New heading index of each car
+        """
+        offsets: np.ndarray = self.heading_table.sensor_offsets_rotated[heading]
+
+        self.sensor_x[idx] = x[:, None] + offsets[..., 0]
+        self.sensor_y[idx] = y[:, None] + offsets[..., 1]
+        self.sensor_cos[idx] = self.heading_table.sensor_cos[heading]
+        self.sensor_sin[idx] = self.heading_table.sensor_sin[heading]
+
+    def apply_scores(self) -> None:
+        """Store the simulated scores in the neural networks."""
+        for rna, score in zip(self.rnas, self.score.tolist()):
+            rna.set_score(score)
+
+    def are_all_cars_dead(self) -> bool:
+        """Returns True if no car is alive."""
+        return not self.alive.any()
+
+    def get_all_cars_alive(self) -> int:
+        """Returns the amount of cars alive."""
+        return int(self.alive.sum())
+
+    def get_best_score(self) -> int:
+        """Returns the score of the best car."""
+        return int(self.score.max()) if self.score.size else 0
@@ -1,21 +1,35 @@
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Dict, Hashable, List, Optional, Tuple, Union
 
 import pygame
 
 from .ai.car_alg_gen import CarAlgGen
+from .ai.car_rna import LEFT_THRESHOLD, RIGHT_THRESHOLD
 from .car import Car
+from .config.settings import LOD_CARS_THRESHOLD, STATUS_PANEL_ROWS
+from .generation_chart import GenerationChart
+from .render_cache import get_font, get_panel, render_text
 from .track import Track
 
 
 class RaceInfo:
     def __init__(self, screen: pygame.Surface, track: Track) -> None:
-        self.font: pygame.font.Font = pygame.font.Font("freesansbold.ttf", 16)
-        self.small_font: pygame.font.Font = pygame.font.Font("freesansbold.ttf", 12)
+        self.font: pygame.font.Font = get_font(16)
+        self.small_font: pygame.font.Font = get_font(12)
         self.screen: pygame.Surface = screen
         self.track: Track = track
         self.alg_gen: Optional[CarAlgGen] = None
         self.best_car: Optional[Car] = None
-        self.generation_data: List[Tuple[int, int]] = []  # (generation, cars_alive)
+        self.generation_chart: GenerationChart = GenerationChart(
+            self.font, self.small_font
+        )
+        self.speed_label: Optional[str] = None
+        # What each panel showed last and where, to only update the screen where it changed
+        self.drawn_panels: Dict[str, Tuple[Hashable, Optional[pygame.Rect]]] = {}
+        self.dirty_rects: List[pygame.Rect] = []
+
+    def set_speed_label(self, speed_label: Optional[str]) -> None:
+        """Set the simulation speed shown next to the generation counter."""
+        self.speed_label = speed_label
 
     def set_alg_gen(self, alg_gen: CarAlgGen) -> None:
         """Set the reference to the genetic algorithm."""
@@ -23,16 +37,30 @@ class RaceInfo:
 
     def update_generation_data(self, generation: int, cars_alive: int) -> None:
         """Update the generation data for the line chart."""
-        # Only add new data if it's a new generation
-        if not self.generation_data or self.generation_data[-1][0] != generation:
-            self.generation_data.append((generation, cars_alive))
+        self.generation_chart.add(generation, cars_alive)
+
+    def draw(self) -> List[pygame.Rect]:
+        """
+        Draw all the race information elements to the screen.
+
+        Returns:
+            The areas of the panels whose content changed since the previous draw
+        """
+        self.dirty_rects = []
+
+        # Rows of the status panel: every car, or only the best ones of big populations
+        rows: List[Tuple[int, Car]]
+        cars_alive: Optional[int] = None
+        if len(self.track.cars) <= LOD_CARS_THRESHOLD:
+            rows = list(enumerate(self.track.cars))
+            best_cars: List[Tuple[int, Car]] = self.track.get_best_cars(1)
+        else:
+            rows = best_cars = self.track.get_best_cars(STATUS_PANEL_ROWS)
+            cars_alive = self.track.get_all_cars_alive()
 
-    def draw(self) -> None:
-        """Draw all the race information elements to the screen."""
         # Find best car
-        alive_cars: List[Car] = [car for car in self.track.cars if car.is_alive()]
-        if alive_cars:
-            current_best_car: Car = max(alive_cars, key=lambda car: car.get_score())
+        if best_cars and best_cars[0][1].is_alive():
+            current_best_car: Car = best_cars[0][1]
             if (
                 self.best_car is None
                 or current_best_car.get_score() > self.best_car.get_score()
@@ -40,65 +68,142 @@ class RaceInfo:
                 self.best_car = current_best_car
 
         # Draw cars status panel
-        self.draw_cars_status_panel()
+        self.set_panel_drawn(
+            "cars_status",
+            (
+                tuple((i, car.is_alive(), car.get_score()) for i, car in rows),
+                cars_alive,
+                self.best_car.get_score() if self.best_car is not None else None,
+            ),
+            self.draw_cars_status_panel(rows, cars_alive),
+        )
 
         # Draw generation counter at the bottom left
+        gen_rect: Optional[pygame.Rect] = None
+        gen_text: Optional[str] = None
         if self.alg_gen is not None:
             gen_text: str = f"Gen: {self.alg_gen.get_generation()}"
+            if self.speed_label is not None:
+                gen_text += f"   Speed: {self.speed_label}"
 
             # Create background for generation text
-            gen_overlay: pygame.Surface = pygame.Surface((100, 25))
-            gen_overlay.set_alpha(128)
-            gen_overlay.fill((50, 50, 50))
+            gen_overlay: pygame.Surface = get_panel(
+                (100 if self.speed_label is None else 210, 25), (50, 50, 50), 128
+            )
 
             # Position at bottom left with small margin
             screen_height: int = self.screen.get_height()
-            self.screen.blit(gen_overlay, (10, screen_height - 35))
+            gen_rect = self.screen.blit(gen_overlay, (10, screen_height - 35))
 
             # Render generation text
-            self.screen.blit(
-                self.font.render(gen_text, True, (255, 255, 255)),
-                (15, screen_height - 30),
+            gen_rect.union_ip(
+                self.screen.blit(
+                    render_text(self.font, gen_text, (255, 255, 255)),
+                    (15, screen_height - 30),
+                )
             )
+        self.set_panel_drawn("generation", gen_text, gen_rect)
 
         # Draw neural network weights for the best car
+        nn_rect: Optional[pygame.Rect] = None
+        nn_key: Optional[tuple] = None
         if self.best_car is not None:
-            self.draw_neural_network_weights(self.best_car)
+            nn_rect = self.draw_neural_network_weights(self.best_car)
+            nn_key = (
+                self.best_car.rna.weights.tobytes(),
+                self.best_car.get_score(),
+            )
+        self.set_panel_drawn("neural_network", nn_key, nn_rect)
 
         # Draw generation chart
-        self.draw_generation_chart()
+        self.set_panel_drawn(
+            "generation_chart",
+            len(self.generation_chart),
+            self.draw_generation_chart(),
+        )
+
+        return self.dirty_rects
 
-    def draw_cars_status_panel(self) -> None:
-        """Draw the cars status panel with improved styling."""
+    def set_panel_drawn(
+        self, name: str, key: Hashable, rect: Optional[pygame.Rect]
+    ) -> None:
+        """
+        Record what a panel shows and where, marking its area dirty if either changed.
+
+        Args:
+            name: Name of the panel
+            key: Everything the panel shows, equal keys draw the same panel
+            rect: Area of the screen drawn, None if the panel isn't shown
+        """
+        drawn: Optional[Tuple[Hashable, Optional[pygame.Rect]]] = self.drawn_panels.get(
+            name
+        )
+        if drawn is not None and drawn == (key, rect):
+            return
+
+        if drawn is not None and drawn[1] is not None:
+            self.dirty_rects.append(drawn[1])
+        if rect is not None:
+            self.dirty_rects.append(rect)
+
+        self.drawn_panels[name] = (key, rect)
+
+    def draw_cars_status_panel(
+        self, rows: List[Tuple[int, Car]], cars_alive: Optional[int] = None
+    ) -> pygame.Rect:
+        """
+        Draw the cars status panel with improved styling, returning its area.
+
+        Args:
+            rows: Cars to list, with their index
+            cars_alive: Cars alive in the whole population, shown with the
+                amount of cars when only some of them are listed (None to
+                list every car)
+        """
         # Panel dimensions and positioning
         panel_width: int = 200
         row_height: int = 20
+        summary_height: int = 0 if cars_alive is None else 18
         panel_height: int = (
-            len(self.track.cars) * row_height + 52
+            len(rows) * row_height + 52 + summary_height
         )  # Extra space for title and padding
         panel_x: int = 10
         panel_y: int = 25
 
-        # Create panel background
-        panel: pygame.Surface = pygame.Surface((panel_width, panel_height))
-        panel.set_alpha(180)  # More opaque like neural network panel
-        panel.fill((30, 30, 40))  # Same color as neural network panel
-        self.screen.blit(panel, (panel_x, panel_y))
+        # Panel background, more opaque and same color as neural network panel
+        panel: pygame.Surface = get_panel(
+            (panel_width, panel_height), (30, 30, 40), 180
+        )
+        panel_rect: pygame.Rect = self.screen.blit(panel, (panel_x, panel_y))
 
         # Draw panel title
         title_text: str = "Cars Status"
         self.screen.blit(
-            self.font.render(title_text, True, (255, 255, 255)),
+            render_text(self.font, title_text, (255, 255, 255)),
             (panel_x + 10, panel_y + 10),
         )
 
+        # Draw the counts of the whole population, the rows are only the best cars
+        if cars_alive is not None:
+            cars_amount: int = len(self.track.cars)
+            summary_text: str = (
+                f"Alive: {cars_alive}/{cars_amount}  Dead: {cars_amount - cars_alive}"
+            )
+            panel_rect.union_ip(
+                self.screen.blit(
+                    render_text(self.small_font, summary_text, (255, 255, 255)),
+                    (panel_x + 10, panel_y + 33),
+                )
+            )
+            panel_y += summary_height
+
         # Draw column headers
         headers: List[str] = ["Car", "Status", "Score"]
         header_positions: List[int] = [10, 50, 120]
 
         for header, x_pos in zip(headers, header_positions):
             self.screen.blit(
-                self.small_font.render(header, True, (200, 200, 255)),
+                render_text(self.small_font, header, (200, 200, 255)),
                 (panel_x + x_pos, panel_y + 35),
             )
 
@@ -112,13 +217,13 @@ class RaceInfo:
         )
 
         # Draw car info rows
-        for i, car in enumerate(self.track.cars):
-            row_y: int = panel_y + 55 + i * row_height
+        for row, (i, car) in enumerate(rows):
+            row_y: int = panel_y + 55 + row * row_height
 
             # Car number
             car_num_text: str = f"{i + 1:02d}"
             self.screen.blit(
-                self.small_font.render(car_num_text, True, (255, 255, 255)),
+                render_text(self.small_font, car_num_text, (255, 255, 255)),
                 (panel_x + 15, row_y),
             )
 
@@ -131,7 +236,7 @@ class RaceInfo:
                 status_color: Tuple[int, int, int] = (255, 100, 100)  # Red
 
             self.screen.blit(
-                self.small_font.render(status_text, True, status_color),
+                render_text(self.small_font, status_text, status_color),
                 (panel_x + 50, row_y),
             )
 
@@ -149,10 +254,12 @@ class RaceInfo:
                 score_color: Tuple[int, int, int] = (255, 255, 255)  # White for others
 
             self.screen.blit(
-                self.small_font.render(score_text, True, score_color),
+                render_text(self.small_font, score_text, score_color),
                 (panel_x + 120, row_y),
             )
 
+        return panel_rect
+
     def build_car_info_text(self, car: Car, i: int) -> str:
         """Legacy method kept for compatibility."""
         text = f"{i + 1:02d}: "
@@ -168,119 +275,105 @@ class RaceInfo:
 
         return text
 
-    def draw_neural_network_weights(self, car: Car) -> None:
-        """Draw neural network visualization for the best car with neurons as circles and weights as colored lines."""
+    def draw_neural_network_weights(self, car: Car) -> pygame.Rect:
+        """Draw neural network visualization for the best car with neurons as circles and weights as colored lines, returning its area."""
         screen_width: int = self.screen.get_width()
         screen_height: int = self.screen.get_height()
 
         # Create background for neural network display
         nn_width: int = 320
         nn_height: int = 220
-        nn_overlay: pygame.Surface = pygame.Surface((nn_width, nn_height))
-        nn_overlay.set_alpha(180)  # More opaque to make visualization clearer
-        nn_overlay.fill((30, 30, 40))
+        # More opaque to make visualization clearer
+        nn_overlay: pygame.Surface = get_panel((nn_width, nn_height), (30, 30, 40), 180)
 
         # Position in the right side of the screen
         nn_x: int = screen_width - nn_width - 10
         nn_y: int = screen_height - nn_height - 10
 
-        self.screen.blit(nn_overlay, (nn_x, nn_y))
+        nn_rect: pygame.Rect = self.screen.blit(nn_overlay, (nn_x, nn_y))
 
         # Draw title
         title_text: str = "Best Car Neural Network"
         self.screen.blit(
-            self.font.render(title_text, True, (255, 255, 255)), (nn_x + 10, nn_y + 10)
+            render_text(self.font, title_text, (255, 255, 255)), (nn_x + 10, nn_y + 10)
         )
 
         # Draw score
         score_text: str = f"Score: {car.get_score()}"
         self.screen.blit(
-            self.font.render(score_text, True, (255, 255, 100)), (nn_x + 10, nn_y + 35)
+            render_text(self.font, score_text, (255, 255, 100)), (nn_x + 10, nn_y + 35)
         )
 
-        # Get chromosome weights
-        weights: List[float] = car.rna.get_chromosomes()
-
-        # Define neuron positions
-        neuron_radius: int = 15
-
-        # Layer spacing
-        layer_x_spacing: int = 100
-        layer_y_start: int = nn_y + 100  # Y-position of the first neuron in each layer
-
-        # Define neuron positions for each layer
-        # Layer 0 (input) - 3 neurons
-        l0_x: int = nn_x + 40
-        l0_neurons: List[Tuple[int, int]] = []
-        for i in range(3):
-            l0_neurons.append((l0_x, layer_y_start + i * 50))
-
-        # Layer 1 (hidden) - 3 neurons
-        l1_x: int = l0_x + layer_x_spacing
-        l1_neurons: List[Tuple[int, int]] = []
-        for i in range(3):
-            l1_neurons.append((l1_x, layer_y_start + i * 50))
-
-        # Layer 2 (output) - 1 neuron
-        l2_x: int = l1_x + layer_x_spacing
-        l2_neurons: List[Tuple[int, int]] = [
-            (l2_x, layer_y_start + 50)
-        ]  # Center vertically
+        # Weight matrices of each layer, weights[i][j] goes from input i to output j
+        layers: List[List[List[float]]] = [layer.tolist() for layer in car.rna.layers]
+        neurons_format: List[int] = car.rna.neurons_format
+
+        # Layer spacing (the whole network spans 200 pixels)
+        layer_x_spacing: int = 200 // (len(neurons_format) - 1)
+        layer_y_center: int = nn_y + 150  # Y-position of the middle of each layer
+
+        # Define neuron positions for each layer, centered vertically
+        layer_neurons: List[List[Tuple[int, int]]] = []
+        for layer_idx, neurons_amount in enumerate(neurons_format):
+            x: int = nn_x + 40 + layer_idx * layer_x_spacing
+            y_spacing: int = min(50, 100 // max(1, neurons_amount - 1))
+            first_y: int = layer_y_center - (neurons_amount - 1) * y_spacing // 2
+            layer_neurons.append(
+                [(x, first_y + i * y_spacing) for i in range(neurons_amount)]
+            )
 
         # First, draw the connections (weights) between neurons
-        # Weights 0-8: Layer 0 to Layer 1 (3x3 connections)
-        # Each input neuron connects to all 3 hidden neurons
-        weight_idx: int = 0
-        for i in range(3):  # For each input neuron
-            for j in range(3):  # For each hidden neuron
-                weight: float = weights[weight_idx]
-                self._draw_weight_line(l0_neurons[i], l1_neurons[j], weight)
-                weight_idx += 1
-
-        # Weights 9-11: Layer 1 to Layer 2 (3x1 connections)
-        # Each hidden neuron connects to the single output neuron
-        for i in range(3):  # For each hidden neuron
-            weight: float = weights[weight_idx]
-            self._draw_weight_line(l1_neurons[i], l2_neurons[0], weight)
-            weight_idx += 1
+        # Each neuron connects to every neuron of the next layer
+        for layer_idx, weights in enumerate(layers):
+            for i, start_pos in enumerate(layer_neurons[layer_idx]):
+                for j, end_pos in enumerate(layer_neurons[layer_idx + 1]):
+                    self._draw_weight_line(start_pos, end_pos, weights[i][j])
 
         # Now draw the neurons (circles) over the connections
         # Layer names
-        layer_names: List[str] = ["Inputs", "Hidden", "Output"]
-        layer_positions: List[int] = [l0_x, l1_x, l2_x]
+        layer_names: List[str] = (
+            ["Inputs"] + ["Hidden"] * (len(neurons_format) - 2) + ["Output"]
+        )
 
-        for name, x_pos in zip(layer_names, layer_positions):
+        for name, neurons in zip(layer_names, layer_neurons):
             self.screen.blit(
-                self.small_font.render(name, True, (200, 200, 255)),
-                (x_pos - 20, nn_y + 65),
+                render_text(self.small_font, name, (200, 200, 255)),
+                (neurons[0][0] - 20, nn_y + 65),
             )
 
         # Input neuron labels
-        input_labels: List[str] = ["L", "M", "R"]  # Left, Middle, Right sensors
-        for i, label in enumerate(input_labels):
+        input_labels: List[str] = (
+            ["L", "M", "R"]  # Left, Middle, Right sensors
+            if neurons_format[0] == 3
+            else [str(i + 1) for i in range(neurons_format[0])]
+        )
+        for label, pos in zip(input_labels, layer_neurons[0]):
             self.screen.blit(
-                self.small_font.render(label, True, (255, 255, 255)),
-                (l0_neurons[i][0] - 30, l0_neurons[i][1] - 7),
+                render_text(self.small_font, label, (255, 255, 255)),
+                (pos[0] - 30, pos[1] - 7),
             )
 
         # Draw all neurons
-        for pos in l0_neurons:
+        for pos in layer_neurons[0]:
             self._draw_neuron(pos, (100, 200, 255))  # Input neurons in blue
 
-        for pos in l1_neurons:
-            self._draw_neuron(pos, (255, 200, 100))  # Hidden neurons in orange
+        for neurons in layer_neurons[1:-1]:
+            for pos in neurons:
+                self._draw_neuron(pos, (255, 200, 100))  # Hidden neurons in orange
 
-        for pos in l2_neurons:
-            self._draw_neuron(pos, (100, 255, 150))  # Output neuron in green
+        output_neuron: Tuple[int, int] = layer_neurons[-1][0]
+        self._draw_neuron(output_neuron, (100, 255, 150))  # Output neuron in green
 
         # Add behavior label for output neuron
         behavior_labels: List[str] = ["<", "^", ">"]  # Left, Straight, Right
-        result_value: float = car.rna.get_result([0.5, 0.5, 0.5])  # Sample input
+        result_value: float = car.rna.get_result(
+            [0.5] * neurons_format[0]
+        )  # Sample input
 
         # Determine which behavior is active based on output value
-        if result_value < -0.33:
+        if result_value < LEFT_THRESHOLD:
             behavior_idx: int = 0  # Left
-        elif result_value < 0.3:
+        elif result_value < RIGHT_THRESHOLD:
             behavior_idx: int = 1  # Straight
         else:
             behavior_idx: int = 2  # Right
@@ -294,10 +387,12 @@ class RaceInfo:
                 behavior_text += f" {label} "
 
         self.screen.blit(
-            self.small_font.render(behavior_text, True, (255, 255, 255)),
-            (l2_neurons[0][0] + 30, l2_neurons[0][1] - 7),
+            render_text(self.small_font, behavior_text, (255, 255, 255)),
+            (output_neuron[0] + 30, output_neuron[1] - 7),
         )
 
+        return nn_rect
+
     def _draw_neuron(
         self, position: Tuple[int, int], color: Tuple[int, int, int]
     ) -> None:
@@ -339,15 +434,15 @@ class RaceInfo:
             mid_y: float = (start_pos[1] + end_pos[1]) / 2
 
             weight_text: str = f"{weight:.1f}"
-            text_surface: pygame.Surface = self.small_font.render(
-                weight_text, True, (255, 255, 255)
+            text_surface: pygame.Surface = render_text(
+                self.small_font, weight_text, (255, 255, 255)
             )
             # Add small black background for better readability
-            text_bg: pygame.Surface = pygame.Surface(
-                (text_surface.get_width() + 4, text_surface.get_height() + 2)
+            text_bg: pygame.Surface = get_panel(
+                (text_surface.get_width() + 4, text_surface.get_height() + 2),
+                (0, 0, 0),
+                150,
             )
-            text_bg.fill((0, 0, 0))
-            text_bg.set_alpha(150)
 
             self.screen.blit(
                 text_bg,
@@ -364,155 +459,14 @@ class RaceInfo:
                 ),
             )
 
-    def draw_generation_chart(self) -> None:
-        """Draw a line chart showing generation vs cars alive in the top-right corner."""
-        if len(self.generation_data) < 1:
-            return  # Need at least 1 point to draw the chart
-
-        # Chart dimensions and positioning
-        chart_width: int = 300
-        chart_height: int = 200
-        margin: int = 10
+    def draw_generation_chart(self) -> Optional[pygame.Rect]:
+        """Draw a line chart showing generation vs cars alive in the top-right corner, returning its area."""
+        chart: Optional[pygame.Surface] = self.generation_chart.get_surface()
+        if chart is None:
+            return None  # Need at least 1 point to draw the chart
 
         # Position in top-right corner
-        screen_width: int = self.screen.get_width()
-        chart_x: int = screen_width - chart_width - margin
-        chart_y: int = margin
-
-        # Create background for chart
-        chart_overlay: pygame.Surface = pygame.Surface((chart_width, chart_height))
-        chart_overlay.set_alpha(180)
-        chart_overlay.fill((30, 30, 40))
-        self.screen.blit(chart_overlay, (chart_x, chart_y))
-
-        # Draw title
-        title_text: str = "Cars Alive by Generation"
-        self.screen.blit(
-            self.font.render(title_text, True, (255, 255, 255)),
-            (chart_x + 10, chart_y + 10),
-        )
-
-        # Chart area (leave space for title and labels)
-        plot_margin: int = 40
-        plot_x: int = chart_x + plot_margin
-        plot_y: int = chart_y + plot_margin
-        plot_width: int = chart_width - 2 * plot_margin
-        plot_height: int = chart_height - 2 * plot_margin
-
-        # Draw chart border
-        pygame.draw.rect(
-            self.screen, (100, 100, 150), (plot_x, plot_y, plot_width, plot_height), 2
-        )
-
-        # Get data ranges
-        generations: List[int] = [data[0] for data in self.generation_data]
-        cars_alive_values: List[int] = [data[1] for data in self.generation_data]
-
-        min_gen: int = min(generations)
-        max_gen: int = max(generations)
-        min_cars: int = 0  # Always start from 0
-        max_cars: int = max(cars_alive_values) if cars_alive_values else 1
-
-        # Ensure we have some range to work with
-        if max_gen == min_gen:
-            max_gen = min_gen + 1
-        if max_cars == min_cars:
-            max_cars = min_cars + 1
-
-        # Draw grid lines and labels
-        # Vertical lines (generations)
-        num_gen_lines: int = min(5, max_gen - min_gen + 1)
-        for i in range(num_gen_lines):
-            if num_gen_lines > 1:
-                gen_value: float = min_gen + (max_gen - min_gen) * i / (
-                    num_gen_lines - 1
-                )
-            else:
-                gen_value: float = min_gen
-            x: int = (
-                plot_x + int(plot_width * i / max(1, num_gen_lines - 1))
-                if num_gen_lines > 1
-                else plot_x
-            )
-
-            # Draw grid line
-            pygame.draw.line(
-                self.screen, (70, 70, 80), (x, plot_y), (x, plot_y + plot_height), 1
-            )
-
-            # Draw label
-            label: str = f"{int(gen_value)}"
-            self.screen.blit(
-                self.small_font.render(label, True, (200, 200, 200)),
-                (x - 10, plot_y + plot_height + 5),
-            )
-
-        # Horizontal lines (cars alive)
-        num_car_lines: int = 5
-        for i in range(num_car_lines):
-            cars_value: float = min_cars + (max_cars - min_cars) * i / (
-                num_car_lines - 1
-            )
-            y: int = plot_y + plot_height - int(plot_height * i / (num_car_lines - 1))
-
-            # Draw grid line
-            pygame.draw.line(
-                self.screen, (70, 70, 80), (plot_x, y), (plot_x + plot_width, y), 1
-            )
-
-            # Draw label
-            label: str = f"{int(cars_value)}"
-            self.screen.blit(
-                self.small_font.render(label, True, (200, 200, 200)),
-                (plot_x - 35, y - 6),
-            )
-
-        # Draw the data points and line chart
-        points: List[Tuple[int, int]] = []
-
-        for generation, cars_alive in self.generation_data:
-            # Convert data to pixel coordinates
-            x_ratio: float = (
-                (generation - min_gen) / (max_gen - min_gen)
-                if max_gen != min_gen
-                else 0
-            )
-            y_ratio: float = (
-                (cars_alive - min_cars) / (max_cars - min_cars)
-                if max_cars != min_cars
-                else 0
-            )
-
-            pixel_x: int = plot_x + int(x_ratio * plot_width)
-            pixel_y: int = plot_y + plot_height - int(y_ratio * plot_height)
-
-            points.append((pixel_x, pixel_y))
-
-        # Draw the line connecting all points (if we have more than one point)
-        if len(points) >= 2:
-            pygame.draw.lines(self.screen, (100, 255, 100), False, points, 3)
-
-        # Draw points as small circles (even for single points)
-        for point in points:
-            pygame.draw.circle(self.screen, (255, 255, 100), point, 4)
-
-        # Draw axis labels
-        # X-axis label
-        x_label: str = "Generation"
-        x_label_surface: pygame.Surface = self.small_font.render(
-            x_label, True, (255, 255, 255)
-        )
-        self.screen.blit(
-            x_label_surface,
-            (
-                plot_x + plot_width // 2 - x_label_surface.get_width() // 2,
-                chart_y + chart_height - 15,
-            ),
-        )
+        margin: int = 10
+        chart_x: int = self.screen.get_width() - chart.get_width() - margin
 
-        # Y-axis label (rotated would be ideal, but we'll use abbreviated text)
-        y_label: str = "Cars"
-        y_label_surface: pygame.Surface = self.small_font.render(
-            y_label, True, (255, 255, 255)
-        )
-        self.screen.blit(y_label_surface, (chart_x + 5, plot_y + plot_height // 2))
+        return self.screen.blit(chart, (chart_x, margin))
@@ -0,0 +1,160 @@
+from typing import Optional, Protocol, Sequence, Tuple, Union, runtime_checkable
+
+import numpy as np
+
+# Upper bound of (ray, segment) pairs evaluated at once, to bound memory use
+MAX_PAIRS_PER_CHUNK: int = 1 << 22
+
+Line = Tuple[Tuple[float, float], Tuple[float, float]]
+
+
+@runtime_checkable
+class RayCaster(Protocol):
+    """Finds the closest track hit of a batch of rays, like a SegmentGrid."""
+
+    def cast_rays(
+        self,
+        rays: np.ndarray,
+        ray_lengths: Union[float, Sequence[float], np.ndarray],
+    ) -> np.ndarray: ...
+
+
+# Track boundaries as plain lines, an (M, 4) segments array or a spatial index
+TrackLines = Union[Sequence[Line], np.ndarray, RayCaster]
+
+
+def cast_rays_on(
+    lines: TrackLines,
+    rays: np.ndarray,
+    ray_lengths: Union[float, Sequence[float], np.ndarray],
+) -> np.ndarray:
+    """
+    Cast the rays against the track boundaries, whatever their representation.
+
+    Args:
+        lines: Track lines, segments array or RayCaster
+        rays: Array (..., 4) of rays as (start_x, start_y, end_x, end_y)
+        ray_lengths: Length of the rays, a scalar or one value per ray
+
+    Returns:
+        Closest hit distance of each ray, NaN where nothing was hit
+    """
+    if isinstance(lines, RayCaster):
+        return lines.cast_rays(rays, ray_lengths)
+
+    return cast_rays(rays, lines, ray_lengths)
+
+
+def get_ray_segment_intersection(
+    x3: float,
+    y3: float,
+    x4: float,
+    y4: float,
+    x1: float,
+    y1: float,
+    x2: float,
+    y2: float,
+) -> Optional[float]:
+    """
+    Intersection of the ray (x3, y3) -> (x4, y4) with the segment (x1, y1) -> (x2, y2).
+
+    Returns:
+        Position u in [0, 1] of the intersection along the ray, None if they
+        don't intersect
+    """
+    # Solve intersection via determinant
+    denom: float = (x1 - x2) * (y3 - y4) - (y1 - y2) * (x3 - x4)
+    if denom == 0:
+        return None  # parallel or collinear
+
+    t: float = ((x1 - x3) * (y3 - y4) - (y1 - y3) * (x3 - x4)) / denom
+    u: float = -((x1 - x2) * (y1 - y3) - (y1 - y2) * (x1 - x3)) / denom
+
+    # Intersection only if both parameters in [0,1]
+    if 0 <= t <= 1 and 0 <= u <= 1:
+        return u
+
+    return None
+
+
+def cast_rays(
+    rays: np.ndarray,
+    segments: np.ndarray,
+    ray_lengths: Union[float, Sequence[float], np.ndarray],
+) -> np.ndarray:
+    """
+    Distance from the start of each ray to its closest intersection with any segment.
+
+    Every (ray, segment) pair is solved at once with the same determinant and
+    t/u test used by Sensor.get_distance_to_collision, so the results match it.
+
+    Args:
+        rays: Array (..., 4) of rays as (start_x, start_y, end_x, end_y)
+        segments: Array (M, 4) of segments as (x1, y1, x2, y2)
+        ray_lengths: Length of the rays, a scalar or one value per ray
+
+    Returns:
+        Array with the leading shape of rays holding the closest distance,
+        NaN where a ray does not hit any segment
+    """
+    rays = np.asarray(rays, dtype=np.float64)
+    segments = np.asarray(segments, dtype=np.float64).reshape(-1, 4)
+    shape = rays.shape[:-1]
+
+    flat_rays = rays.reshape(-1, 4)
+    flat_lengths = np.asarray(ray_lengths, dtype=np.float64)
+    if flat_lengths.ndim:
+        flat_lengths = np.broadcast_to(flat_lengths, shape).reshape(-1)
+
+    if segments.shape[0] == 0:
+        return np.full(shape, np.nan)
+
+    # Small batches (a single car) skip the chunking entirely
+    chunk = max(1, MAX_PAIRS_PER_CHUNK // segments.shape[0])
+    if flat_rays.shape[0] <= chunk:
+        return _cast_chunk(flat_rays, segments, flat_lengths).reshape(shape)
+
+    distances = np.empty(flat_rays.shape[0])
+    for start in range(0, flat_rays.shape[0], chunk):
+        stop = start + chunk
+        distances[start:stop] = _cast_chunk(
+            flat_rays[start:stop],
+            segments,
+            flat_lengths[start:stop] if flat_lengths.ndim else flat_lengths,
+        )
+
+    return distances.reshape(shape)
+
+
+def _cast_chunk(
+    rays: np.ndarray, segments: np.ndarray, ray_lengths: np.ndarray
+) -> np.ndarray:
+    """
+    Closest hit distance of each ray, broadcasting rays against segments.
+
+    Args:
+        rays: Array (N, 4) of rays
+        segments: Array (M, 4) of segments
+        ray_lengths: Array (N,) of ray lengths, or a scalar array
+
+    Returns:
+        Array (N,) of distances, NaN where nothing was hit
+    """
+    # Rays as columns, segments as rows
+    x3, y3, x4, y4 = (column[:, None] for column in rays.T)
+    x1, y1, x2, y2 = segments.T
+
+    denom = (x1 - x2) * (y3 - y4) - (y1 - y2) * (x3 - x4)
+
+    # Parallel or collinear pairs divide by NaN, which fails every test below
+    denom[denom == 0] = np.nan
+
+    t = ((x1 - x3) * (y3 - y4) - (y1 - y3) * (x3 - x4)) / denom
+    u = -((x1 - x2) * (y1 - y3) - (y1 - y2) * (x1 - x3)) / denom
+
+    # Intersection only if both parameters in [0,1]
+    hit = (t >= 0) & (t <= 1) & (u >= 0) & (u <= 1)
+
+    closest = np.where(hit, u, np.inf).min(axis=1)
+
+    return np.where(np.isinf(closest), np.nan, closest * ray_lengths)
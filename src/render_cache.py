@@ -0,0 +1,121 @@
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+import pygame
+
+from .config.settings import TEXT_CACHE_SIZE
+
+Color = Tuple[int, int, int]
+
+# Font of every HUD text
+DEFAULT_FONT: str = "freesansbold.ttf"
+
+# Fonts loaded by get_font, by (name, size)
+fonts: Dict[Tuple[str, int], pygame.font.Font] = {}
+
+
+def get_font(size: int, name: str = DEFAULT_FONT) -> pygame.font.Font:
+    """
+    Returns the font of the given size, loading it only once per process.
+
+    Args:
+        size: Font size in points
+        name: Font file
+    """
+    font: Optional[pygame.font.Font] = fonts.get((name, size))
+
+    if font is None:
+        font = fonts[(name, size)] = pygame.font.Font(name, size)
+
+    return font
+
+
+class SurfaceCache:
+    """
+    Least recently used cache of rendered surfaces.
+
+    The surfaces are shared, so they must be blitted but never drawn on.
+    """
+
+    def __init__(self, size: int) -> None:
+        """
+        Args:
+            size: Maximum amount of surfaces to keep
+        """
+        self.size: int = size
+        self.surfaces: "OrderedDict[Hashable, pygame.Surface]" = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __len__(self) -> int:
+        """Amount of cached surfaces."""
+        return len(self.surfaces)
+
+    def get(self, key: Hashable) -> Optional[pygame.Surface]:
+        """Returns the surface cached for key, None if there's none."""
+        surface: Optional[pygame.Surface] = self.surfaces.get(key)
+
+        if surface is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+
+        return surface
+
+    def put(self, key: Hashable, surface: pygame.Surface) -> pygame.Surface:
+        """Cache a surface, evicting the least recently used ones, and return it."""
+        self.surfaces[key] = surface
+
+        while len(self.surfaces) > self.size:
+            self.surfaces.popitem(last=False)
+
+        return surface
+
+    def clear(self) -> None:
+        """Forget every surface."""
+        self.surfaces.clear()
+
+
+# Shared by every HUD element of the process
+text_cache: SurfaceCache = SurfaceCache(TEXT_CACHE_SIZE)
+panel_cache: SurfaceCache = SurfaceCache(TEXT_CACHE_SIZE)
+
+
+def render_text(font: pygame.font.Font, text: str, color: Color) -> pygame.Surface:
+    """
+    Returns the antialiased text rendered with font, rendering it only once.
+
+    Args:
+        font: Font to render with
+        text: Text to render
+        color: Color of the text
+    """
+    key: Hashable = (font, text, color)
+    surface: Optional[pygame.Surface] = text_cache.get(key)
+
+    if surface is None:
+        surface = text_cache.put(key, font.render(text, True, color))
+
+    return surface
+
+
+def get_panel(size: Tuple[int, int], color: Color, alpha: int) -> pygame.Surface:
+    """
+    Returns a semi-transparent background of the given size, built only once.
+
+    Args:
+        size: Width and height of the panel
+        color: Fill color
+        alpha: Opacity, from 0 to 255
+    """
+    key: Hashable = (size, color, alpha)
+    panel: Optional[pygame.Surface] = panel_cache.get(key)
+
+    if panel is None:
+        panel = pygame.Surface(size)
+        panel.set_alpha(alpha)
+        panel.fill(color)
+        panel_cache.put(key, panel)
+
+    return panel
@@ -0,0 +1,177 @@
+import contextlib
+import datetime
+import glob
+import json
+import os
+import sqlite3
+from typing import Any, Dict, Iterator, List, Optional
+
+# Seconds a process waits for another one holding the registry lock
+REGISTRY_TIMEOUT: float = 30.0
+
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    seed TEXT NOT NULL,
+    settings TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    ended_at TEXT,
+    generations INTEGER NOT NULL DEFAULT 0,
+    best_score REAL,
+    artifacts TEXT NOT NULL DEFAULT '{}'
+)
+"""
+
+
+def now() -> str:
+    """Returns the current local time in ISO format."""
+    return datetime.datetime.now().isoformat(timespec="seconds")
+
+
+def get_last_logged_run_number(logs_dir: str) -> int:
+    """
+    Returns the highest run number of the CSV files in logs_dir, 0 if none.
+
+    Only used once, when the registry is created next to logs written before it.
+
+    Args:
+        logs_dir: Directory containing log files
+    """
+    run_numbers: List[int] = []
+    for file_path in glob.glob(os.path.join(logs_dir, "*.csv")):
+        try:
+            # Extract numeric prefix (assume format is NNN_*.csv)
+            run_numbers.append(int(os.path.basename(file_path).split("_")[0]))
+        except (ValueError, IndexError):
+            # Skip files that don't match the expected format
+            continue
+
+    return max(run_numbers, default=0)
+
+
+class RunRegistry:
+    """
+    SQLite index of the training runs in the logs directory.
+
+    Run ids are handed out by an AUTOINCREMENT column inside a write
+    transaction, so concurrent processes never get the same id and no
+    directory scan is needed. Each run records its seed, settings, start and
+    end time, generations, best score and the paths of its files.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Open the registry, creating it if needed.
+
+        Args:
+            path: Path of the SQLite database
+        """
+        self.path: str = path
+        self.connection: sqlite3.Connection = sqlite3.connect(
+            path, timeout=REGISTRY_TIMEOUT, isolation_level=None
+        )
+
+        with self._transaction():
+            is_new: bool = (
+                self.connection.execute(
+                    "SELECT name FROM sqlite_master WHERE name = 'runs'"
+                ).fetchone()
+                is None
+            )
+            self.connection.execute(SCHEMA)
+
+            # Number the runs after the logs written before the registry existed
+            if is_new:
+                last_run: int = get_last_logged_run_number(os.path.dirname(path))
+                if last_run:
+                    self.connection.execute(
+                        "INSERT INTO sqlite_sequence (name, seq) VALUES ('runs', ?)",
+                        (last_run,),
+                    )
+
+    @contextlib.contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Hold the write lock of the database, committing at the end."""
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.connection
+        except BaseException:
+            self.connection.execute("ROLLBACK")
+            raise
+
+        self.connection.execute("COMMIT")
+
+    def start_run(self, seed: int, settings: Dict[str, Any]) -> int:
+        """
+        Register a new run.
+
+        Args:
+            seed: Random seed of the run
+            settings: Settings of the run, stored as JSON
+
+        Returns:
+            The id of the run
+        """
+        with self._transaction():
+            cursor = self.connection.execute(
+                "INSERT INTO runs (seed, settings, started_at) VALUES (?, ?, ?)",
+                (str(seed), json.dumps(settings, default=str), now()),
+            )
+
+        return int(cursor.lastrowid)
+
+    def set_artifacts(self, run_id: int, artifacts: Dict[str, str]) -> None:
+        """
+        Record the paths of the files of a run.
+
+        Args:
+            run_id: Id of the run
+            artifacts: Path of each file, by name
+        """
+        with self._transaction():
+            self.connection.execute(
+                "UPDATE runs SET artifacts = ? WHERE id = ?",
+                (json.dumps(artifacts), run_id),
+            )
+
+    def finish_run(
+        self, run_id: int, generations: int, best_score: Optional[float]
+    ) -> None:
+        """
+        Record the end of a run.
+
+        Args:
+            run_id: Id of the run
+            generations: Amount of generations logged
+            best_score: Best score of the run (None if nothing was logged)
+        """
+        with self._transaction():
+            self.connection.execute(
+                "UPDATE runs SET ended_at = ?, generations = ?, best_score = ? "
+                "WHERE id = ?",
+                (now(), generations, best_score, run_id),
+            )
+
+    def get_run(self, run_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Returns a run as a dict, None if there's no such run.
+
+        Args:
+            run_id: Id of the run
+        """
+        cursor = self.connection.execute("SELECT * FROM runs WHERE id = ?", (run_id,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+
+        run: Dict[str, Any] = {
+            column[0]: value for column, value in zip(cursor.description, row)
+        }
+        run["settings"] = json.loads(run["settings"])
+        run["artifacts"] = json.loads(run["artifacts"])
+
+        return run
+
+    def close(self) -> None:
+        """Close the database."""
+        self.connection.close()
@@ -1,21 +1,43 @@
 import math
 from typing import List, Optional, Tuple, Union
 
+import numpy as np
 import pygame
 
+from .raycast import TrackLines, cast_rays_on, get_ray_segment_intersection
+
 # Type aliases for clarity
 Point = Tuple[int, int]
 Line = Tuple[Point, Point]
 Color = Tuple[int, int, int]
 
+# Maximum distance a sensor can detect
+MAX_RAY_LENGTH: int = 1000
+
 
 class Sensor:
+    # No per-instance __dict__, every car has a few sensors
+    __slots__ = (
+        "offset_x",
+        "offset_y",
+        "relative_angle_deg",
+        "max_ray_length",
+        "sensor_size",
+        "ray_color",
+        "sensor_color",
+        "x",
+        "y",
+        "absolute_angle_rad",
+        "current_length",
+        "colission_distance",
+    )
+
     def __init__(
         self,
         offset: Tuple[int, int],
         relative_angle_degree: float,
         sensor_size: int = 5,
-        max_ray_length: int = 1000,
+        max_ray_length: int = MAX_RAY_LENGTH,
     ) -> None:
         """
         Initialize a distance sensor for collision detection.
@@ -34,6 +56,10 @@ class Sensor:
         self.ray_color: Color = (255, 0, 255)
         self.sensor_color: Color = (255, 0, 0)
 
+        self.reset()
+
+    def reset(self) -> None:
+        """Put the sensor back in its initial pose, without readings."""
         self.x: float = 0.0
         self.y: float = 0.0
         self.absolute_angle_rad: float = 0.0  # to be updated later
@@ -67,12 +93,35 @@ class Sensor:
             -car_angle_rad
         ) + self.offset_y * math.cos(-car_angle_rad)
 
-        self.x = car_x + rotated_x
-        self.y = car_y + rotated_y
-
         # For RAY DIRECTIONS, rotate normally (positive)
         total_angle_deg: float = car_angle_deg + self.relative_angle_deg
-        self.absolute_angle_rad = math.radians(total_angle_deg)
+
+        self.place(
+            car_x + rotated_x,
+            car_y + rotated_y,
+            math.radians(total_angle_deg),
+            sensor_size,
+        )
+
+    def place(
+        self,
+        x: float,
+        y: float,
+        absolute_angle_rad: float,
+        sensor_size: Optional[float] = None,
+    ) -> None:
+        """
+        Set the sensor pose directly, when it was already computed (e.g. by a HeadingTable).
+
+        Args:
+            x: Sensor x position
+            y: Sensor y position
+            absolute_angle_rad: Absolute ray angle in radians
+            sensor_size: New sensor ray length if collision detected
+        """
+        self.x = x
+        self.y = y
+        self.absolute_angle_rad = absolute_angle_rad
 
         if sensor_size is not None:
             self.current_length = sensor_size
@@ -81,15 +130,18 @@ class Sensor:
             self.current_length = self.max_ray_length
             self.colission_distance = None
 
-    def draw(self, screen: pygame.Surface) -> None:
+    def draw(self, screen: pygame.Surface) -> pygame.Rect:
         """
         Draw the sensor and its ray on the screen.
 
         Args:
             screen: Pygame surface to draw on
+
+        Returns:
+            The area drawn
         """
         # Draw sensor center
-        pygame.draw.circle(
+        center_rect: pygame.Rect = pygame.draw.circle(
             screen, self.sensor_color, (int(self.x), int(self.y)), self.sensor_size // 2
         )
 
@@ -97,7 +149,23 @@ class Sensor:
         end_x: float = self.x + self.current_length * math.cos(self.absolute_angle_rad)
         end_y: float = self.y - self.current_length * math.sin(self.absolute_angle_rad)
 
-        pygame.draw.line(screen, self.ray_color, (self.x, self.y), (end_x, end_y), 1)
+        return center_rect.union(
+            pygame.draw.line(
+                screen, self.ray_color, (self.x, self.y), (end_x, end_y), 1
+            )
+        )
+
+    def get_ray(self) -> Tuple[float, float, float, float]:
+        """
+        Get the full-length ray of the sensor.
+
+        Returns:
+            The ray as (start_x, start_y, end_x, end_y)
+        """
+        end_x: float = self.x + self.max_ray_length * math.cos(self.absolute_angle_rad)
+        end_y: float = self.y - self.max_ray_length * math.sin(self.absolute_angle_rad)
+
+        return self.x, self.y, end_x, end_y
 
     def get_distance_to_collision(self, line: Line) -> Optional[float]:
         """
@@ -109,29 +177,31 @@ class Sensor:
         Returns:
             Distance to the intersection or None if no intersection
         """
-        # 1) compute ray end‐point
-        end_x: float = self.x + self.max_ray_length * math.cos(self.absolute_angle_rad)
-        end_y: float = self.y - self.max_ray_length * math.sin(self.absolute_angle_rad)
-
-        # 2) unpack track segment
         (x1, y1), (x2, y2) = line
-        #    and ray segment
-        x3, y3 = self.x, self.y
-        x4, y4 = end_x, end_y
 
-        # 3) solve intersection via determinant
-        denom: float = (x1 - x2) * (y3 - y4) - (y1 - y2) * (x3 - x4)
-        if denom == 0:
-            return None  # parallel or collinear
+        u: Optional[float] = get_ray_segment_intersection(
+            *self.get_ray(), x1, y1, x2, y2
+        )
+        if u is None:
+            return None
 
-        t: float = ((x1 - x3) * (y3 - y4) - (y1 - y3) * (x3 - x4)) / denom
-        u: float = -((x1 - x2) * (y1 - y3) - (y1 - y2) * (x1 - x3)) / denom
+        return u * self.max_ray_length
 
-        # 4) intersection only if both parameters in [0,1]
-        if 0 <= t <= 1 and 0 <= u <= 1:
-            return u * self.max_ray_length
+    def get_closest_collision(self, lines: TrackLines) -> Optional[float]:
+        """
+        Cast the ray against the track and return the closest collision.
+
+        Args:
+            lines: Track boundary lines, segments array or their spatial index
+
+        Returns:
+            Distance to the closest collision or None if no collision
+        """
+        distance: float = float(
+            cast_rays_on(lines, np.array(self.get_ray()), self.max_ray_length)
+        )
 
-        return None
+        return None if math.isnan(distance) else distance
 
     def get_colission_distance(self) -> Optional[float]:
         """
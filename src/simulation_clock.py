@@ -0,0 +1,116 @@
+import time
+from typing import Iterator, List, Optional
+
+import pygame
+
+from .config.settings import FPS, SPEED_MULTIPLIERS
+
+# Keys selecting a speed multiplier directly, by position in the list
+SPEED_KEYS: List[int] = [pygame.K_1, pygame.K_2, pygame.K_3, pygame.K_4]
+FASTER_KEYS: List[int] = [pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS]
+SLOWER_KEYS: List[int] = [pygame.K_MINUS, pygame.K_KP_MINUS]
+
+
+class SimulationClock:
+    """
+    Decides how many fixed simulation steps run per displayed frame.
+
+    A step always advances the simulation the same amount, whatever the
+    frame rate. At speed k each displayed frame runs exactly k steps, so 1x
+    runs one step per frame like the game always did. The unlimited speed
+    runs steps until the frame time is spent.
+
+    Steps never take more than one frame of real time, so a speed the
+    machine can't keep up with degrades to unlimited instead of freezing the
+    window.
+    """
+
+    def __init__(
+        self,
+        multipliers: Optional[List[Optional[int]]] = None,
+        speed_index: int = 0,
+        frame_time: float = 1 / FPS,
+    ) -> None:
+        """
+        Initialize the clock.
+
+        Args:
+            multipliers: Selectable speeds, None meaning unlimited
+                (SPEED_MULTIPLIERS if None)
+            speed_index: Index of the initial speed
+            frame_time: Real seconds per frame the steps can use
+        """
+        self.multipliers: List[Optional[int]] = list(
+            SPEED_MULTIPLIERS if multipliers is None else multipliers
+        )
+        self.frame_time: float = frame_time
+        self.speed_index: int = 0
+
+        self.set_speed_index(speed_index)
+
+    def set_speed_index(self, speed_index: int) -> None:
+        """
+        Select one of the speed multipliers, clamped to the available ones.
+
+        Args:
+            speed_index: Index of the speed in the multipliers
+        """
+        self.speed_index = min(max(speed_index, 0), len(self.multipliers) - 1)
+
+    def faster(self) -> None:
+        """Select the next speed multiplier."""
+        self.set_speed_index(self.speed_index + 1)
+
+    def slower(self) -> None:
+        """Select the previous speed multiplier."""
+        self.set_speed_index(self.speed_index - 1)
+
+    def get_speed(self) -> Optional[int]:
+        """Returns the current speed multiplier, None when unlimited."""
+        return self.multipliers[self.speed_index]
+
+    def get_speed_label(self) -> str:
+        """Returns the current speed as shown to the user."""
+        speed: Optional[int] = self.get_speed()
+
+        return "Max" if speed is None else f"{speed}x"
+
+    def handle_key(self, key: int) -> bool:
+        """
+        Change the speed if the key is one of the speed keys.
+
+        Args:
+            key: Pressed key
+
+        Returns:
+            True if the key changed the speed
+        """
+        if key in SPEED_KEYS[: len(self.multipliers)]:
+            self.set_speed_index(SPEED_KEYS.index(key))
+        elif key in FASTER_KEYS:
+            self.faster()
+        elif key in SLOWER_KEYS:
+            self.slower()
+        else:
+            return False
+
+        return True
+
+    def iter_steps(self) -> Iterator[int]:
+        """
+        Yields once per simulation step to run in this frame.
+
+        Yields:
+            Index of the step within the frame
+        """
+        speed: Optional[int] = self.get_speed()
+        deadline: float = time.perf_counter() + self.frame_time
+        step: int = 0
+
+        # Every frame runs at least one step, so slow steps still make
+        # progress and the pressed keys always reach the simulation
+        while (speed is None or step < speed) and (
+            step == 0 or time.perf_counter() < deadline
+        ):
+            yield step
+            step += 1
@@ -1,13 +1,38 @@
+import hashlib
+import math
+import os
+import zipfile
+from typing import Iterator, NamedTuple, Optional, Sequence, Union
+
+import numpy as np
 import pygame
 
 from .ai.car_rna import CarRNA
-from .car import Car
+from .car import Car, get_sensor_offsets
 from .config.settings import (
     CAR_IMAGE_PATH,
     CAR_WIDTH,
+    COLLISION_BACKEND,
+    DETAILED_CARS,
+    INIT_CAR_ANGLE,
+    LOD_CARS_THRESHOLD,
+    POINT_CARS_THRESHOLD,
+    POINT_SIZE,
+    SEGMENT_GRID_CELL_SIZE,
+    SEGMENT_GRID_MIN_SEGMENTS,
+    SENSOR_ANGLES,
     TRACK_HEIGHT,
     TRACK_WIDTH,
 )
+from .distance_field import DistanceField, get_distance_field
+from .heading_table import HeadingTable
+from .raycast import TrackLines, get_ray_segment_intersection
+from .track_file import (
+    TRACK_FORMAT_VERSION,
+    TrackDefinition,
+    get_boundary_lines,
+    parse_track_file,
+)
 
 # Create game objects
 INIT_CAR_X = 1000
@@ -16,33 +41,531 @@ MAX_CARS_PER_LINE = 4
 CAR_SPACING_X = 30
 CAR_SPACING_Y = 30
 
+# Colors of the cars drawn as points, see POINT_CARS_THRESHOLD
+ALIVE_POINT_COLOR = (255, 220, 0)
+DEAD_POINT_COLOR = (90, 90, 90)
+
+# Ways to compute collisions and sensors, see COLLISION_BACKEND
+COLLISION_BACKENDS = ("segments", "field")
+
+# Margin added around the cells when registering segments, so a segment lying
+# on a cell border is found from both sides despite rounding
+CELL_MARGIN = 1e-6
+
+
+def get_start_position(
+    index: int, spawn_points: Optional[Sequence[tuple[float, float]]] = None
+) -> tuple[float, float]:
+    """
+    Returns the starting position of the car with the given index.
+
+    Cars are placed on the spawn points in order, starting over when there
+    are more cars than points. Without spawn points they are placed in a grid
+    of MAX_CARS_PER_LINE columns.
+    """
+    if spawn_points:
+        return spawn_points[index % len(spawn_points)]
+
+    x = INIT_CAR_X + (index % MAX_CARS_PER_LINE) * CAR_SPACING_X
+    y = INIT_CAR_Y + (index // MAX_CARS_PER_LINE) * CAR_SPACING_Y
+
+    return x, y
+
+
+class SegmentGrid:
+    """
+    Uniform grid over the track segments, to cast rays without testing them all.
+
+    Every cell keeps the indexes of the segments that cross it. A ray walks
+    the cells it goes through in order (DDA), only tests the segments of
+    those cells and stops as soon as the closest hit lies inside the cells
+    already walked. The intersection math is the same as the brute force
+    raycast, so the distances are identical.
+    """
+
+    def __init__(
+        self,
+        segments: np.ndarray,
+        cell_size: float = SEGMENT_GRID_CELL_SIZE,
+        cells: Optional[list[list[int]]] = None,
+    ) -> None:
+        """
+        Register every segment in the cells it crosses.
+
+        Args:
+            segments: Array (M, 4) of segments as (x1, y1, x2, y2)
+            cell_size: Side of the cells, in pixels
+            cells: Segment indexes of each cell, from a grid built before with
+                the same segments and cell size (registered again if None)
+
+        Raises:
+            ValueError: If the cell size isn't positive
+        """
+        if cell_size <= 0:
+            raise ValueError(f"Cell size must be positive: {cell_size}")
+
+        self.segments: list[tuple[float, float, float, float]] = [
+            tuple(segment)
+            for segment in np.asarray(segments, dtype=np.float64)
+            .reshape(-1, 4)
+            .tolist()
+        ]
+        self.cell_size = float(cell_size)
+
+        if self.segments:
+            xs = [x for x1, _, x2, _ in self.segments for x in (x1, x2)]
+            ys = [y for _, y1, _, y2 in self.segments for y in (y1, y2)]
+            self.min_x, self.min_y = min(xs), min(ys)
+            self.cols = int((max(xs) - self.min_x) // self.cell_size) + 1
+            self.rows = int((max(ys) - self.min_y) // self.cell_size) + 1
+        else:
+            self.min_x = self.min_y = 0.0
+            self.cols = self.rows = 0
+
+        self.max_x = self.min_x + self.cols * self.cell_size
+        self.max_y = self.min_y + self.rows * self.cell_size
+
+        if cells is not None:
+            if len(cells) != self.cols * self.rows:
+                raise ValueError(
+                    f"Expected {self.cols * self.rows} cells, got {len(cells)}"
+                )
+            self.cells: list[list[int]] = cells
+            return
+
+        # Segment indexes of each cell, row by row
+        self.cells = [[] for _ in range(self.cols * self.rows)]
+        for index, segment in enumerate(self.segments):
+            for cell in self._get_segment_cells(*segment):
+                self.cells[cell].append(index)
+
+    @classmethod
+    def from_arrays(
+        cls,
+        segments: np.ndarray,
+        cell_size: float,
+        cell_starts: np.ndarray,
+        cell_segments: np.ndarray,
+    ) -> "SegmentGrid":
+        """
+        Rebuild a grid saved with get_arrays, without registering the segments.
+
+        Raises:
+            ValueError: If the arrays don't match the segments and cell size
+        """
+        cell_segments = np.asarray(cell_segments).tolist()
+        cells = [
+            cell_segments[start:end]
+            for start, end in zip(cell_starts.tolist(), cell_starts[1:].tolist())
+        ]
+
+        return cls(segments, cell_size, cells)
+
+    def get_arrays(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the cells packed in two arrays, to save the grid.
+
+        Returns:
+            Where the segments of each cell start (plus the end of the last
+            one) and the segment indexes of every cell, one cell after another
+        """
+        cell_starts = np.zeros(len(self.cells) + 1, dtype=np.int64)
+        np.cumsum([len(cell) for cell in self.cells], out=cell_starts[1:])
+        cell_segments = np.array(
+            [index for cell in self.cells for index in cell], dtype=np.int64
+        )
+
+        return cell_starts, cell_segments
+
+    def __len__(self) -> int:
+        """Amount of segments in the grid."""
+        return len(self.segments)
+
+    def _get_cell_coords(self, x: float, y: float) -> tuple[int, int]:
+        """Column and row of the cell holding a point, clamped to the grid."""
+        col = int((x - self.min_x) // self.cell_size)
+        row = int((y - self.min_y) // self.cell_size)
+
+        return min(max(col, 0), self.cols - 1), min(max(row, 0), self.rows - 1)
+
+    def _get_segment_cells(
+        self, x1: float, y1: float, x2: float, y2: float
+    ) -> Iterator[int]:
+        """
+        Yields the cells crossed by a segment.
+
+        Only the cells of its bounding box are checked, each one clipping the
+        segment against the cell box grown by CELL_MARGIN.
+        """
+        first_col, first_row = self._get_cell_coords(min(x1, x2), min(y1, y2))
+        last_col, last_row = self._get_cell_coords(max(x1, x2), max(y1, y2))
+
+        for row in range(max(first_row - 1, 0), min(last_row + 2, self.rows)):
+            for col in range(max(first_col - 1, 0), min(last_col + 2, self.cols)):
+                left = self.min_x + col * self.cell_size - CELL_MARGIN
+                top = self.min_y + row * self.cell_size - CELL_MARGIN
+                size = self.cell_size + 2 * CELL_MARGIN
+
+                if _clip_to_box(x1, y1, x2, y2, left, top, size) is not None:
+                    yield row * self.cols + col
+
+    def iter_cells(
+        self, x0: float, y0: float, x1: float, y1: float
+    ) -> Iterator[tuple[float, list[int]]]:
+        """
+        Walks the cells crossed by the ray (x0, y0) -> (x1, y1) in order.
+
+        Yields:
+            Ray position (0 to 1) where it leaves the cell and the indexes of
+            the segments registered in the cell
+        """
+        if not self.cells:
+            return
+
+        clipped = _clip_to_box(
+            x0,
+            y0,
+            x1,
+            y1,
+            self.min_x,
+            self.min_y,
+            self.cell_size * max(self.cols, self.rows),
+        )
+        if clipped is None:
+            return
+
+        t_enter, t_leave = clipped
+        dx, dy = x1 - x0, y1 - y0
+        col, row = self._get_cell_coords(x0 + t_enter * dx, y0 + t_enter * dy)
+
+        step_col = 1 if dx > 0 else -1
+        step_row = 1 if dy > 0 else -1
+
+        # Ray position of the next vertical and horizontal cell borders
+        if dx:
+            border_x = self.min_x + (col + (dx > 0)) * self.cell_size
+            t_max_x = (border_x - x0) / dx
+            t_delta_x = self.cell_size / abs(dx)
+        else:
+            t_max_x = t_delta_x = math.inf
+
+        if dy:
+            border_y = self.min_y + (row + (dy > 0)) * self.cell_size
+            t_max_y = (border_y - y0) / dy
+            t_delta_y = self.cell_size / abs(dy)
+        else:
+            t_max_y = t_delta_y = math.inf
+
+        while 0 <= col < self.cols and 0 <= row < self.rows:
+            t_exit = min(t_max_x, t_max_y, t_leave)
+            yield t_exit, self.cells[row * self.cols + col]
+
+            if t_exit >= t_leave:
+                return
+
+            if t_max_x < t_max_y:
+                col += step_col
+                t_max_x += t_delta_x
+            else:
+                row += step_row
+                t_max_y += t_delta_y
+
+    def get_candidates(self, x0: float, y0: float, x1: float, y1: float) -> list[int]:
+        """
+        Returns the indexes of the segments near the ray, closest cells first.
+        """
+        candidates: dict[int, None] = {}
+        for _, cell in self.iter_cells(x0, y0, x1, y1):
+            candidates.update(dict.fromkeys(cell))
+
+        return list(candidates)
+
+    def cast_ray(
+        self, x0: float, y0: float, x1: float, y1: float, ray_length: float
+    ) -> float:
+        """
+        Distance from the start of a ray to its closest hit.
+
+        Args:
+            x0, y0: Start of the ray
+            x1, y1: End of the ray
+            ray_length: Length of the ray
+
+        Returns:
+            Distance to the closest hit, NaN if nothing was hit
+        """
+        tested: set[int] = set()
+        closest = math.inf
+
+        for t_exit, cell in self.iter_cells(x0, y0, x1, y1):
+            for index in cell:
+                if index in tested:
+                    continue
+                tested.add(index)
+
+                u = get_ray_segment_intersection(x0, y0, x1, y1, *self.segments[index])
+                if u is not None and u < closest:
+                    closest = u
+
+            # Cells further along the ray can't hold a closer hit
+            if closest <= t_exit:
+                break
+
+        return math.nan if closest == math.inf else closest * ray_length
+
+    def cast_rays(
+        self,
+        rays: np.ndarray,
+        ray_lengths: Union[float, Sequence[float], np.ndarray],
+    ) -> np.ndarray:
+        """
+        Distance from the start of each ray to its closest hit.
+
+        Args:
+            rays: Array (..., 4) of rays as (start_x, start_y, end_x, end_y)
+            ray_lengths: Length of the rays, a scalar or one value per ray
+
+        Returns:
+            Array with the leading shape of rays, NaN where nothing was hit
+        """
+        rays = np.asarray(rays, dtype=np.float64)
+        shape = rays.shape[:-1]
+        lengths = np.broadcast_to(
+            np.asarray(ray_lengths, dtype=np.float64), shape
+        ).reshape(-1)
+
+        distances = [
+            self.cast_ray(*ray, length)
+            for ray, length in zip(rays.reshape(-1, 4).tolist(), lengths.tolist())
+        ]
+
+        return np.array(distances, dtype=np.float64).reshape(shape)
+
+
+def _clip_to_box(
+    x0: float,
+    y0: float,
+    x1: float,
+    y1: float,
+    left: float,
+    top: float,
+    size: float,
+) -> Optional[tuple[float, float]]:
+    """
+    Clips the segment (x0, y0) -> (x1, y1) to a square box (Liang-Barsky).
+
+    Returns:
+        Segment positions (0 to 1) where it enters and leaves the box, None if
+        it misses the box
+    """
+    t_enter, t_leave = 0.0, 1.0
+
+    for start, delta, low in ((x0, x1 - x0, left), (y0, y1 - y0, top)):
+        high = low + size
+        if delta == 0:
+            if start < low or start > high:
+                return None
+            continue
+
+        t_low = (low - start) / delta
+        t_high = (high - start) / delta
+        if t_low > t_high:
+            t_low, t_high = t_high, t_low
+
+        t_enter = max(t_enter, t_low)
+        t_leave = min(t_leave, t_high)
+        if t_enter > t_leave:
+            return None
+
+    return t_enter, t_leave
+
+
+class CompiledTrack(NamedTuple):
+    """A track file with its geometry preprocessed for the simulation."""
+
+    definition: TrackDefinition
+    # SHA-256 of the track file, identifies its geometry
+    source_hash: str
+    # Rows of (x1, y1, x2, y2), outer boundary first
+    segments: np.ndarray
+    grid: SegmentGrid
+
+
+def get_compiled_track_path(track_path: str) -> str:
+    """
+    Returns where the compiled geometry of a track file is cached.
+    """
+    return os.path.splitext(track_path)[0] + ".compiled.npz"
+
+
+def load_compiled_track(
+    track_path: str, cache_path: Optional[str] = None
+) -> CompiledTrack:
+    """
+    Load a track file, reusing its compiled geometry when it's up to date.
+
+    The cache is rebuilt when the track file, the format version or the grid
+    cell size change. A cache that can't be written is simply skipped.
+
+    Args:
+        track_path: Path of the track file
+        cache_path: Path of the compiled cache (next to the track if None)
+
+    Returns:
+        The track with its segments and spatial index
+
+    Raises:
+        ValueError: If the track file isn't valid
+    """
+    cache_path = cache_path or get_compiled_track_path(track_path)
+
+    with open(track_path, "rb") as track_file:
+        source = track_file.read()
+    source_hash = hashlib.sha256(source).hexdigest()
+
+    compiled = _read_compiled_track(cache_path, source_hash)
+    if compiled is not None:
+        return compiled
+
+    definition = parse_track_file(source, track_path)
+    segments = np.array(get_boundary_lines(definition), dtype=np.float64).reshape(-1, 4)
+    compiled = CompiledTrack(definition, source_hash, segments, SegmentGrid(segments))
+
+    try:
+        _write_compiled_track(cache_path, compiled)
+    except OSError:
+        pass  # Read-only location, the track is compiled again next time
+
+    return compiled
+
+
+def _read_compiled_track(path: str, source_hash: str) -> Optional[CompiledTrack]:
+    """
+    Returns the cached track, None if there's no usable cache for this source.
+    """
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            if (
+                int(data["version"]) != TRACK_FORMAT_VERSION
+                or str(data["source_hash"]) != source_hash
+                or float(data["cell_size"]) != SEGMENT_GRID_CELL_SIZE
+            ):
+                return None
+
+            definition = TrackDefinition(
+                name=str(data["name"]),
+                outer=[tuple(point) for point in data["outer"].tolist()],
+                inner=[tuple(point) for point in data["inner"].tolist()],
+                spawn_points=[tuple(point) for point in data["spawn_points"].tolist()],
+                spawn_angle=data["spawn_angle"].item(),
+            )
+            segments = data["segments"]
+            grid = SegmentGrid.from_arrays(
+                segments,
+                float(data["cell_size"]),
+                data["cell_starts"],
+                data["cell_segments"],
+            )
+    except (OSError, KeyError, ValueError, EOFError, zipfile.BadZipFile):
+        # Missing, outdated format or truncated file, compiled again
+        return None
+
+    return CompiledTrack(definition, source_hash, segments, grid)
+
+
+def _write_compiled_track(path: str, compiled: CompiledTrack) -> None:
+    """
+    Saves the compiled track, replacing the old cache atomically.
+    """
+    definition = compiled.definition
+    cell_starts, cell_segments = compiled.grid.get_arrays()
+
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temporary_path, "wb") as cache_file:
+            np.savez(
+                cache_file,
+                version=TRACK_FORMAT_VERSION,
+                source_hash=compiled.source_hash,
+                name=definition.name,
+                outer=np.array(definition.outer, dtype=np.float64),
+                inner=np.array(definition.inner, dtype=np.float64),
+                spawn_points=np.array(definition.spawn_points, dtype=np.float64),
+                spawn_angle=definition.spawn_angle,
+                segments=compiled.segments,
+                cell_size=compiled.grid.cell_size,
+                cell_starts=cell_starts,
+                cell_segments=cell_segments,
+            )
+        os.replace(temporary_path, path)
+    finally:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+
 
 class Track:
     def __init__(
         self,
-        screen: pygame.Surface,
+        screen: Optional[pygame.Surface],
         rnas: list[CarRNA],
         border_padding: float = 0.1,
         track_width: float = 0.2,
+        track_file: Optional[str] = None,
+        collision_backend: str = COLLISION_BACKEND,
     ):
         """
         Initializes the track.
 
         Args:
+            screen: Surface to draw on (None for headless runs)
+            rnas: Neural networks driving the cars
             display_width: Width of the display
             display_height: Height of the display
             border_padding: Padding from the edges of the display
             track_width: Width of the track
+            track_file: Track file to load instead of the default rectangular
+                track (see track_file.load_track_file)
+            collision_backend: "segments" for the exact track lines or "field"
+                for a precomputed distance field
+
+        Raises:
+            ValueError: If the track file or the collision backend isn't valid
         """
+        if collision_backend not in COLLISION_BACKENDS:
+            raise ValueError(
+                f"Collision backend must be one of {COLLISION_BACKENDS}: {collision_backend!r}"
+            )
+
         self.rnas = rnas
         self.screen = screen
         self.display_width = TRACK_WIDTH
         self.display_height = TRACK_HEIGHT
         self.border_padding = border_padding
         self.track_width = track_width
+        self.collision_backend = collision_backend
 
         self.car_image = self.get_car_image(CAR_IMAGE_PATH, CAR_WIDTH)
 
+        # Track loaded from a file, None for the default rectangular track
+        self.compiled_track: Optional[CompiledTrack] = (
+            load_compiled_track(track_file) if track_file is not None else None
+        )
+
+        # Starting positions and angle of the cars (no points places them in a grid)
+        self.spawn_points: Optional[list[tuple[float, float]]] = None
+        self.spawn_angle: float = INIT_CAR_ANGLE
+        if self.compiled_track is not None:
+            self.spawn_points = self.compiled_track.definition.spawn_points
+            self.spawn_angle = self.compiled_track.definition.spawn_angle
+
+        # Headings, sensor offsets and rotated images shared by every car
+        self.heading_table = HeadingTable(
+            self.spawn_angle,
+            get_sensor_offsets(*self.car_image.get_size()),
+            SENSOR_ANGLES,
+            self.car_image,
+        )
+
         # Outer boundary rectangle (big)
         self.outer_rect = pygame.Rect(
             self.display_width * self.border_padding + 100,
@@ -59,37 +582,329 @@ class Track:
             self.display_height * (1 - 2 * (self.border_padding + track_width)),
         )
 
+        # Static geometry, compiled once and again only if the rects change
+        self.geometry_key: Optional[tuple] = None
+        self.track_lines: tuple[tuple[tuple[int, int], tuple[int, int]], ...] = ()
+        self.track_segments: np.ndarray = np.empty((0, 4))
+        self.segment_grid: Optional[SegmentGrid] = None
+        self.distance_field: Optional[DistanceField] = None
+        self.compile_geometry()
+
+        # Pre-rendered static track, built on the first draw
+        self.background: Optional[pygame.Surface] = None
+        self.background_key: Optional[tuple] = None
+
+        # Cars built so far, reset in place by every generation
+        self.car_pool: list[Car] = []
+
+        # Areas to update on the next draw, and the background they were drawn on
+        self.dirty_rects: list[pygame.Rect] = []
+        self.drawn_background: Optional[pygame.Surface] = None
+        # Cars drawn as points on the last draw, and the area they covered
+        self.drawn_points: Optional[tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+        self.drawn_points_rect: Optional[pygame.Rect] = None
+        # Indexes of the cars from best to worst, see get_best_cars
+        self.car_ranking: Optional[np.ndarray] = None
+
         self.restart_cars(self.rnas)
 
+    def compile_geometry(self) -> None:
+        """
+        Builds the boundary lines and segments array if the boundary rects changed.
+
+        Tracks loaded from a file never change and come already compiled.
+        """
+        if self.compiled_track is not None:
+            geometry_key = (self.compiled_track.source_hash,)
+        else:
+            geometry_key = tuple(tuple(rect) for rect in self.get_boundary_rects())
+
+        if geometry_key == self.geometry_key:
+            return
+
+        self.geometry_key = geometry_key
+
+        if self.compiled_track is not None:
+            lines = get_boundary_lines(self.compiled_track.definition)
+            self.track_segments = self.compiled_track.segments
+            grid = self.compiled_track.grid
+        else:
+            lines = []
+            for rect in self.get_boundary_rects():
+                lines.extend(self._get_rect_lines(rect))
+
+            # Rows of (x1, y1, x2, y2)
+            self.track_segments = np.array(lines, dtype=np.float64).reshape(-1, 4)
+            grid = None
+
+        self.track_lines = tuple(lines)
+
+        # Read-only, since every car shares them
+        self.track_segments.flags.writeable = False
+
+        # Big tracks are cast through a spatial index, small ones by brute force
+        if len(lines) < SEGMENT_GRID_MIN_SEGMENTS:
+            grid = None
+        elif grid is None:
+            grid = SegmentGrid(self.track_segments)
+
+        self.segment_grid = grid
+
+        # Memory-mapped from the cache, computed only the first time
+        self.distance_field = (
+            get_distance_field(self.track_segments)
+            if self.collision_backend == "field"
+            else None
+        )
+
     def update(self, keys: list[int]):
+        self.car_ranking = None
+        self.compile_geometry()
+        lines = self.get_ray_caster()
+
         # Update cars
         for car in self.cars:
-            car.update(keys, self.get_track_lines())
+            car.update(keys, lines)
 
-    def draw(self, background_color: tuple[int, int, int]):
+    def draw(self, background_color: tuple[int, int, int]) -> list[pygame.Rect]:
         """
         Draws the track on the screen.
 
+        The whole frame is drawn, but only the areas of the cars that moved or
+        changed since the previous frame (where they were and where they are)
+        differ from it, so only those need to be sent to the display.
+
+        Big populations are drawn with less detail, see LOD_CARS_THRESHOLD:
+        only the best alive cars get their sensors and metrics, and past
+        POINT_CARS_THRESHOLD the rest are drawn as points.
+
+        Args:
+            background_color: Tuple of RGB values for the background color
+
+        Returns:
+            The areas of the screen that changed since the previous draw
+        """
+        dirty_rects = self.dirty_rects
+        self.dirty_rects = []
+
+        # Static track from the cache
+        background = self.get_background(background_color)
+        self.screen.blit(background, (0, 0))
+
+        if background is not self.drawn_background:
+            self.drawn_background = background
+            dirty_rects = [self.screen.get_rect()]
+
+        if len(self.cars) <= LOD_CARS_THRESHOLD:
+            detailed_cars = self.cars
+            other_cars = []
+        else:
+            detailed_cars = [
+                car for _, car in self.get_best_cars(DETAILED_CARS) if car.is_alive()
+            ]
+            detailed_ids = {id(car) for car in detailed_cars}
+            other_cars = [car for car in self.cars if id(car) not in detailed_ids]
+
+        # Draw cars, the detailed ones over the rest
+        if len(other_cars) > POINT_CARS_THRESHOLD:
+            self._draw_points(other_cars, dirty_rects)
+        else:
+            # Erase the points of a bigger population
+            if self.drawn_points_rect is not None:
+                self._draw_points([], dirty_rects)
+
+            for car in other_cars:
+                self._draw_car(car, False, dirty_rects)
+
+        for car in detailed_cars:
+            self._draw_car(car, True, dirty_rects)
+
+        return dirty_rects
+
+    def _draw_car(
+        self, car: Car, detailed: bool, dirty_rects: list[pygame.Rect]
+    ) -> None:
+        """
+        Draws a car, adding its areas to dirty_rects if it changed.
+
+        Args:
+            car: Car to draw
+            detailed: Whether to draw its sensors and metrics
+            dirty_rects: Areas changed since the previous draw
+        """
+        drawn_rect = car.draw(self.screen, detailed)
+        draw_key = car.get_draw_key(detailed)
+
+        if draw_key != car.drawn_key or drawn_rect != car.drawn_rect:
+            if car.drawn_rect is not None:
+                dirty_rects.append(car.drawn_rect)
+            dirty_rects.append(drawn_rect)
+
+            car.drawn_key = draw_key
+            car.drawn_rect = drawn_rect
+
+    def _draw_points(self, cars: list[Car], dirty_rects: list[pygame.Rect]) -> None:
+        """
+        Draws cars as points, adding the area of all of them to dirty_rects if
+        any changed.
+
+        Args:
+            cars: Cars to draw
+            dirty_rects: Areas changed since the previous draw
+        """
+        # A car drawn as a sprite before is erased
+        for car in cars:
+            if car.drawn_rect is not None:
+                dirty_rects.append(car.drawn_rect)
+                car.drawn_key = None
+                car.drawn_rect = None
+
+        # Top left corner of each point, only the ones fully on the screen
+        width, height = self.screen.get_size()
+        xs = np.fromiter((car.x for car in cars), np.float64, len(cars)).astype(int)
+        ys = np.fromiter((car.y for car in cars), np.float64, len(cars)).astype(int)
+        alive = np.fromiter((car.alive for car in cars), bool, len(cars))
+        xs -= POINT_SIZE // 2
+        ys -= POINT_SIZE // 2
+        on_screen = (
+            (xs >= 0)
+            & (ys >= 0)
+            & (xs <= width - POINT_SIZE)
+            & (ys <= height - POINT_SIZE)
+        )
+        points = (xs[on_screen], ys[on_screen], alive[on_screen])
+
+        if len(points[0]):
+            self._blit_points(*points)
+
+        if self.drawn_points is not None and all(
+            np.array_equal(drawn, new) for drawn, new in zip(self.drawn_points, points)
+        ):
+            return
+
+        drawn_rect = None
+        if len(points[0]):
+            xs, ys, _ = points
+            drawn_rect = pygame.Rect(
+                int(xs.min()),
+                int(ys.min()),
+                int(xs.max() - xs.min()) + POINT_SIZE,
+                int(ys.max() - ys.min()) + POINT_SIZE,
+            )
+            dirty_rects.append(drawn_rect)
+
+        if self.drawn_points_rect is not None:
+            dirty_rects.append(self.drawn_points_rect)
+
+        self.drawn_points = points
+        self.drawn_points_rect = drawn_rect
+
+    def _blit_points(self, xs: np.ndarray, ys: np.ndarray, alive: np.ndarray) -> None:
+        """
+        Draws a square point at each top left corner, colored by whether the
+        car is alive. The corners must leave the whole point on the screen.
+        """
+        try:
+            pixels = pygame.surfarray.pixels2d(self.screen)
+        except ValueError:
+            # 24 bits surfaces can't be referenced as an array
+            pixels = None
+
+        if pixels is not None:
+            colors = np.where(
+                alive,
+                self.screen.map_rgb(ALIVE_POINT_COLOR),
+                self.screen.map_rgb(DEAD_POINT_COLOR),
+            ).astype(pixels.dtype)
+            for dx in range(POINT_SIZE):
+                for dy in range(POINT_SIZE):
+                    pixels[xs + dx, ys + dy] = colors
+
+            # Unlock the screen
+            del pixels
+            return
+
+        for is_alive, color in ((True, ALIVE_POINT_COLOR), (False, DEAD_POINT_COLOR)):
+            selected = alive == is_alive
+            for x, y in zip(xs[selected].tolist(), ys[selected].tolist()):
+                self.screen.fill(color, (x, y, POINT_SIZE, POINT_SIZE))
+
+    def get_best_cars(self, amount: int) -> list[tuple[int, Car]]:
+        """
+        Returns the best cars with their index, alive ones first, then by score.
+
+        Cars with the same score keep their order, so the same cars stay
+        first from one frame to the next. The ranking is computed once per
+        simulation step.
+
+        Args:
+            amount: Maximum amount of cars to return
+        """
+        if self.car_ranking is None:
+            alive = np.fromiter((car.alive for car in self.cars), bool, len(self.cars))
+            scores = np.fromiter(
+                (car.get_score() for car in self.cars), np.int64, len(self.cars)
+            )
+            self.car_ranking = np.lexsort((-scores, ~alive))
+
+        return [
+            (index, self.cars[index]) for index in self.car_ranking[:amount].tolist()
+        ]
+
+    def get_background(self, background_color: tuple[int, int, int]) -> pygame.Surface:
+        """
+        Returns the static track pre-rendered on a surface of the screen size.
+
+        It's only rendered again when the geometry or the color changes.
+
         Args:
-            screen: Pygame screen object
             background_color: Tuple of RGB values for the background color
         """
-        # Fill entire screen first
-        self.screen.fill(background_color)
+        self.compile_geometry()
+
+        background_key = (self.geometry_key, tuple(background_color))
+        if self.background is None or self.background_key != background_key:
+            self.background = self.render_background(background_color)
+            self.background_key = background_key
+
+        return self.background
+
+    def render_background(
+        self, background_color: tuple[int, int, int]
+    ) -> pygame.Surface:
+        """
+        Renders the static track (grass, track and borders) on a new surface.
+
+        Args:
+            background_color: Tuple of RGB values for the background color
+        """
+        background = pygame.Surface(self.screen.get_size()).convert()
+
+        # Fill entire surface first
+        background.fill(background_color)
+
+        if self.compiled_track is not None:
+            definition = self.compiled_track.definition
+
+            # Track between the boundaries, then their borders
+            pygame.draw.polygon(background, (128, 128, 128), definition.outer)
+            pygame.draw.polygon(background, background_color, definition.inner)
+            pygame.draw.lines(background, (255, 0, 0), True, definition.outer, 3)
+            pygame.draw.lines(background, (255, 0, 0), True, definition.inner, 3)
+
+            return background
 
         # Draw outer track (grey)
-        pygame.draw.rect(self.screen, (128, 128, 128), self.outer_rect)
+        pygame.draw.rect(background, (128, 128, 128), self.outer_rect)
 
         # Draw inner green rectangle (cutout inside the track)
-        pygame.draw.rect(self.screen, background_color, self.inner_rect)
+        pygame.draw.rect(background, background_color, self.inner_rect)
 
         # Optional: Draw borders (lines)
-        pygame.draw.rect(self.screen, (255, 0, 0), self.outer_rect, 3)  # Outer border
-        pygame.draw.rect(self.screen, (255, 0, 0), self.inner_rect, 3)  # Inner border
+        pygame.draw.rect(background, (255, 0, 0), self.outer_rect, 3)  # Outer border
+        pygame.draw.rect(background, (255, 0, 0), self.inner_rect, 3)  # Inner border
 
-        # Draw cars
-        for car in self.cars:
-            car.draw(self.screen)
+        return background
 
     def get_boundary_rects(self) -> list[pygame.Rect]:
         """
@@ -115,24 +930,50 @@ class Track:
 
         return [top, right, bottom, left]
 
-    def get_track_lines(self) -> list[tuple[tuple[int, int], tuple[int, int]]]:
+    def get_track_lines(self) -> tuple[tuple[tuple[int, int], tuple[int, int]], ...]:
         """
-        Returns a list of lines that define the track:
+        Returns the lines that define the track:
         - Each tuple contains two points (start and end) that define a line
         - Example: [(x1, y1), (x2, y2)]
         """
+        self.compile_geometry()
+
+        return self.track_lines
+
+    def get_track_segments(self) -> np.ndarray:
+        """
+        Returns the track lines as a read-only array of (x1, y1, x2, y2) rows.
+        """
+        self.compile_geometry()
+
+        return self.track_segments
+
+    def get_ray_caster(self) -> TrackLines:
+        """
+        Returns what the cars cast their sensors against: the distance field
+        with the "field" backend, otherwise the spatial index of the track if
+        it has one or its segments array.
+        """
+        self.compile_geometry()
 
-        lines = []
-        for rect in self.get_boundary_rects():
-            lines.extend(self._get_rect_lines(rect))
+        if self.distance_field is not None:
+            return self.distance_field
 
-        return lines
+        if self.segment_grid is not None:
+            return self.segment_grid
+
+        return self.track_segments
 
     def get_car_image(self, img_path: str, car_width: int) -> pygame.Surface:
         """
         Returns a scaled car image based on the given width for the current track.
         """
-        image = pygame.image.load(img_path).convert_alpha()
+        image = pygame.image.load(img_path)
+
+        # Converting needs a display mode, which headless runs never set
+        if pygame.display.get_surface() is not None:
+            image = image.convert_alpha()
+
         original_width, original_height = image.get_size()
         aspect_ratio = original_height / original_width
         width = car_width
@@ -141,18 +982,55 @@ class Track:
         return pygame.transform.smoothscale(image, (width, height))
 
     def generate_cars(self) -> list[Car]:
+        """
+        Returns a car per neural network at its starting position.
+
+        The cars of the pool are reset in place with the new networks, new
+        cars are only built when the population outgrows the pool.
+        """
         cars = []
 
         for i in range(len(self.rnas)):
-            x = INIT_CAR_X + (i % MAX_CARS_PER_LINE) * CAR_SPACING_X
-            y = INIT_CAR_Y + (i // MAX_CARS_PER_LINE) * CAR_SPACING_Y
+            x, y = get_start_position(i, self.spawn_points)
 
             rna = self.rnas[i]
 
-            cars.append(Car(rna, x, y, CAR_IMAGE_PATH, CAR_WIDTH, self.car_image))
+            if i < len(self.car_pool):
+                car = self.car_pool[i]
+                car.reset(rna, x, y, self.spawn_angle)
+            else:
+                car = Car(
+                    rna,
+                    x,
+                    y,
+                    CAR_IMAGE_PATH,
+                    CAR_WIDTH,
+                    self.car_image,
+                    self.heading_table,
+                    self.spawn_angle,
+                )
+                self.car_pool.append(car)
+
+            cars.append(car)
+
+        # Cars left out of a smaller population are erased on the next draw
+        for car in self.car_pool[len(self.rnas) :]:
+            if car.drawn_rect is not None:
+                self.dirty_rects.append(car.drawn_rect)
+                car.drawn_key = None
+                car.drawn_rect = None
 
         return cars
 
+    def get_start_positions(self, cars_amount: int) -> list[tuple[float, float]]:
+        """
+        Returns the starting position of each car of a population.
+
+        Args:
+            cars_amount: Amount of cars of the population
+        """
+        return [get_start_position(i, self.spawn_points) for i in range(cars_amount)]
+
     def get_all_cars_alive(self) -> int:
         return sum(1 for car in self.cars if car.is_alive())
 
@@ -165,5 +1043,6 @@ class Track:
 
     def restart_cars(self, rnas: list[CarRNA]):
         self.rnas = rnas
+        self.car_ranking = None
 
         self.cars = self.generate_cars()
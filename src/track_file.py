@@ -0,0 +1,211 @@
+import json
+import math
+from typing import Any, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+from .raycast import cast_rays
+
+# Version of the track file format, stored in every file
+TRACK_FORMAT_VERSION: int = 1
+
+Point = Tuple[float, float]
+Line = Tuple[Point, Point]
+
+
+class TrackDefinition(NamedTuple):
+    """
+    A track as described by a track file.
+
+    The boundaries are closed polylines: the last point connects back to the
+    first one. Cars drive between the outer and the inner boundary.
+    """
+
+    name: str
+    outer: List[Point]
+    inner: List[Point]
+    # Starting position of the cars, reused in order when there are more cars
+    spawn_points: List[Point]
+    # Starting angle of every car, in degrees
+    spawn_angle: float
+
+
+def load_track_file(path: str) -> TrackDefinition:
+    """
+    Load and validate a track file.
+
+    A track file is a JSON object like:
+
+        {
+            "version": 1,
+            "name": "oval",
+            "outer": [[x, y], ...],
+            "inner": [[x, y], ...],
+            "spawn": {"points": [[x, y], ...], "heading": 90}
+        }
+
+    Args:
+        path: Path of the track file
+
+    Returns:
+        The track definition
+
+    Raises:
+        ValueError: If the file isn't a valid track
+    """
+    with open(path, "rb") as track_file:
+        return parse_track_file(track_file.read(), path)
+
+
+def parse_track_file(source: bytes, path: str = "<track>") -> TrackDefinition:
+    """
+    Parse and validate the contents of a track file.
+
+    Args:
+        source: Contents of the track file
+        path: Path of the track file, for the error messages
+
+    Returns:
+        The track definition
+
+    Raises:
+        ValueError: If the contents aren't a valid track
+    """
+    try:
+        data: Any = json.loads(source)
+    except (UnicodeDecodeError, json.JSONDecodeError) as error:
+        raise ValueError(f"Invalid track file {path}: {error}") from error
+
+    if not isinstance(data, dict):
+        raise ValueError(f"Invalid track file {path}: expected a JSON object")
+
+    if data.get("version") != TRACK_FORMAT_VERSION:
+        raise ValueError(
+            f"Invalid track file {path}: unsupported version {data.get('version')!r}"
+            f" (expected {TRACK_FORMAT_VERSION})"
+        )
+
+    spawn: Any = data.get("spawn")
+    if not isinstance(spawn, dict):
+        raise ValueError(f"Invalid track file {path}: spawn must be an object")
+
+    definition = TrackDefinition(
+        name=str(data.get("name", "")),
+        outer=_parse_points(data.get("outer"), "outer", path, minimum=3),
+        inner=_parse_points(data.get("inner"), "inner", path, minimum=3),
+        spawn_points=_parse_points(spawn.get("points"), "spawn points", path),
+        spawn_angle=_parse_number(spawn.get("heading"), "spawn heading", path),
+    )
+    validate_track_definition(definition, path)
+
+    return definition
+
+
+def validate_track_definition(
+    definition: TrackDefinition, path: str = "<track>"
+) -> None:
+    """
+    Check that the cars can drive the track.
+
+    Raises:
+        ValueError: If the boundaries cross each other, the inner boundary
+            isn't inside the outer one or a spawn point is off the track
+    """
+    outer_segments: np.ndarray = get_polyline_segments(definition.outer)
+    inner_segments: np.ndarray = get_polyline_segments(definition.inner)
+
+    # Segments used as rays of length 1 hit each other where they cross
+    if not np.isnan(cast_rays(inner_segments, outer_segments, 1.0)).all():
+        raise ValueError(f"Invalid track file {path}: the boundaries cross")
+
+    if not all(
+        is_point_in_polygon(point, definition.outer) for point in definition.inner
+    ):
+        raise ValueError(
+            f"Invalid track file {path}: the inner boundary must be inside the outer one"
+        )
+
+    for point in definition.spawn_points:
+        if not is_point_in_polygon(point, definition.outer) or is_point_in_polygon(
+            point, definition.inner
+        ):
+            raise ValueError(
+                f"Invalid track file {path}: spawn point {point} is off the track"
+            )
+
+
+def get_boundary_lines(definition: TrackDefinition) -> List[Line]:
+    """
+    Returns the lines of both closed boundaries, outer first.
+    """
+    lines: List[Line] = []
+
+    for polyline in (definition.outer, definition.inner):
+        lines.extend(zip(polyline, polyline[1:] + polyline[:1]))
+
+    return lines
+
+
+def get_polyline_segments(polyline: Sequence[Point]) -> np.ndarray:
+    """
+    Returns the segments of a closed polyline as rows of (x1, y1, x2, y2).
+    """
+    points: np.ndarray = np.asarray(polyline, dtype=np.float64).reshape(-1, 2)
+
+    return np.concatenate([points, np.roll(points, -1, axis=0)], axis=1)
+
+
+def is_point_in_polygon(point: Point, polygon: Sequence[Point]) -> bool:
+    """
+    Returns True if the point is inside the polygon (even-odd rule).
+    """
+    x, y = point
+    inside: bool = False
+
+    for (x1, y1), (x2, y2) in zip(polygon, [*polygon[1:], polygon[0]]):
+        if (y1 > y) != (y2 > y) and x < x1 + (y - y1) * (x2 - x1) / (y2 - y1):
+            inside = not inside
+
+    return inside
+
+
+def _parse_points(value: Any, field: str, path: str, minimum: int = 1) -> List[Point]:
+    """
+    Parse a list of [x, y] points.
+
+    Raises:
+        ValueError: If it isn't a list of at least minimum finite points
+    """
+    if not isinstance(value, list) or len(value) < minimum:
+        raise ValueError(
+            f"Invalid track file {path}: {field} must be a list of at least {minimum} points"
+        )
+
+    points: List[Point] = []
+    for point in value:
+        if not isinstance(point, list) or len(point) != 2:
+            raise ValueError(
+                f"Invalid track file {path}: {field} has an invalid point {point!r}"
+            )
+        points.append(
+            (_parse_number(point[0], field, path), _parse_number(point[1], field, path))
+        )
+
+    return points
+
+
+def _parse_number(value: Any, field: str, path: str) -> float:
+    """
+    Parse a finite number.
+
+    Raises:
+        ValueError: If it isn't a finite number
+    """
+    if (
+        isinstance(value, bool)
+        or not isinstance(value, (int, float))
+        or not math.isfinite(value)
+    ):
+        raise ValueError(f"Invalid track file {path}: {field} must be a number")
+
+    return value